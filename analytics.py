@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Turbo's Quest - Play Analytics
+Simulates huge numbers of players to see how long the quest takes and where they wander
+
+The game is reduced to the same states the solver uses (room, the items and
+progress that matter, and the story flags), and every state's commands become
+a row of transition probabilities: a player picks uniformly among the exits
+and actions that do something, or favours the ones that make progress when
+`bias` is above 1. Moves that can no longer lead to a win are "stuck" states.
+
+With the chain in NumPy arrays, millions of players are simulated a turn at a
+time with one random draw and one lookup per player, giving per-room visit
+heatmaps and the distribution of turns needed to win. When the state space
+is small enough the absorbing chain is also solved exactly, giving the true
+chance of winning and the expected number of turns.
+
+NumPy is optional for the rest of the game, but needed here.
+
+Run it with:
+    python analytics.py [--data DIR] [--players N] [--max-turns N] [--bias X] [--seed N]
+"""
+
+import argparse
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from main import DataLoader
+from solver import WON, QuestModel
+
+
+# Kinds of state
+PLAYING = 0
+FINISHED = 1  # The game is won
+STUCK = 2  # The quest can't be won any more
+
+# Largest number of playing states the exact solution is worked out for (it's a dense solve)
+EXACT_LIMIT = 3000
+
+# Width of the text bars in reports
+BAR_WIDTH = 40
+
+
+class AnalyticsError(Exception):
+    """
+    Raised when a world can't be analysed (too many states, or no NumPy)
+    """
+    pass
+
+
+class PlayModel:
+    """
+    A world's reduced states and the chance of moving between them, as NumPy arrays
+
+    Transitions are stored row by row (compressed sparse rows): the moves out
+    of state s are `targets[offsets[s]:offsets[s + 1]]`. Each row is also an
+    alias table, so picking a move for a whole batch of players takes one
+    random number and a few array lookups each, however many moves a state has.
+    """
+    def __init__(self, world, bias=1.0, max_states=2000000):
+        if np is None:
+            raise AnalyticsError("Play analytics need NumPy (pip install numpy)")
+        started = time.perf_counter()
+        self.world = world
+        self.bias = bias
+        quest = QuestModel(world)
+
+        # Every reachable state, breadth first, with its weighted moves
+        start = quest.start()
+        self.states = [start]
+        index = {start: 0}
+        sources, targets, weights = [], [], []
+        for number, state in enumerate(self.states):
+            if state[3] & WON:
+                continue
+            for _, next_state, _ in quest.successors(state):
+                target = index.get(next_state)
+                if target is None:
+                    if len(self.states) >= max_states:
+                        raise AnalyticsError(f"More than {max_states} states - try a smaller world")
+                    target = index[next_state] = len(self.states)
+                    self.states.append(next_state)
+                sources.append(number)
+                targets.append(target)
+                # Biased players are drawn to commands that change anything but the room
+                weights.append(bias if next_state[1:] != state[1:] else 1.0)
+        size = len(self.states)
+        self.start = 0
+
+        # Which states are won, which can still win, and which are stuck for good
+        status = np.full(size, STUCK, dtype=np.int8)
+        predecessors = [[] for _ in range(size)]
+        for source, target in zip(sources, targets):
+            predecessors[target].append(source)
+        stack = [number for number, state in enumerate(self.states) if state[3] & WON]
+        status[stack] = FINISHED
+        while stack:
+            for previous in predecessors[stack.pop()]:
+                if status[previous] == STUCK:
+                    status[previous] = PLAYING
+                    stack.append(previous)
+        self.status = status
+
+        # Only playing states keep their moves; finished and stuck ones just stay put
+        sources = np.array(sources, dtype=np.int64)
+        keep = status[sources] == PLAYING
+        sources = sources[keep]
+        targets = np.array(targets, dtype=np.int32)[keep]
+        weights = np.array(weights, dtype=np.float64)[keep]
+        resting = np.flatnonzero(status != PLAYING)
+        sources = np.concatenate((sources, resting))
+        targets = np.concatenate((targets, resting.astype(np.int32)))
+        weights = np.concatenate((weights, np.ones(len(resting))))
+        order = np.argsort(sources, kind="stable")
+        sources, self.targets, weights = sources[order], targets[order], weights[order]
+
+        self.offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=size), out=self.offsets[1:])
+        self.probabilities = weights / np.bincount(sources, weights=weights, minlength=size)[sources]
+        self.sources = sources
+        self.first = self.offsets[:-1]
+        self.degree = np.diff(self.offsets)
+        self.accept, self.alias = alias_tables(self.offsets, weights)
+
+        self.rooms = np.array([state[0] for state in self.states], dtype=np.int32)
+        self.room_count = len(world.locations)
+        self.seconds = time.perf_counter() - started
+
+    def step(self, states, rng):
+        """
+        One turn for a batch of players: the state each of them moves to
+        """
+        # The whole part of random * degree picks a column, the fraction left over decides alias or not
+        degree = self.degree[states]
+        spread = rng.random(len(states)) * degree
+        columns = spread.astype(np.int64)
+        np.minimum(columns, degree - 1, out=columns)  # In case rounding reaches the end of the row
+        choices = self.first[states] + columns
+        aliased = spread - columns >= self.accept[choices]
+        choices[aliased] = self.alias[choices[aliased]]
+        return self.targets[choices]
+
+
+def alias_tables(offsets, weights):
+    """
+    Walker's alias tables for every row: (chance to keep each column, the column to use otherwise)
+    Rows where every move is equally likely (all of them, for unbiased
+    players) keep every column; the rest are built with Vose's method.
+    """
+    accept = np.ones(len(weights))
+    alias = np.arange(len(weights), dtype=np.int64)
+    starts = offsets[:-1]
+    for row in np.flatnonzero(np.maximum.reduceat(weights, starts) != np.minimum.reduceat(weights, starts)):
+        begin, end = int(offsets[row]), int(offsets[row + 1])
+        scaled = list(weights[begin:end] * ((end - begin) / weights[begin:end].sum()))
+        small = [column for column, value in enumerate(scaled) if value < 1.0]
+        large = [column for column, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            accept[begin + low] = scaled[low]
+            alias[begin + low] = begin + high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+        # Whatever is left is 1 give or take rounding, so it's always kept
+    return accept, alias
+
+
+class Simulation:
+    """
+    What happened to a batch of simulated players
+    """
+    def __init__(self, players):
+        self.players = players
+        self.turns_to_win = None  # Sorted turns taken by every player who won
+        self.stuck = 0  # Players who got into a state the quest can't be won from
+        self.wandering = 0  # Players still playing when the turn limit ran out
+        self.room_visits = None  # Turns spent in each room (by location id), over all players
+        self.seconds = 0.0
+
+
+def simulate(model, players=1000000, max_turns=2000, seed=0):
+    """
+    Play `players` random players at once until they win, get stuck or run out of turns
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    result = Simulation(players)
+    visits = np.zeros(model.room_count, dtype=np.int64)
+    finished = []
+
+    states = np.full(players, model.start, dtype=np.int64)
+    visits[model.rooms[model.start]] += players
+    for turn in range(1, max_turns + 1):
+        if not len(states):
+            break
+        states = model.step(states, rng)
+        visits += np.bincount(model.rooms[states], minlength=model.room_count)
+        status = model.status[states]
+        won = np.count_nonzero(status == FINISHED)
+        if won:
+            finished.append(np.full(won, turn, dtype=np.int32))
+        result.stuck += int(np.count_nonzero(status == STUCK))
+        states = states[status == PLAYING]
+
+    result.wandering = len(states)
+    result.turns_to_win = np.concatenate(finished) if finished else np.zeros(0, dtype=np.int32)
+    result.room_visits = visits
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def solve_exactly(model):
+    """
+    The true (chance of winning, expected turns to win) from the start, or None if there are too many states
+    Solves the absorbing Markov chain over the playing states: with Q the
+    moves between them and r the chance of winning next turn, the chance of
+    winning is h = (I - Q)^-1 r and the expected turns of the winning games
+    are g / h with g = (I - Q)^-1 h.
+    """
+    playing = np.flatnonzero(model.status == PLAYING)
+    if model.status[model.start] != PLAYING:
+        return (1.0 if model.status[model.start] == FINISHED else 0.0), 0.0
+    if len(playing) > EXACT_LIMIT:
+        return None
+    position = np.full(len(model.states), -1, dtype=np.int64)
+    position[playing] = np.arange(len(playing))
+
+    sources = position[model.sources]
+    targets = position[model.targets]
+    moving = (sources >= 0) & (targets >= 0)
+    system = np.eye(len(playing))
+    np.subtract.at(system, (sources[moving], targets[moving]), model.probabilities[moving])
+    winning = (sources >= 0) & (model.status[model.targets] == FINISHED)
+    chance = np.bincount(sources[winning], weights=model.probabilities[winning], minlength=len(playing))
+
+    win_chance = np.linalg.solve(system, chance)
+    turns = np.linalg.solve(system, win_chance)
+    start = position[model.start]
+    if win_chance[start] <= 0:
+        return 0.0, float("inf")
+    return float(win_chance[start]), float(turns[start] / win_chance[start])
+
+
+def bar(fraction):
+    """
+    A text bar for a fraction between 0 and 1
+    """
+    return "█" * round(fraction * BAR_WIDTH)
+
+
+def print_report(model, result, exact, top=15):
+    """
+    Print the outcome, the turns-to-win distribution and the room heatmap
+    """
+    players = result.players
+    print(f"🎲 {players:,} players over {len(model.states):,} states (bias {model.bias:g}): "
+          f"built in {model.seconds:.2f}s, simulated in {result.seconds:.2f}s")
+    turns = result.turns_to_win
+    print(f"   won {len(turns) / players:.1%}, stuck {result.stuck / players:.1%}, "
+          f"still wandering {result.wandering / players:.1%}")
+    if exact is not None:
+        win_chance, expected = exact
+        print(f"   exact: {win_chance:.1%} chance to win, {expected:.1f} turns expected for a win")
+    if not len(turns):
+        return
+
+    percentiles = np.percentile(turns, [10, 50, 90, 99])
+    print(f"   turns to win: mean {turns.mean():.1f}, p10 {percentiles[0]:.0f}, p50 {percentiles[1]:.0f}, "
+          f"p90 {percentiles[2]:.0f}, p99 {percentiles[3]:.0f}")
+
+    print("\n⏱️  Turns to win")
+    counts, edges = np.histogram(turns, bins=12, range=(turns.min(), max(percentiles[3], turns.min() + 1)))
+    for count, low, high in zip(counts, edges, edges[1:]):
+        print(f"  {low:>7.0f}-{high:<7.0f} {count / len(turns):6.1%} {bar(count / counts.max())}")
+
+    print("\n🔥 Where players spend their turns")
+    total = result.room_visits.sum()
+    busiest = np.argsort(result.room_visits)[::-1][:top]
+    for location_id in busiest:
+        share = result.room_visits[location_id] / total
+        if share == 0:
+            break
+        name = model.world.locations[location_id].name
+        print(f"  {name[:24]:<24} {share:6.1%} {bar(share / (result.room_visits[busiest[0]] / total))}")
+    unvisited = [location.name for location in model.world.locations
+                 if location is not None and result.room_visits[location.id] == 0]
+    if unvisited:
+        print(f"  (never visited: {', '.join(unvisited[:10])}{' ...' if len(unvisited) > 10 else ''})")
+
+
+def main():
+    """
+    Analyse the game data from the command line
+    """
+    parser = argparse.ArgumentParser(description="Monte Carlo play analytics for Turbo's Quest")
+    parser.add_argument("--data", default="data", help="game data directory")
+    parser.add_argument("--players", type=int, default=1000000, help="players to simulate")
+    parser.add_argument("--max-turns", type=int, default=2000, help="turns before a player gives up")
+    parser.add_argument("--bias", type=float, default=1.0,
+                        help="how much more players favour commands that make progress (1 = purely random)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--top", type=int, default=15, help="rooms to show in the heatmap")
+    args = parser.parse_args()
+
+    if np is None:
+        print("❌ Play analytics need NumPy: pip install numpy")
+        sys.exit(2)
+    loader = DataLoader(args.data, verbose=False)
+    if not loader.load_all_data():
+        sys.exit(2)
+    try:
+        model = PlayModel(loader.world, bias=args.bias)
+    except AnalyticsError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    result = simulate(model, args.players, args.max_turns, args.seed)
+    print_report(model, result, solve_exactly(model), args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1241 @@
+#!/usr/bin/env python3
+"""
+Turbo's Quest - Benchmarks
+Micro-benchmarks for the game engine's hot paths
+
+Run everything with `python benchmark.py`, or pick benchmarks by name:
+    python benchmark.py lookup
+
+Save the numbers to compare them with another commit later:
+    python benchmark.py --output before.json
+    python benchmark.py --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import copy
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import analytics
+from commands import CommandIndex
+import goldens
+from journal import TURN, Journal, JournaledSession, encode_turn
+from loadgen import run_load
+from main import DataLoader, GameEngine, Location, Player, SpecialAction, iter_bits
+from navigation import Navigator, navigator_for
+from packs import PackRegistry
+from rules import ActionIndex, compile_requirement, failed_requirement
+from sessionhost import SessionHost, memory_usage
+from sessionstore import SessionStore
+import solver
+from worldgen import write_world
+
+
+# Every benchmark registers itself here by name
+BENCHMARKS = {}
+
+# Everything reported during this run: benchmark name -> label -> {"value", "unit"}
+RESULTS = {}
+running = None  # Name of the benchmark currently running
+
+# Canned command transcripts replayed by bench_transcripts
+TRANSCRIPT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "transcripts")
+
+
+def benchmark(func):
+    """
+    Register a benchmark function under its name without the bench_ prefix
+    """
+    BENCHMARKS[func.__name__[len("bench_"):]] = func
+    return func
+
+
+def time_per_call(func, repeat):
+    """
+    Run func() `repeat` times and return the average cost in nanoseconds
+    """
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter_ns() - start) / repeat
+
+
+def record(label, value, unit):
+    """
+    Keep a result for the machine-readable output file
+    """
+    RESULTS.setdefault(running, {})[label] = {"value": value, "unit": unit}
+
+
+def report(label, nanoseconds):
+    """
+    Print one benchmark result line, in milliseconds once nanoseconds get unwieldy
+    """
+    record(label, nanoseconds, "ns")
+    if nanoseconds >= 1e6:
+        print(f"  {label:<44} {nanoseconds / 1e6:>10.2f} ms")
+    else:
+        print(f"  {label:<44} {nanoseconds:>10.0f} ns")
+
+
+def report_value(label, value, unit):
+    """
+    Print one result line that isn't a duration (rates, byte counts)
+    """
+    record(label, value, unit)
+    print(f"  {label:<44} {value:>10.0f} {unit}")
+
+
+def check_flat(label, costs, slack=3):
+    """
+    Fail the run if a cost grew with the input instead of staying flat
+    `costs` maps each size to its cost; the biggest may be at most `slack` times the smallest.
+    """
+    cheapest = min(costs.values())
+    sizes = ", ".join(f"{size}: {cost / 1e3:.0f} µs" for size, cost in costs.items())
+    assert costs[max(costs)] <= slack * cheapest, f"{label} grows with size ({sizes})"
+    print(f"  {label} stays flat ✅")
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def load_world(data_directory="data"):
+    """
+    Load the game data once so every benchmark shares the same world
+    """
+    loader = DataLoader(data_directory)
+    if not loader.load_all_data():
+        raise SystemExit(1)
+    return loader
+
+
+# A short loop around the house that mixes movement, actions and misses
+LOOKUP_COMMANDS = [
+    ("living_room", "kitchen"),
+    ("kitchen", "examine cabinet"),
+    ("kitchen", "balcony"),
+    ("balcony", "look at garden"),
+    ("balcony", "garden"),
+    ("garden", "examine shed"),
+    ("garden", "tool_shed"),
+    ("tool_shed", "examine inside"),
+    ("tool_shed", "sing a song"),
+]
+
+
+def resolve_from_json(loader, location_key, command):
+    """
+    Resolve a command the way the engine did before the world was compiled:
+    string-keyed dict lookups and a scan over every exit
+    """
+    location = loader.locations[location_key]
+    for exit_key, destination in location.get("exits", {}).items():
+        if command == exit_key or command == destination:
+            return destination
+    actions = location.get("actions", {})
+    if command in actions:
+        action = loader.story_config.get("special_actions", {})[actions[command]]
+        for req in action.get("requirements", []):
+            if req.get("type") == "has_item":
+                req.get("item")
+        return action.get("description", "Something happens...")
+    return None
+
+
+def resolve_compiled(world, location_id, command):
+    """
+    Resolve a command against the compiled world: integer ids and linked records
+    """
+    location = world.locations[location_id]
+    destination = location.moves.get(command)
+    if destination is not None:
+        return destination
+    action_id = location.actions.get(command)
+    if action_id is not None:
+        action = world.actions[action_id]
+        for req in action.requirements:
+            if req.type == "has_item":
+                req.item
+        return action.description
+    return None
+
+
+@benchmark
+def bench_lookup(loader, repeat=20000):
+    """
+    Per-command resolution cost: raw JSON dicts versus the compiled world
+    """
+    world = loader.world
+    json_commands = LOOKUP_COMMANDS
+    compiled_commands = [(world.location_ids[key], command) for key, command in LOOKUP_COMMANDS]
+
+    def run_json():
+        for location_key, command in json_commands:
+            resolve_from_json(loader, location_key, command)
+
+    def run_compiled():
+        for location_id, command in compiled_commands:
+            resolve_compiled(world, location_id, command)
+
+    per_json = time_per_call(run_json, repeat) / len(json_commands)
+    per_compiled = time_per_call(run_compiled, repeat) / len(compiled_commands)
+    report("resolve command (JSON dicts)", per_json)
+    report("resolve command (compiled world)", per_compiled)
+    print(f"  speedup: {per_json / per_compiled:.2f}x")
+
+
+@benchmark
+def bench_process_command(loader, repeat=2000):
+    """
+    Full headless turn cost for a walk around the house
+    """
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    walk = ["kitchen", "balcony", "garden", "tool shed", "garden", "balcony", "kitchen", "living room"]
+
+    def run_walk():
+        for command in walk:
+            engine.process_command(command)
+
+    report("process_command (movement, headless)", time_per_call(run_walk, repeat) / len(walk))
+
+
+@benchmark
+def bench_dispatch(loader, repeat=2000):
+    """
+    Command index lookups as a room grows to hundreds of actions
+    """
+    typo_costs = {}
+    for action_count in (10, 100, 1000):
+        location = Location(0, "big_room", {"name": "Big Room", "description": ""})
+        for number in range(action_count):
+            location.actions[f"examine thing {number:04d}"] = number
+        location.moves = {"north hall": 1, "south hall": 2}
+        index = CommandIndex.build(location)
+
+        exact = "examine thing 0007"
+        prefix = "north"
+        typo = "examine thng 0007"
+        index.suggest(typo)  # Builds the room's typo index once
+        report(f"exact, {action_count} actions", time_per_call(lambda: index.resolve(exact), repeat))
+        report(f"prefix, {action_count} actions", time_per_call(lambda: index.resolve(prefix), repeat))
+        typo_costs[action_count] = time_per_call(lambda: index.suggest(typo), max(1, repeat // 10))
+        report(f"typo suggestion, {action_count} actions", typo_costs[action_count])
+    check_flat("typo suggestion cost", typo_costs, slack=2)
+
+
+@benchmark
+def bench_players(loader, count=100000):
+    """
+    Memory per live player and the cost of the per-turn progress checks
+    """
+    world = loader.world
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    players = []
+    for number in range(count):
+        player = Player("Turbo", say=engine.say)
+        player.current_location = world.starting_location
+        player.mark_visited(world.starting_location)
+        player.complete_action(number % len(world.actions))
+        player.inventory |= 1 << (number % len(world.items))
+        players.append(player)
+    allocated = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+    tracemalloc.stop()
+    print(f"  {count} players: {allocated / 1024 / 1024:.1f} MiB, {allocated / count:.0f} bytes each")
+
+    player = engine.player
+    report("has_item", time_per_call(lambda: player.has_item(3), 100000))
+    report("has_completed", time_per_call(lambda: player.has_completed(3), 100000))
+    report("check_all_items_collected", time_per_call(engine.check_all_items_collected, 100000))
+
+
+def snapshot_as_json(engine):
+    """
+    The naive alternative to GameEngine.snapshot(): session state as JSON with string ids
+    """
+    world = engine.world
+    player = engine.player
+    return json.dumps({
+        "location": world.locations[player.current_location].key,
+        "inventory": [world.items[i].key for i in iter_bits(player.inventory)],
+        "discovered": [world.locations[i].key for i in iter_bits(player.discovered_locations)],
+        "visited": [world.locations[i].key for i in iter_bits(player.visited_locations)],
+        "completed": [world.actions[i].key for i in iter_bits(player.completed_actions)],
+        "size_realization": player.size_realization_triggered,
+        "revelation": player.revelation_triggered,
+        "won": player.game_won,
+        "running": engine.game_running,
+    })
+
+
+def restore_from_json(engine, text):
+    """
+    Rebuild a player from snapshot_as_json() output
+    """
+    world = engine.world
+    state = json.loads(text)
+    player = Player("Turbo", say=engine.say)
+    player.current_location = world.location_ids[state["location"]]
+    for key in state["inventory"]:
+        player.inventory |= 1 << world.item_ids[key]
+    for key in state["discovered"]:
+        player.discover(world.location_ids[key])
+    for key in state["visited"]:
+        player.mark_visited(world.location_ids[key])
+    for key in state["completed"]:
+        player.complete_action(world.action_ids[key])
+    player.quest_items_found = (player.inventory & world.quest_mask).bit_count()
+    player.size_realization_triggered = state["size_realization"]
+    player.revelation_triggered = state["revelation"]
+    player.game_won = state["won"]
+    engine.player = player
+    engine.game_running = state["running"]
+
+
+@benchmark
+def bench_snapshot(loader, repeat=50000):
+    """
+    Session snapshot and restore: binary records versus naive JSON
+    """
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    for command in ["kitchen", "get step stool", "jump on counter", "balcony", "examine storage box"]:
+        engine.process_command(command)
+
+    binary = engine.snapshot()
+    text = snapshot_as_json(engine)
+    print(f"  binary record: {len(binary)} bytes, JSON: {len(text.encode('utf-8'))} bytes")
+    report("snapshot (binary)", time_per_call(engine.snapshot, repeat))
+    report("restore (binary)", time_per_call(lambda: engine.restore(binary), repeat))
+    report("snapshot (JSON)", time_per_call(lambda: snapshot_as_json(engine), repeat))
+    report("restore (JSON)", time_per_call(lambda: restore_from_json(engine, text), repeat))
+
+
+def wander(engine, turns, rng):
+    """
+    Play `turns` random exits and actions, like a very long and aimless session
+    """
+    for _ in range(turns):
+        location = engine.locations[engine.player.current_location]
+        engine.process_command(rng.choice(list(location.exits) + list(location.actions)))
+
+
+@benchmark
+def bench_history(loader, turns=50000, room_count=10000):
+    """
+    Undo history: memory per retained turn over long sessions, versus keeping a snapshot or Player copy per turn
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        write_world(directory, rooms=room_count, exits=3, actions=3, chain_length=10, quest_items=3, seed=0)
+        generated = DataLoader(directory, verbose=False)
+        generated.load_all_data()
+        for label, world_loader in (("shipped world", loader), (f"{room_count} rooms", generated)):
+            engine = GameEngine(world_loader, headless=True)
+            # Play the same session twice so the world's own caches are warm before measuring
+            engine.new_game()
+            wander(engine, turns, random.Random(0))
+            engine.new_game()
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            start_depth = engine.history.head.depth
+            wander(engine, turns, random.Random(0))
+            grown = tracemalloc.get_traced_memory()[0] - before
+            tracemalloc.stop()
+            retained = engine.history.head.depth - start_depth
+            report_value(f"{label}: turns retained of {turns}", retained, "turns")
+            report_value(f"{label}: memory per retained turn (shared)", grown / retained, "bytes")
+
+            # The naive ways: a binary snapshot, or a copy of the Player, kept for every turn
+            engine.new_game()
+            rng = random.Random(0)
+            snapshots, players = [], []
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            for _ in range(retained):
+                wander(engine, 1, rng)
+                snapshots.append(engine.snapshot())
+            report_value(f"{label}: memory per snapshot copy", (tracemalloc.get_traced_memory()[0] - before) /
+                         len(snapshots), "bytes")
+            del snapshots
+            before = tracemalloc.get_traced_memory()[0]
+            for _ in range(retained):
+                wander(engine, 1, rng)
+                players.append(copy.copy(engine.player))
+            report_value(f"{label}: memory per Player copy", (tracemalloc.get_traced_memory()[0] - before) /
+                         len(players), "bytes")
+            tracemalloc.stop()
+            del players
+
+            checkpoints = []
+            node = engine.checkpoint()
+            while node is not None:
+                checkpoints.append(node)
+                node = node.parent
+            rng = random.Random(1)
+            report(f"{label}: rewind to any turn", time_per_call(lambda: engine.rewind_to(rng.choice(checkpoints)),
+                                                                 10000))
+            report(f"{label}: undo command", time_per_call(lambda: engine.process_command("undo"), 1000))
+            world_loader.sessions.discard(engine)
+
+
+def time_to_first_prompt(prompt):
+    """
+    Launch `python main.py` and return the seconds until it shows the first prompt
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "main.py"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    seen = b""
+    while prompt not in seen:
+        chunk = os.read(process.stdout.fileno(), 65536)
+        if not chunk:
+            break
+        seen += chunk
+    elapsed = time.perf_counter() - start
+    process.kill()
+    process.wait()
+    process.stdout.close()
+    process.stdin.close()
+    return elapsed
+
+
+def read_transcript(path):
+    """
+    Read one command per line, skipping blank lines and # comments
+    """
+    with open(path, encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip() and not line.startswith("#")]
+
+
+def replay_timed(loader, commands):
+    """
+    Play a transcript in a fresh headless session, returning each command's latency in ns
+    """
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    latencies = []
+    for command in commands:
+        start = time.perf_counter_ns()
+        engine.process_command(command)
+        latencies.append(time.perf_counter_ns() - start)
+    return latencies
+
+
+def replay_traced(loader, commands):
+    """
+    Play a transcript under tracemalloc
+    Returns (peak bytes for the whole session, peak bytes of each turn's temporaries)
+    """
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    turn_peaks = []
+    session_peak = tracemalloc.get_traced_memory()[1]
+    for command in commands:
+        session_peak = max(session_peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        engine.process_command(command)
+        turn_peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    session_peak = max(session_peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    return session_peak - base, turn_peaks
+
+
+@benchmark
+def bench_transcripts(loader, rounds=200):
+    """
+    Replay recorded transcripts: throughput, latency percentiles and allocations
+    """
+    for filename in sorted(os.listdir(TRANSCRIPT_DIRECTORY)):
+        if not filename.endswith(".txt"):
+            continue
+        name = filename[:-len(".txt")]
+        commands = read_transcript(os.path.join(TRANSCRIPT_DIRECTORY, filename))
+
+        latencies = []
+        for _ in range(rounds):
+            latencies.extend(replay_timed(loader, commands))
+        latencies.sort()
+        session_peak, turn_peaks = replay_traced(loader, commands)
+
+        print(f"  [{name}: {len(commands)} commands x {rounds}]")
+        report_value(f"{name}: commands/sec", 1e9 * len(latencies) / sum(latencies), "cmd/s")
+        report(f"{name}: p50 latency", percentile(latencies, 0.50))
+        report(f"{name}: p99 latency", percentile(latencies, 0.99))
+        report_value(f"{name}: session peak memory", session_peak, "B")
+        report_value(f"{name}: mean turn allocation peak", sum(turn_peaks) / len(turn_peaks), "B")
+        report_value(f"{name}: worst turn allocation peak", max(turn_peaks), "B")
+
+
+@benchmark
+def bench_describe(loader, repeat=2000):
+    """
+    Per-turn rendering cost: full room descriptions and the quick reminder, averaged over rooms
+    """
+    world = loader.world
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    rooms = [location.id for location in world.locations if location is not None]
+
+    def describe_every_room():
+        for location_id in rooms:
+            engine.player.current_location = location_id
+            engine.describe_current_location()
+            engine.flush_output()
+
+    def remind_every_room():
+        for location_id in rooms:
+            engine.player.current_location = location_id
+            engine.show_quick_location_reminder()
+            engine.flush_output()
+
+    report("describe_current_location + flush", time_per_call(describe_every_room, repeat) / len(rooms))
+    report("show_quick_location_reminder + flush", time_per_call(remind_every_room, repeat) / len(rooms))
+    renderer = engine.renderer
+    report_value("rendered view cache hit rate", 100 * renderer.hits / (renderer.hits + renderer.misses), "%")
+
+
+@benchmark
+def bench_metrics(loader, rounds=300):
+    """
+    Instrumentation overhead on the winning transcript: never enabled, switched off again, and on
+    """
+    commands = read_transcript(os.path.join(TRANSCRIPT_DIRECTORY, "full_win.txt"))
+
+    def replay(setup):
+        engine = GameEngine(loader, headless=True)
+        setup(engine)
+        engine.new_game()
+        start = time.perf_counter_ns()
+        for command in commands:
+            engine.process_command(command)
+        return time.perf_counter_ns() - start
+
+    def switched_off(engine):
+        engine.enable_metrics()
+        engine.disable_metrics()
+
+    # Interleave the variants so drift in machine speed hits them all equally
+    variants = {"never enabled": lambda engine: None, "enabled then disabled": switched_off,
+                "enabled": GameEngine.enable_metrics}
+    totals = dict.fromkeys(variants, 0)
+    for _ in range(rounds):
+        for name, setup in variants.items():
+            totals[name] += replay(setup)
+
+    baseline = totals["never enabled"]
+    for name, total in totals.items():
+        report(f"turn, metrics {name}", total / rounds / len(commands))
+    for name in ("enabled then disabled", "enabled"):
+        report_value(f"overhead, metrics {name}", 100 * (totals[name] - baseline) / baseline, "%")
+
+
+@benchmark
+def bench_journal(loader, events=1000000):
+    """
+    Session journal: append throughput and recovery time for a million events
+    """
+    # Real turn events from the winning transcript, cycled to fill the journal
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    start_snapshot = engine.snapshot()
+    payloads = []
+    for command in read_transcript(os.path.join(TRANSCRIPT_DIRECTORY, "full_win.txt")):
+        before = engine.history_state()
+        engine.process_command(command)
+        payloads.append(encode_turn(command, before, engine.history_state()))
+    end_snapshot = engine.snapshot()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # 1M isn't a multiple of 30k, so the compacted journal still has a tail to replay
+        for label, snapshot_every in (("no snapshots", None), ("snapshot every 30k", 30000)):
+            path = os.path.join(directory, f"{snapshot_every}.journal")
+            journal = Journal(path)
+            journal.write_snapshot(start_snapshot)
+            start = time.perf_counter_ns()
+            for number in range(events):
+                journal.append(TURN, payloads[number % len(payloads)])
+                if snapshot_every and journal.events_since_snapshot >= snapshot_every:
+                    journal.write_snapshot(end_snapshot)
+            journal.close()
+            elapsed = time.perf_counter_ns() - start
+            report_value(f"append, {label}", 1e9 * events / elapsed, "ev/s")
+            report_value(f"group commits, {label}", journal.commits, "fsyncs")
+
+            start = time.perf_counter_ns()
+            session, recovery = JournaledSession.recover(loader, path)
+            report(f"recover, {label} ({recovery.replayed} replayed)", time.perf_counter_ns() - start)
+            session.close()
+
+    # What journaling adds to a real turn
+    commands = read_transcript(os.path.join(TRANSCRIPT_DIRECTORY, "movement_loop.txt"))
+    with tempfile.TemporaryDirectory() as directory:
+        session, _ = JournaledSession.start(loader, os.path.join(directory, "turbo.journal"))
+        plain = GameEngine(loader, headless=True)
+        plain.new_game()
+        report("movement turn, plain", time_per_call(lambda: [plain.process_command(c) for c in commands], 200)
+               / len(commands))
+        report("movement turn, journaled",
+               time_per_call(lambda: [session.process_command(c) for c in commands], 200) / len(commands))
+        session.close()
+
+
+def write_ring_world(directory, room_count):
+    """
+    Write a simple world of rooms in a ring, each with two exits and two actions
+    """
+    locations = {}
+    special_actions = {}
+    for number in range(room_count):
+        key = f"room_{number}"
+        locations[key] = {
+            "name": f"Room {number}",
+            "description": f"Room number {number} of a very long hallway.",
+            "exits": {"next": f"room_{(number + 1) % room_count}", "back": f"room_{(number - 1) % room_count}"},
+            "actions": {"examine wall": f"wall_{number}", "sniff floor": f"floor_{number}"},
+        }
+        special_actions[f"wall_{number}"] = {"description": "A wall.", "repeatable": True}
+        special_actions[f"floor_{number}"] = {"description": "It smells of dog.", "repeatable": False}
+    story = {"game_settings": {"starting_location": "room_0"}, "special_actions": special_actions}
+    for filename, content in (("locations.json", locations), ("items.json", {}), ("story.json", story)):
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as file:
+            json.dump(content, file)
+
+
+# Run in a fresh interpreter so peak RSS only counts one way of loading
+LOAD_PROBE = """
+import json, resource, sys, time
+from main import DataLoader, GameEngine
+start = time.perf_counter()
+loader = DataLoader(sys.argv[1], use_cache=False, verbose=False, lazy=sys.argv[2] == "lazy")
+loader.load_all_data()
+loaded = time.perf_counter()
+engine = GameEngine(loader, headless=True)
+engine.new_game()
+engine.process_command("next")
+first_turn = time.perf_counter()
+for _ in range(200):
+    engine.process_command("next")
+# ru_maxrss survives exec on Linux (it would include the benchmark's own peak), VmHWM doesn't
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+try:
+    with open("/proc/self/status") as status:
+        peak = next(int(line.split()[1]) for line in status if line.startswith("VmHWM:"))
+except (OSError, StopIteration):
+    pass
+print(json.dumps({"load": loaded - start, "first_turn": first_turn - loaded, "rss_kib": peak}))
+"""
+
+
+def probe_loading(directory, mode):
+    """
+    Load a world in a subprocess and return its load time, first turn time and peak RSS
+    """
+    result = subprocess.run([sys.executable, "-c", LOAD_PROBE, directory, mode], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    return json.loads(result.stdout)
+
+
+@benchmark
+def bench_lazy(loader):
+    """
+    Eager versus lazy (indexed) loading as the world grows: load time, first turn and peak RSS
+    """
+    for room_count in (1000, 10000, 100000):
+        with tempfile.TemporaryDirectory() as parent:
+            directory = os.path.join(parent, "data")
+            os.mkdir(directory)
+            write_ring_world(directory, room_count)
+            size = os.path.getsize(os.path.join(directory, "locations.json"))
+            print(f"  [{room_count} rooms, locations.json {size / 1024 / 1024:.1f} MiB]")
+            # The first lazy run scans and saves the index; the second reuses it
+            for label, mode in (("eager", "eager"), ("lazy, building index", "lazy"), ("lazy, saved index", "lazy")):
+                result = probe_loading(directory, mode)
+                report(f"{label}: load", result["load"] * 1e9)
+                report(f"{label}: first turn", result["first_turn"] * 1e9)
+                report_value(f"{label}: peak RSS", result["rss_kib"] / 1024, "MiB")
+
+
+@benchmark
+def bench_reload(loader):
+    """
+    Hot reload latency for a one-action edit as the world grows
+    """
+    # A patch should cost as much as the edit, so repeated one-room edits (with a
+    # session playing and routes cached) have to stay flat from 1k to 50k rooms
+    room_edits = {}
+    for room_count in (1000, 10000, 50000):
+        with tempfile.TemporaryDirectory() as directory:
+            write_ring_world(directory, room_count)
+            big = DataLoader(directory, use_cache=False, verbose=False)
+            big.load_all_data()
+
+            start = time.perf_counter_ns()
+            big.apply_changes(special_actions={"wall_7": {"description": "A freshly painted wall."}})
+            report(f"apply_changes, {room_count} rooms", time.perf_counter_ns() - start)
+
+            engine = GameEngine(big, headless=True)
+            engine.new_game()
+            engine.process_command("go to room 3")
+            room = dict(big.locations["room_7"])
+            timings = []
+            for edit in range(51):
+                start = time.perf_counter_ns()
+                big.apply_changes(locations={"room_7": {**room, "description": f"Freshly swept, {edit} times."}})
+                timings.append(time.perf_counter_ns() - start)
+                engine.process_command("look")
+            room_edits[room_count] = percentile(sorted(timings), 0.5)
+            report(f"one-room edit, {room_count} rooms (median)", room_edits[room_count])
+
+            # The same edit through the file costs a re-parse and diff of story.json
+            path = os.path.join(directory, "story.json")
+            with open(path, encoding="utf-8") as file:
+                story = json.load(file)
+            story["special_actions"]["wall_7"]["description"] = "A wall with a paw print."
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(story, file)
+            start = time.perf_counter_ns()
+            big.reload()
+            report(f"reload from story.json, {room_count} rooms", time.perf_counter_ns() - start)
+    check_flat("one-room edit latency", room_edits)
+
+
+@benchmark
+def bench_generated(loader, seed=0):
+    """
+    Seeded generated worlds: load time, dispatch cost and a full winning playthrough
+    """
+    for room_count in (1000, 10000, 100000):
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter_ns()
+            solution = write_world(directory, rooms=room_count, exits=4, actions=4, chain_length=20,
+                                   quest_items=5, seed=seed)
+            generated = time.perf_counter_ns() - start
+            print(f"  [{room_count} rooms, seed {seed}, won by a {len(solution)} command transcript]")
+            report("generate", generated)
+
+            start = time.perf_counter_ns()
+            big = DataLoader(directory, use_cache=False, verbose=False)
+            if not big.load_all_data():
+                raise SystemExit(f"Generated world with {room_count} rooms didn't load")
+            report("load_all_data", time.perf_counter_ns() - start)
+
+            location = big.world.locations[big.world.starting_location]
+            commands = list(location.exits) + list(location.actions)
+            report("dispatch, start room commands", time_per_call(
+                lambda: [location.commands.resolve(command) for command in commands], 2000) / len(commands))
+
+            engine = GameEngine(big, headless=True)
+            engine.new_game()
+            latencies = []
+            for command in solution:
+                start = time.perf_counter_ns()
+                engine.process_command(command)
+                latencies.append(time.perf_counter_ns() - start)
+            if not engine.player.game_won:
+                raise SystemExit(f"The generated solution didn't win the {room_count} room world")
+            latencies.sort()
+            report_value("playthrough: commands/sec", 1e9 * len(latencies) / sum(latencies), "cmd/s")
+            report("playthrough: p99 latency", percentile(latencies, 0.99))
+
+
+def requirements_from_json(data, item_ids, inventory):
+    """
+    Check an action's requirements the way the engine did before they were compiled:
+    walking the raw JSON and looking every item up by name
+    """
+    for req in data.get("requirements", []):
+        if req.get("type") == "has_item":
+            item_id = item_ids.get(req.get("item"))
+            if item_id is None or not inventory >> item_id & 1:
+                return req.get("message")
+    return None
+
+
+def nested_requirement(depth, item_keys):
+    """
+    A requirement tree `depth` levels deep that's met when every item is carried
+    Levels alternate between 'all', 'any' and a double 'not'.
+    """
+    requirement = {"type": "has_item", "item": item_keys[0]}
+    for level in range(depth):
+        item = {"type": "has_item", "item": item_keys[(level + 1) % len(item_keys)]}
+        if level % 3 == 0:
+            requirement = {"type": "all", "requirements": [item, requirement]}
+        elif level % 3 == 1:
+            requirement = {"type": "any", "requirements": [requirement, item]}
+        else:
+            requirement = {"type": "not", "requirement": {"type": "not", "requirement": requirement}}
+    return requirement
+
+
+@benchmark
+def bench_rules(loader, repeat=200):
+    """
+    Requirement checks on a world with a deep key chain: raw JSON versus compiled rules
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        write_world(directory, rooms=200, exits=3, actions=5, chain_length=1000, quest_items=5, seed=0)
+        big = DataLoader(directory, use_cache=False, verbose=False)
+        big.load_all_data()
+    world = big.world
+    player = Player(say=lambda text: None)
+    player.inventory = (1 << len(world.items)) - 1  # Carrying everything, so every check runs to the end
+    chain = [world.actions[world.action_ids[f"chain_{step}"]] for step in range(1000)]
+
+    report("chain actions, raw JSON", time_per_call(
+        lambda: [requirements_from_json(big.story_config["special_actions"][action.key], world.item_ids,
+                                        player.inventory) for action in chain], repeat) / len(chain))
+    report("chain actions, compiled", time_per_call(
+        lambda: [failed_requirement(action, player) for action in chain], repeat) / len(chain))
+
+    # One action needing every key in the chain
+    keys = [f"key_{step}" for step in range(1000)]
+    wide = {"requirements": [{"type": "has_item", "item": key} for key in keys]}
+    issues = []
+    action = SpecialAction(-1, "wide", wide, tuple(compile_requirement(world, "wide", req, issues)
+                                                    for req in wide["requirements"]), ())
+    report("1000 item requirements, raw JSON", time_per_call(
+        lambda: requirements_from_json(wide, world.item_ids, player.inventory), repeat))
+    report("1000 item requirements, compiled", time_per_call(lambda: failed_requirement(action, player), repeat))
+
+    for depth in (10, 50, 100):
+        data = {"requirements": [nested_requirement(depth, keys)]}
+        action = SpecialAction(-1, "nested", data, tuple(compile_requirement(world, "nested", req, issues)
+                                                         for req in data["requirements"]), ())
+        report(f"any/all/not tree {depth} deep, compiled",
+               time_per_call(lambda: failed_requirement(action, player), repeat))
+
+    # Which actions can be done here: answered again each time versus cached by dependent state
+    rooms = [location.id for location in world.locations if location.actions]
+    report("available actions, uncached", time_per_call(
+        lambda: [ActionIndex(world).available(location_id, player) for location_id in rooms], 20) / len(rooms))
+    index = ActionIndex(world)
+    report("available actions, cached", time_per_call(
+        lambda: [index.available(location_id, player) for location_id in rooms], repeat) / len(rooms))
+
+
+@benchmark
+def bench_navigation(loader, routes=200):
+    """
+    "go to" routing on generated worlds: graph build, first and cached routes, incremental rebuilds
+    """
+    for room_count in (1000, 10000, 100000):
+        with tempfile.TemporaryDirectory() as directory:
+            write_world(directory, rooms=room_count, exits=3, actions=1, chain_length=5, quest_items=3, seed=0)
+            big = DataLoader(directory, use_cache=False, verbose=False)
+            big.load_all_data()
+        world = big.world
+        print(f"  [{room_count} rooms]")
+        start = time.perf_counter_ns()
+        navigator = navigator_for(world).build()
+        report("build exits graph", time.perf_counter_ns() - start)
+
+        destinations = list(range(0, room_count, max(1, room_count // 20)))[:20]
+        start = time.perf_counter_ns()
+        for destination in destinations:
+            navigator.tree(destination)
+        report("first route to a room (builds its tree)", (time.perf_counter_ns() - start) / len(destinations))
+        starts = [(number * 7919) % room_count for number in range(routes)]
+        lengths = []
+
+        def route_all():
+            lengths.clear()
+            for number, start_id in enumerate(starts):
+                lengths.append(len(navigator.route(start_id, destinations[number % len(destinations)])))
+
+        report("cached route lookup", time_per_call(route_all, 20) / len(starts))
+        report_value("mean route length", sum(lengths) / len(lengths), "rooms")
+
+        engine = GameEngine(big, headless=True)
+        engine.new_game()
+        engine.player.discovered_locations = (1 << room_count) - 1
+        place = world.locations[destinations[-1]].name.lower()
+        home = world.locations[world.starting_location].name.lower()
+        report("'go to' turn, there and back", time_per_call(
+            lambda: (engine.process_command(f"go to {place}"), engine.process_command(f"go to {home}")), 50) / 2)
+
+        # One room gains a shortcut: rebuild from scratch versus carrying the old tables over
+        key = world.locations[destinations[1]].key
+        exits = dict(big.locations[key]["exits"])
+        exits["secret passage"] = world.locations[destinations[2]].key
+        big.apply_changes(locations={key: {**big.locations[key], "exits": exits}})
+        start = time.perf_counter_ns()
+        fresh = Navigator(big.world).build()
+        for destination in destinations:
+            fresh.tree(destination)
+        report("reload: fresh navigator + 20 trees", time.perf_counter_ns() - start)
+        start = time.perf_counter_ns()
+        derived = navigator.derive(big.world)
+        report("reload: derived navigator", time.perf_counter_ns() - start)
+        report_value("reload: trees kept", len(derived.trees), "trees")
+
+
+@benchmark
+def bench_host(loader, sessions=200, room_count=10000):
+    """
+    Multi-process session host: throughput and per-worker memory by worker count and world sharing mode
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        solution = write_world(directory, rooms=room_count, exits=3, actions=3, chain_length=10,
+                               quest_items=3, seed=0)
+        print(f"  [{room_count} rooms, {sessions} sessions each playing a {len(solution)} command win, "
+              f"{os.cpu_count()} cores]")
+        for mode in ("copy", "fork", "mapped"):
+            for workers in (1, 2, 4):
+                with SessionHost(directory, workers=workers, mode=mode) as host:
+                    session_ids = [f"player-{number}" for number in range(sessions)]
+                    host.run_batch([(session_id, None) for session_id in session_ids])
+                    start = time.perf_counter_ns()
+                    for command in solution:
+                        host.run_batch([(session_id, command) for session_id in session_ids])
+                    elapsed = time.perf_counter_ns() - start
+                    stats = host.stats()
+                label = f"{mode}, {workers} worker{'s' if workers > 1 else ''}"
+                report_value(f"{label}: commands/sec", 1e9 * sessions * len(solution) / elapsed, "cmd/s")
+                report_value(f"{label}: RSS per worker", sum(stat["rss"] for stat in stats) / workers / 1024, "MiB")
+                report_value(f"{label}: private per worker",
+                             sum(stat["private"] for stat in stats) / workers / 1024, "MiB")
+
+
+@benchmark
+def bench_solver(loader, chain_length=20):
+    """
+    Proving generated worlds winnable as they grow, with a long key chain to multiply the states
+    """
+    for room_count in (1000, 5000, 20000):
+        with tempfile.TemporaryDirectory() as directory:
+            solution = write_world(directory, rooms=room_count, chain_length=chain_length, seed=0)
+            big = DataLoader(directory, use_cache=False, verbose=False)
+            big.load_all_data()
+            start = time.perf_counter_ns()
+            result = solver.solve(big.world, workers=1)
+            report(f"solve, {room_count} rooms ({result.states} states)", time.perf_counter_ns() - start)
+            assert solver.verify_path(big, result.winning_path), "the solver's winning path doesn't win"
+            assert len(result.winning_path) <= len(solution)
+            report_value(f"shortest win, {room_count} rooms", len(result.winning_path), "commands")
+
+
+@benchmark
+def bench_analytics(loader, players=1000000):
+    """
+    Play analytics: building the Markov chain, simulating a million random players, and the exact solve
+    """
+    if analytics.np is None:
+        print("  [skipped: NumPy isn't installed]")
+        return
+    start = time.perf_counter_ns()
+    model = analytics.PlayModel(loader.world)
+    report(f"build chain ({len(model.states)} states)", time.perf_counter_ns() - start)
+    start = time.perf_counter_ns()
+    result = analytics.simulate(model, players)
+    elapsed = time.perf_counter_ns() - start
+    report(f"simulate {players} players", elapsed)
+    player_turns = int(result.room_visits.sum())
+    report_value("simulated player turns/sec", 1e9 * player_turns / elapsed, "turns/s")
+    start = time.perf_counter_ns()
+    win_chance, expected = analytics.solve_exactly(model)
+    report("exact solve", time.perf_counter_ns() - start)
+    report_value("expected turns to win (exact)", expected, "turns")
+    report_value("mean turns to win (simulated)", result.turns_to_win.mean(), "turns")
+
+
+@benchmark
+def bench_server(loader, connections=(100, 1000, 3000)):
+    """
+    Network server: thousands of loopback players each winning the full walkthrough at once
+    """
+    commands = read_transcript(os.path.join("transcripts", "full_win.txt"))
+    for count in connections:
+        results = asyncio.run(run_load(commands, count, loader.data_dir))
+        latencies = results["latencies"]
+        won = results["outcomes"].get("won", 0)
+        label = f"{count} connections"
+        report_value(f"{label}: games won", won, "games")
+        report_value(f"{label}: commands/sec", len(latencies) / results["elapsed"], "cmd/s")
+        for name, fraction in (("p50", 0.50), ("p99", 0.99)):
+            report_value(f"{label}: {name} latency", percentile(latencies, fraction) / 1e6, "ms")
+
+
+@benchmark
+def bench_goldens(loader, count=3000):
+    """
+    Golden transcript replay: transcripts checked per second by number of worker processes
+    """
+    transcripts = [read_transcript(os.path.join(TRANSCRIPT_DIRECTORY, filename))
+                   for filename in sorted(os.listdir(TRANSCRIPT_DIRECTORY)) if filename.endswith(".txt")]
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for number in range(count):
+            path = os.path.join(directory, f"session_{number}.golden")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(goldens.record(loader, transcripts[number % len(transcripts)]))
+            paths.append(path)
+        print(f"  [{count} transcripts, {os.cpu_count()} cores]")
+        for workers in (1, 2, 4):
+            start = time.perf_counter_ns()
+            failed = sum(1 for _, _, diff in goldens.check_all(loader, paths, workers) if diff)
+            elapsed = time.perf_counter_ns() - start
+            label = f"{workers} worker{'s' if workers > 1 else ''}"
+            report_value(f"{label}: transcripts/sec", 1e9 * count / elapsed, "transcripts/s")
+            if failed:
+                print(f"  ⚠️  {failed} transcripts didn't match")
+
+
+@benchmark
+def bench_store(loader, sessions=1000000, commands=200000, budget=16 * 1024 * 1024):
+    """
+    Memory-capped session store: a million mostly idle sessions, with most traffic going to a few hot ones
+    """
+    rng = random.Random(0)
+    phrases = ["look", "kitchen", "living room", "inventory", "stats"]
+    with tempfile.TemporaryDirectory() as directory:
+        rss_before = memory_usage()["rss"]
+        store = SessionStore(loader, os.path.join(directory, "sessions.db"), memory_budget=budget)
+        print(f"  [{budget / 1024 / 1024:.0f} MiB budget: {store.max_resident} resident sessions]")
+        start = time.perf_counter_ns()
+        for number in range(sessions):
+            store.open(f"player-{number}")
+        elapsed = time.perf_counter_ns() - start
+        report_value("open sessions", 1e9 * sessions / elapsed, "sessions/s")
+        report_value("RSS growth after opening all", (memory_usage()["rss"] - rss_before) / 1024, "MiB")
+
+        # 90% of commands go to the 1% most active players, the rest to anyone at all
+        hot = max(1, sessions // 100)
+        start = time.perf_counter_ns()
+        for _ in range(commands):
+            number = rng.randrange(hot) if rng.random() < 0.9 else rng.randrange(sessions)
+            store.send(f"player-{number}", rng.choice(phrases))
+        elapsed = time.perf_counter_ns() - start
+        stats = store.stats()
+        report_value("commands/sec", 1e9 * commands / elapsed, "cmd/s")
+        report_value("hits", stats["hits"], "commands")
+        report_value("misses (paged in)", stats["misses"], "commands")
+        report_value("evicted", stats["evicted"], "sessions")
+        report("page-in p50", stats["page_in_p50"])
+        report("page-in p99", stats["page_in_p99"])
+        report_value("RSS growth at the end", (memory_usage()["rss"] - rss_before) / 1024, "MiB")
+        store.close()
+        report_value("on disk", os.path.getsize(os.path.join(directory, "sessions.db")) / 1024 / 1024, "MiB")
+
+
+def write_pack_variants(base, directory, count):
+    """
+    Copy a world `count` times, each copy rewording one room and one special action
+    Returns the pack directories and how many bytes of text each pack changed.
+    """
+    with open(os.path.join(base, "locations.json"), encoding="utf-8") as file:
+        locations = json.load(file)
+    with open(os.path.join(base, "story.json"), encoding="utf-8") as file:
+        story = json.load(file)
+    with open(os.path.join(base, "items.json"), encoding="utf-8") as file:
+        items_text = file.read()
+    room_keys = list(locations)
+    action_keys = list(story["special_actions"])
+    paths = []
+    changed = 0
+    for number in range(count):
+        room = copy.deepcopy(locations[room_keys[number % len(room_keys)]])
+        action = copy.deepcopy(story["special_actions"][action_keys[number % len(action_keys)]])
+        room["description"] += f" A banner says this is edition {number}."
+        action["description"] += f" (Edition {number} exclusive!)"
+        changed += len(room["description"].encode("utf-8")) + len(action["description"].encode("utf-8"))
+        path = os.path.join(directory, f"edition_{number}")
+        os.makedirs(path)
+        for filename, content in (
+                ("locations.json", {**locations, room_keys[number % len(room_keys)]: room}),
+                ("story.json", {**story, "special_actions": {**story["special_actions"],
+                                                             action_keys[number % len(action_keys)]: action}})):
+            with open(os.path.join(path, filename), "w", encoding="utf-8") as file:
+                json.dump(content, file, indent=1)
+        with open(os.path.join(path, "items.json"), "w", encoding="utf-8") as file:
+            file.write(items_text)
+        paths.append(path)
+    return paths, changed / count
+
+
+def traced_memory(build):
+    """
+    Bytes still allocated by build() once it returns, along with what it returned
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size, result
+
+
+@benchmark
+def bench_packs(loader, count=100, room_count=300):
+    """
+    Story pack registry: memory for 100 near-identical packs, pooled versus loaded separately
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        base = os.path.join(directory, "base")
+        solution = write_world(base, rooms=room_count, exits=3, actions=3, chain_length=5, quest_items=3, seed=0)
+        paths, changed = write_pack_variants(base, directory, count)
+        for path in paths:
+            DataLoader(path, verbose=False).load_all_data()  # Write every cache, so both sides load the same way
+        print(f"  [{count} packs of {room_count} rooms, each rewording {changed:.0f} bytes of text]")
+
+        def load_separately():
+            loaders = [DataLoader(path, verbose=False) for path in paths]
+            for separate in loaders:
+                separate.load_all_data()
+            return loaders
+
+        separate, loaders = traced_memory(load_separately)
+        del loaders
+        registry = PackRegistry()
+        first, _ = traced_memory(lambda: registry.add("edition_0", paths[0]))
+        rest, _ = traced_memory(lambda: [registry.add(f"edition_{number}", path)
+                                         for number, path in enumerate(paths) if number])
+        stats = registry.stats()
+        report_value(f"{count} packs, separate loaders", separate / 1024 / 1024, "MiB")
+        report_value(f"{count} packs, pooled registry", (first + rest) / 1024 / 1024, "MiB")
+        report_value("separate: memory per pack", separate / count / 1024, "KiB")
+        report_value("pooled: first pack", first / 1024, "KiB")
+        report_value("pooled: each further pack", rest / (count - 1) / 1024, "KiB")
+        report_value("pooled values reused", 100 * stats["reused"] / stats["pooled"], "%")
+
+        timed = paths[:10]
+        start = time.perf_counter_ns()
+        for path in timed:
+            DataLoader(path, verbose=False).load_all_data()
+        report("load one pack", (time.perf_counter_ns() - start) / len(timed))
+        pooled = PackRegistry()
+        start = time.perf_counter_ns()
+        for number, path in enumerate(timed):
+            pooled.add(f"edition_{number}", path)
+        report("load and pool one pack", (time.perf_counter_ns() - start) / len(timed))
+
+        won = 0
+        for number in range(count):
+            session_id = f"player-{number}"
+            registry.open(session_id, f"edition_{number}")
+            for command in solution:
+                registry.send(session_id, command)
+            won += registry.sessions[session_id][1].game_won
+            registry.end(session_id)
+        report_value("packs won by their own session", won, "games")
+
+
+@benchmark
+def bench_startup(loader, runs=5):
+    """
+    Startup time: `python main.py` up to the first prompt, and world loading alone
+    """
+    prompt = loader.story_config.get("intro_text", {}).get("name_prompt", "Press Enter").encode("utf-8")
+
+    if os.path.exists(loader.cache_path):
+        os.remove(loader.cache_path)
+    cold = time_to_first_prompt(prompt)  # Compiles from JSON and writes the cache
+    warm = sorted(time_to_first_prompt(prompt) for _ in range(runs))[runs // 2]
+    report("python main.py to first prompt (no cache)", cold * 1e9)
+    report("python main.py to first prompt (cached)", warm * 1e9)
+
+    def load(use_cache):
+        DataLoader(loader.data_dir, use_cache=use_cache, verbose=False).load_all_data()
+
+    report("load_all_data (JSON + compile)", time_per_call(lambda: load(False), 50))
+    report("load_all_data (cache)", time_per_call(lambda: load(True), 50))
+
+
+def current_commit():
+    """
+    The git commit being benchmarked, or None outside a checkout
+    """
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def write_results(path):
+    """
+    Save this run's results as JSON, tagged with the commit and Python version
+    """
+    content = {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "results": RESULTS,
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(content, file, indent=2)
+    print(f"\n💾 Results written to {path}")
+
+
+def compare_results(path):
+    """
+    Print how every duration changed against an earlier results file
+    Higher is worse for times; rates and byte counts are shown as-is.
+    """
+    with open(path, encoding="utf-8") as file:
+        previous = json.load(file)
+    print(f"\n📊 Compared with {previous.get('commit') or path} (new / old):")
+    for name, results in RESULTS.items():
+        for label, result in results.items():
+            old = previous.get("results", {}).get(name, {}).get(label)
+            if not old or not old["value"]:
+                continue
+            ratio = result["value"] / old["value"]
+            marker = "  ⚠️" if result["unit"] == "ns" and ratio > 1.10 else ""
+            print(f"  {name + ': ' + label:<60} {ratio:>6.2f}x{marker}")
+
+
+def main():
+    """
+    Run the requested benchmarks (all of them by default)
+    """
+    global running
+    parser = argparse.ArgumentParser(description="Turbo's Quest benchmarks")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--data", default="data", help="game data directory")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against an earlier --output file")
+    args = parser.parse_args()
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark '{name}' (choose from {', '.join(BENCHMARKS)})")
+
+    loader = load_world(args.data)
+    for name in args.names or BENCHMARKS:
+        running = name
+        print(f"\n{name}: {BENCHMARKS[name].__doc__.strip()}")
+        BENCHMARKS[name](loader)
+
+    if args.output:
+        write_results(args.output)
+    if args.compare:
+        compare_results(args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Turbo's Quest - Command Index
+Turns what the player types into a game command with one precompiled index per room
+
+Each room's index knows every global command, exit, destination id, action and
+alias that works there. Lookups try an exact hash first, then an unambiguous
+prefix ("kit" -> "kitchen"), and misses get typo suggestions from a
+deletion-neighbourhood index, so the cost stays flat no matter how many
+actions a room has. Commands that quit or rewrite the game (save, load,
+undo...) never run from a prefix: "q" gets a suggestion, not a goodbye.
+"""
+
+from bisect import bisect_left, insort
+
+
+# Commands that work everywhere, mapped to the engine command they run
+GLOBAL_COMMANDS = {
+    "quit": "quit",
+    "exit": "quit",
+    "help": "help",
+    "inventory": "inventory",
+    "i": "inventory",
+    "stats": "stats",
+    "look": "look",
+    "l": "look",
+    "examine all items": "examine_items",
+    "examine items": "examine_items",
+    "compare items": "examine_items",
+    "look at all items": "examine_items",
+    "save": "save",
+    "load": "load",
+    "undo": "undo",
+    "rewind": "rewind",
+}
+
+# Global commands that only run when typed in full, since a slip would end or rewrite the game
+EXACT_ONLY = frozenset({"quit", "save", "load", "undo", "rewind"})
+
+# Most typos a suggestion can be away from what was typed (short commands get one)
+MAX_TYPOS = 2
+
+# The kinds of match an index can return, paired with their target
+GLOBAL = "global"  # target is a GLOBAL_COMMANDS name
+MOVE = "move"  # target is a destination location id
+ACTION = "action"  # target is a special action id
+
+
+def edit_distance(a, b, limit):
+    """
+    Typo distance between two commands, or limit + 1 once it's clearly bigger
+    Counts insertions, deletions, substitutions and swapped neighbours ("hlep").
+    Only the cells within `limit` of the diagonal are worked out, since every
+    other one is already too far.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    before = None
+    previous = [min(j, over) for j in range(len(b) + 1)]
+    for i, char_a in enumerate(a, 1):
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        current = [min(i, over)] + [over] * len(b)
+        for j in range(low, high + 1):
+            char_b = b[j - 1]
+            distance = min(previous[j - 1] + (char_a != char_b),
+                           previous[j] + 1,
+                           current[j - 1] + 1)
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                distance = min(distance, before[j - 2] + 1)
+            current[j] = min(distance, over)
+        if min(current[low - 1:high + 1]) > limit:
+            return over
+        before, previous = previous, current
+    return previous[-1]
+
+
+def deletions(phrase, depth):
+    """
+    Every string reachable from phrase by deleting up to `depth` characters
+    """
+    found = {phrase}
+    frontier = found
+    for _ in range(depth):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        found = found | frontier
+    return found
+
+
+class TypoIndex:
+    """
+    Deletion-neighbourhood index over command phrases for bounded typo search
+    Each phrase is stored under itself and every way of deleting up to `depth`
+    characters from it. A query probes its own deletions (up to the allowed
+    distance, which can't be more than `depth`) with plain dict lookups, so
+    search cost depends on the query's length, not on how many phrases the
+    room has.
+    """
+    __slots__ = ("variants", "depth")
+
+    def __init__(self, phrases, depth=MAX_TYPOS):
+        self.variants = {}  # Phrase with up to `depth` characters deleted -> phrases it came from
+        self.depth = depth
+        for phrase in phrases:
+            for variant in deletions(phrase, depth):
+                self.variants.setdefault(variant, []).append(phrase)
+
+    def search(self, phrase, max_distance, limit=None):
+        """
+        Return (distance, phrase) pairs within max_distance, closest first (only the first `limit`, if given)
+        A shared deletion variant already bounds each candidate's distance: one
+        reached with a single deletion in all is exactly one typo away, so only
+        the rest need checking, most promising first, until no unchecked
+        candidate could make the cut.
+        """
+        if max_distance > self.depth:
+            raise ValueError(f"This index only finds typos up to distance {self.depth}")
+        bounds = {}  # Candidate -> fewest deletions (from it and the query) that make them match
+        for variant in deletions(phrase, max_distance):
+            for candidate in self.variants.get(variant, ()):
+                bound = len(phrase) + len(candidate) - 2 * len(variant)
+                if bound < bounds.get(candidate, max_distance * 2 + 1):
+                    bounds[candidate] = bound
+        found = sorted((bound, candidate) for candidate, bound in bounds.items() if bound <= 1)
+        # Anything one typo away shares a variant within two deletions, so the rest are at least two away
+        unproven = sorted((1 if bound == 2 else 2, candidate) for candidate, bound in bounds.items() if bound > 1)
+        for least, candidate in unproven:
+            if least > max_distance:
+                break
+            if limit is not None and len(found) >= limit and (least, candidate) > found[limit - 1]:
+                break
+            distance = edit_distance(phrase, candidate, max_distance)
+            if distance <= max_distance:
+                insort(found, (distance, candidate))
+        return found[:limit]
+
+
+class CommandIndex:
+    """
+    Every command that works in one room, ready for exact, prefix and typo lookups
+    """
+    __slots__ = ("exact", "phrases", "typos")
+
+    def __init__(self, exact):
+        self.exact = exact  # Phrase -> (kind, target)
+        self.phrases = sorted(exact)  # For prefix completion with bisect
+        self.typos = None  # TypoIndex, built the first time someone misspells something here
+
+    @classmethod
+    def build(cls, location, aliases=None):
+        """
+        Build the index for a compiled location
+        Global commands win over movement, and movement wins over actions,
+        just like the order the engine has always checked them in.
+        Aliases map extra phrases onto commands that already work in the room.
+        """
+        exact = {}
+        for command, action_id in location.actions.items():
+            exact[command] = (ACTION, action_id)
+        for command, destination_id in location.moves.items():
+            exact[command] = (MOVE, destination_id)
+        for command, name in GLOBAL_COMMANDS.items():
+            exact[command] = (GLOBAL, name)
+        for alias, command in (aliases or {}).items():
+            if alias not in exact and command in exact:
+                exact[alias] = exact[command]
+        return cls(exact)
+
+    def resolve(self, command):
+        """
+        Return (kind, target) for an exact or unambiguous prefix match, else None
+        A prefix of an EXACT_ONLY command never matches, even if nothing else starts with it.
+        """
+        match = self.exact.get(command)
+        if match is not None or not command:
+            return match
+
+        # Walk the phrases starting with the command, stopping at the second distinct match
+        position = bisect_left(self.phrases, command)
+        while position < len(self.phrases) and self.phrases[position].startswith(command):
+            candidate = self.exact[self.phrases[position]]
+            if candidate[0] == GLOBAL and candidate[1] in EXACT_ONLY:
+                return None
+            if match is None:
+                match = candidate
+            elif candidate != match:
+                return None
+            position += 1
+        return match
+
+    def suggest(self, command, limit=3):
+        """
+        Suggest phrases for a command that didn't resolve
+        Ambiguous prefixes list their completions; anything else gets close typos
+        """
+        if not command:
+            return []
+        suggestions = []
+        position = bisect_left(self.phrases, command)
+        while (position < len(self.phrases) and len(suggestions) < limit and
+               self.phrases[position].startswith(command)):
+            suggestions.append(self.phrases[position])
+            position += 1
+        if suggestions:
+            return suggestions
+
+        # Allow one typo in short commands and two in longer ones
+        if self.typos is None:
+            self.typos = TypoIndex(self.phrases)
+        max_distance = 1 if len(command) <= 4 else MAX_TYPOS
+        return [phrase for _, phrase in self.typos.search(command, max_distance, limit)]
@@ -0,0 +1,93 @@
+"""
+Turbo's Quest - Derived Caches
+Per-world helpers (renderers, action indexes, navigators) that live exactly as long as their world
+
+A compiled world never changes, so anything worked out from it can be kept
+for as long as the world is around. Each kind of helper has a WorldCache,
+which builds one helper per world the first time it's asked for. Neither the
+cache nor the helper holds the world strongly (helpers reach it through
+WorldHelper.world), so once the last session moves off an old world after a
+hot reload, the world and every helper built for it are freed.
+
+Helpers for lazy worlds keep their per-room results in LRUCaches sized like
+the world's own record cache, so they stay bounded however many rooms the
+world has.
+"""
+
+import weakref
+from collections import OrderedDict
+
+
+class WorldHelper:
+    """
+    Base class for per-world helpers, holding the world weakly so caching the helper can't keep it alive
+    """
+    def __init__(self, world):
+        self.world_ref = weakref.ref(world)
+
+    @property
+    def world(self):
+        """
+        The world this helper was built for
+        """
+        return self.world_ref()
+
+
+class WorldCache:
+    """
+    One helper per live world, built on first use and dropped along with the world
+    """
+    def __init__(self, build):
+        self.build = build  # world -> helper
+        self.helpers = weakref.WeakKeyDictionary()
+
+    def __call__(self, world):
+        helper = self.helpers.get(world)
+        if helper is None:
+            helper = self.helpers[world] = self.build(world)
+        return helper
+
+    def get(self, world):
+        """
+        The helper already built for a world, or None
+        """
+        return self.helpers.get(world)
+
+    def __setitem__(self, world, helper):
+        self.helpers[world] = helper
+
+    def __len__(self):
+        return len(self.helpers)
+
+
+def room_cache_size(world):
+    """
+    How many per-room results a helper should keep: all of them (None) unless the world is lazy
+    """
+    return getattr(world.locations, "capacity", None)
+
+
+class LRUCache:
+    """
+    A dict-like cache that keeps only the `capacity` most recently used entries (all of them if None)
+    """
+    __slots__ = ("entries", "capacity")
+
+    def __init__(self, capacity=None):
+        self.entries = OrderedDict()
+        self.capacity = capacity
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is not None and self.capacity is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        entries = self.entries
+        entries[key] = value
+        if self.capacity is not None and len(entries) > self.capacity:
+            entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
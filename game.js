@@ -76,7 +76,7 @@ class Player {
 
     updateUI() {
         document.getElementById('currentLocation').textContent = 
-            gameData.locations[this.currentLocation]?.name || this.currentLocation;
+            game.locations[this.currentLocation]?.name || this.currentLocation;
         document.getElementById('itemCount').textContent = this.inventory.length;
         
         let questStatus = "Starting...";
@@ -94,12 +94,14 @@ class Player {
 }
 
 class GameEngine {
-    constructor() {
+    constructor(data) {
         this.player = null;
         this.gameRunning = true;
-        this.locations = gameData.locations;
-        this.items = gameData.items;
-        this.story = gameData.story;
+        this.locations = data.locations;
+        this.items = data.items;
+        this.story = data.story;
+        this.roomHashes = data.rooms || null;  // Rooms still to fetch, when playing exported data
+        this.roomRequests = {};
         this.gameWon = false;
         this.revelationTriggered = false;
         
@@ -240,6 +242,13 @@ class GameEngine {
     }
 
     movePlayer(newLocation) {
+        if (!(newLocation in this.locations) && this.roomHashes && newLocation in this.roomHashes) {
+            // Usually fetched already while Turbo was next door
+            this.loadRoom(newLocation)
+                .then(() => this.movePlayer(newLocation))
+                .catch(() => this.player.displayMessage(`Error: Location '${newLocation}' couldn't be loaded!`));
+            return;
+        }
         if (newLocation in this.locations) {
             this.player.currentLocation = newLocation;
             
@@ -294,6 +303,45 @@ class GameEngine {
         }
         
         location.visited = true;
+        this.prefetchExits();
+    }
+
+    loadRoom(locationId) {
+        if (!(locationId in this.roomRequests)) {
+            const url = `${WEB_DATA}rooms/${locationId}.${this.roomHashes[locationId]}.json`;
+            this.roomRequests[locationId] = fetch(url)
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error(`${url}: ${response.status}`);
+                    }
+                    return response.json();
+                })
+                .then(chunk => this.addRoom(chunk))
+                .catch(error => {
+                    delete this.roomRequests[locationId];  // Let the next attempt try again
+                    throw error;
+                });
+        }
+        return this.roomRequests[locationId];
+    }
+
+    addRoom(chunk) {
+        if (!(chunk.key in this.locations)) {
+            this.locations[chunk.key] = chunk.location;
+        }
+        Object.assign(this.story.special_actions, chunk.special_actions);
+    }
+
+    prefetchExits() {
+        if (!this.roomHashes) {
+            return;
+        }
+        const exits = this.locations[this.player.currentLocation].exits || {};
+        for (let destination of Object.values(exits)) {
+            if (!(destination in this.locations) && destination in this.roomHashes) {
+                this.loadRoom(destination).catch(() => {});  // Moving there will try again
+            }
+        }
     }
 
     handleSpecialAction(actionId) {
@@ -518,9 +566,39 @@ class GameEngine {
     }
 }
 
+// Where `python webexport.py` writes the chunked game data
+const WEB_DATA = 'web/';
+
+function loadScript(src) {
+    return new Promise((resolve, reject) => {
+        const script = document.createElement('script');
+        script.src = src;
+        script.onload = resolve;
+        script.onerror = reject;
+        document.head.appendChild(script);
+    });
+}
+
+// Fetch just the core bundle (with the starting room), falling back to the whole
+// data.js where fetching isn't allowed (pages opened from disk). Both come from webexport.py
+async function loadGameData() {
+    try {
+        const response = await fetch(`${WEB_DATA}core.json`);
+        if (!response.ok) {
+            throw new Error(`${WEB_DATA}core.json: ${response.status}`);
+        }
+        const {items, rooms, start, ...story} = await response.json();
+        story.special_actions = {...start.special_actions};
+        return {locations: {[start.key]: start.location}, items, story, rooms};
+    } catch (error) {
+        await loadScript(`${WEB_DATA}data.js`);
+        return gameData;
+    }
+}
+
 // Initialize the game when the page loads
 let game;
-window.addEventListener('load', () => {
-    game = new GameEngine();
+window.addEventListener('load', async () => {
+    game = new GameEngine(await loadGameData());
     game.startGame();
 });
\ No newline at end of file
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Turbo's Quest - Golden Transcripts
+Replays recorded sessions in parallel and shows exactly where the output changed
+
+A golden transcript is a recorded session: the opening text, then every
+command (on a line starting with the prompt, "🐕 > ") followed by what the
+game said back. Checking replays each one in a fresh headless GameEngine and
+diffs the output against the recording, so any change in wording or
+behaviour shows up as a unified diff.
+
+Transcripts are sharded across a process pool. The world is loaded once,
+before the workers start: forked workers inherit it, and elsewhere each
+worker loads it once when it starts, never once per transcript. Results are
+printed as they arrive.
+
+Run it with:
+    python goldens.py record COMMANDS.txt ... [--output DIR]   # make goldens from command lists
+    python goldens.py check [PATH ...] [--workers N]           # replay and diff (default: transcripts/golden)
+"""
+
+import argparse
+import difflib
+import gc
+import multiprocessing
+import os
+import sys
+import time
+
+from main import DataLoader, GameEngine
+
+
+PROMPT = "🐕 > "
+GOLDEN_EXTENSION = ".golden"
+GOLDEN_DIRECTORY = os.path.join("transcripts", "golden")
+
+# Set in worker processes (inherited when forked) so transcripts play on an already loaded world
+LOADER = None
+
+
+def record(data_loader, commands):
+    """
+    Play `commands` in a fresh headless session and return the golden transcript text
+    """
+    engine = GameEngine(data_loader, headless=True)
+    lines = engine.new_game().split("\n")
+    for command in commands:
+        lines.append(PROMPT + command)
+        lines.extend(engine.process_command(command).split("\n"))
+    data_loader.sessions.discard(engine)
+    return "\n".join(lines) + "\n"
+
+
+def commands_in(golden):
+    """
+    The commands typed in a golden transcript, in order
+    """
+    return [line[len(PROMPT):] for line in golden.split("\n") if line.startswith(PROMPT)]
+
+
+def check(data_loader, path):
+    """
+    Replay one golden transcript: (path, commands played, unified diff or "" if it still matches)
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            expected = file.read()
+    except OSError as e:
+        return path, 0, f"❌ Couldn't read {path}: {e}\n"
+    commands = commands_in(expected)
+    actual = record(data_loader, commands)
+    if actual == expected:
+        return path, len(commands), ""
+    diff = difflib.unified_diff(expected.splitlines(keepends=True), actual.splitlines(keepends=True),
+                                fromfile=f"{path} (recorded)", tofile=f"{path} (replayed)")
+    return path, len(commands), "".join(diff)
+
+
+def start_worker(data_directory):
+    """
+    Pool initializer: load the world once, unless it was inherited from the parent
+    """
+    global LOADER
+    if LOADER is None:
+        LOADER = DataLoader(data_directory, verbose=False)
+        if not LOADER.load_all_data():
+            raise SystemExit(f"Worker {os.getpid()} couldn't load {data_directory}")
+
+
+def check_in_worker(path):
+    """
+    check() on the worker's warm world
+    """
+    return check(LOADER, path)
+
+
+def find_goldens(paths):
+    """
+    Every golden transcript in the given files and directories, sorted
+    """
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, filenames in os.walk(path):
+                found.extend(os.path.join(root, filename) for filename in filenames
+                             if filename.endswith(GOLDEN_EXTENSION))
+        else:
+            found.append(path)
+    return sorted(found)
+
+
+def check_all(data_loader, paths, workers=1, chunk_size=None):
+    """
+    Replay every golden transcript, yielding check() results as they finish (in any order)
+    With more than one worker the transcripts are spread over a process pool
+    that shares `data_loader`'s world (by forking) or loads it once per worker.
+    """
+    global LOADER
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield check(data_loader, path)
+        return
+
+    chunk_size = chunk_size or max(1, min(64, len(paths) // (workers * 8)))
+    if "fork" in multiprocessing.get_all_start_methods():
+        LOADER = data_loader
+        gc.freeze()  # Keep the collector from writing to (and so copying) the shared world
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context("spawn")
+    try:
+        with context.Pool(workers, initializer=start_worker, initargs=(data_loader.data_dir,)) as pool:
+            yield from pool.imap_unordered(check_in_worker, paths, chunk_size)
+    finally:
+        LOADER = None
+        gc.unfreeze()
+
+
+def record_command(args, loader):
+    """
+    `record`: write a golden transcript for every command list
+    """
+    os.makedirs(args.output, exist_ok=True)
+    for path in args.paths:
+        with open(path, encoding="utf-8") as file:
+            commands = [line.strip() for line in file if line.strip() and not line.startswith("#")]
+        name = os.path.splitext(os.path.basename(path))[0] + GOLDEN_EXTENSION
+        with open(os.path.join(args.output, name), "w", encoding="utf-8") as file:
+            file.write(record(loader, commands))
+        print(f"📼 Recorded {len(commands)} commands from {path} -> {os.path.join(args.output, name)}")
+    return 0
+
+
+def check_command(args, loader):
+    """
+    `check`: replay golden transcripts and print a diff for every one that changed
+    """
+    paths = find_goldens(args.paths or [GOLDEN_DIRECTORY])
+    if not paths:
+        print("🤷 No golden transcripts found")
+        return 1
+    start = time.perf_counter()
+    failed = commands = 0
+    for path, played, diff in check_all(loader, paths, args.workers):
+        commands += played
+        if diff:
+            failed += 1
+            sys.stdout.write(diff if diff.endswith("\n") else diff + "\n")
+            sys.stdout.flush()
+    elapsed = time.perf_counter() - start
+    print(f"{'❌' if failed else '✅'} {len(paths) - failed}/{len(paths)} transcripts match "
+          f"({commands} commands in {elapsed:.2f}s, {len(paths) / elapsed:.0f} transcripts/sec, "
+          f"{args.workers} worker{'s' if args.workers != 1 else ''})")
+    return 1 if failed else 0
+
+
+def main():
+    """
+    Record or check golden transcripts from the command line
+    """
+    parser = argparse.ArgumentParser(description="Golden transcript regression checks for Turbo's Quest")
+    parser.add_argument("--data", default="data", help="game data directory")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    recorder = subcommands.add_parser("record", help="record golden transcripts from command lists")
+    recorder.add_argument("paths", nargs="+", help="command list files (one command per line)")
+    recorder.add_argument("--output", default=GOLDEN_DIRECTORY, help="where to write the goldens")
+    checker = subcommands.add_parser("check", help="replay golden transcripts and diff the output")
+    checker.add_argument("paths", nargs="*", help=f"golden files or directories (default: {GOLDEN_DIRECTORY})")
+    checker.add_argument("--workers", type=int, default=multiprocessing.cpu_count(),
+                         help="processes to replay with (default: all cores)")
+    args = parser.parse_args()
+
+    loader = DataLoader(args.data, verbose=False)
+    if not loader.load_all_data():
+        sys.exit(2)
+    if args.command == "record":
+        sys.exit(record_command(args, loader))
+    sys.exit(check_command(args, loader))
+
+
+if __name__ == "__main__":
+    main()
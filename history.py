@@ -0,0 +1,126 @@
+"""
+Turbo's Quest - Turn History
+Undo, rewind and what-if branches without copying the session every turn
+
+A session's past is a tree of Turn records, each pointing at the turn before
+it. Branches share every turn they have in common, so rewinding and trying
+something else never copies anything: the new turns simply hang off an
+older one, and a branch lives exactly as long as something still refers to it.
+
+A turn records where Turbo is and the story flags, but not the four bitsets
+(inventory, discovered and visited rooms, completed actions). It keeps just
+the bits that flipped on that turn, which is usually none or one or two, so
+a retained turn stays a small, fixed-size record however big the world is.
+Every KEYFRAME_INTERVAL turns (or after a turn that flipped a lot, like
+loading a save) the whole bitsets are kept, so rebuilding any turn's state
+never replays more than a short run of flips.
+"""
+
+import sys
+
+
+# Keep whole bitsets this often, so rebuilding a turn replays at most this many records
+KEYFRAME_INTERVAL = 64
+
+# A turn that flips more bits than this keeps whole bitsets instead
+MAX_FLIPS = 32
+
+# Each flip is packed as (bit position << FIELD_BITS) | bitset number
+FIELD_BITS = 2
+FIELD_MASK = (1 << FIELD_BITS) - 1
+
+
+class Turn:
+    """
+    One point in a session's history: the state right after a turn that changed something
+    """
+    __slots__ = ("parent", "depth", "command", "location", "flags", "bitsets", "flips")
+
+    def __init__(self, parent, command, location, flags, bitsets=None, flips=()):
+        self.parent = parent  # The turn before, or None at the start of the game
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.command = command  # What was typed to get here
+        self.location = location
+        self.flags = flags  # The snapshot's FLAG_* bits
+        self.bitsets = bitsets  # (inventory, discovered, visited, completed) on keyframes, else None
+        self.flips = flips  # Packed bits that changed since the parent, on the other turns
+
+    def rebuild(self):
+        """
+        This turn's (inventory, discovered, visited, completed) bitsets
+        """
+        turn = self
+        flipped = []
+        while turn.bitsets is None:
+            flipped.append(turn.flips)
+            turn = turn.parent
+        bitsets = list(turn.bitsets)
+        for flips in flipped:
+            for flip in flips:
+                bitsets[flip & FIELD_MASK] ^= 1 << (flip >> FIELD_BITS)
+        return tuple(bitsets)
+
+    def ancestor(self, turns):
+        """
+        The turn `turns` turns before this one (or the very first turn)
+        """
+        turn = self
+        while turns > 0 and turn.parent is not None:
+            turn = turn.parent
+            turns -= 1
+        return turn
+
+
+def flipped_bits(before, after):
+    """
+    The packed flips that turn one set of bitsets into another, or None if there are too many
+    """
+    if before == after:
+        return ()  # Most turns (moving between known rooms, looking around) flip nothing
+    flips = []
+    for field, (old, new) in enumerate(zip(before, after)):
+        if old == new:
+            continue
+        changed = old ^ new
+        while changed:
+            lowest = changed & -changed
+            flips.append((lowest.bit_length() - 1) << FIELD_BITS | field)
+            if len(flips) > MAX_FLIPS:
+                return None
+            changed ^= lowest
+    return tuple(flips)
+
+
+class History:
+    """
+    A session's current turn, plus its bitsets so the next turn can be diffed cheaply
+    """
+    __slots__ = ("head", "bitsets")
+
+    def __init__(self, location, flags, bitsets):
+        self.head = Turn(None, None, location, flags, bitsets)
+        self.bitsets = bitsets
+
+    def record(self, command, location, flags, bitsets):
+        """
+        Add a turn after the current one if the state changed, returning True if it did
+        """
+        head = self.head
+        flips = flipped_bits(self.bitsets, bitsets)
+        if flips == () and location == head.location and flags == head.flags:
+            return False
+        command = sys.intern(command)  # Players type the same few commands over and over
+        if flips is None or (head.depth + 1) % KEYFRAME_INTERVAL == 0:
+            self.head = Turn(head, command, location, flags, bitsets)
+        else:
+            self.head = Turn(head, command, location, flags, flips=flips)
+        self.bitsets = bitsets
+        return True
+
+    def move_to(self, turn):
+        """
+        Make an earlier turn (or one on another branch) the current one, returning its bitsets
+        """
+        self.head = turn
+        self.bitsets = turn.rebuild()
+        return self.bitsets
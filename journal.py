@@ -0,0 +1,377 @@
+"""
+Turbo's Quest - Session Journal
+Crash recovery for long sessions without saving the whole game every turn
+
+Every turn that changes anything is appended to a journal as a small event:
+the command and the changes it made (rooms entered, actions completed, item
+ids given, story flags). Events are written in group-committed batches - one
+write and one fsync for many turns - so a crash loses at most the last batch,
+and a batch never waits more than `flush_interval` seconds, even when no
+more turns come along to fill it.
+Every `snapshot_every` events the session's binary snapshot is written next
+to the journal and the journal is truncated, so recovery only ever replays
+the short tail after the last snapshot.
+
+    session = JournaledSession.start(loader, "saves/turbo.journal")
+    session.process_command("kitchen")
+    ...
+    session = JournaledSession.recover(loader, "saves/turbo.journal")
+"""
+
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+
+from history import History
+from main import FLAG_REALIZATION, FLAG_REVELATION, FLAG_RUNNING, FLAG_WON, GameEngine, iter_bits
+
+
+JOURNAL_MAGIC = b"TQJ\x01"  # Start of every journal file (format version 1)
+
+# Every record: payload length, crc32 of everything after it, sequence number, kind
+RECORD_HEADER = struct.Struct("<IIQB")
+RECORD_KIND = struct.Struct("<QB")  # The part of the header covered by the crc
+
+# Record kinds
+TURN = 1  # A command and the changes it made
+STATE = 2  # A whole snapshot, for turns that undo progress (like 'load')
+
+# Changes inside a TURN record, each an (op, value) pair
+CHANGE = struct.Struct("<BI")
+COMMAND_LENGTH = struct.Struct("<H")
+MOVE = 1  # Turbo is now in this location
+DISCOVER = 2  # Location discovered
+VISIT = 3  # Location visited
+COMPLETE = 4  # Action completed
+GIVE = 5  # Item added to the inventory
+FLAGS = 6  # Story flags are now this (snapshot FLAG_* bits)
+
+# Which of history_state()'s bitsets each bitset op comes from
+BITSET_OPS = ((0, GIVE), (1, DISCOVER), (2, VISIT), (3, COMPLETE))
+
+# Snapshot file: sequence number of the last event it includes, then the snapshot
+SNAPSHOT_SEQUENCE = struct.Struct("<Q")
+
+
+class JournalError(Exception):
+    """
+    Raised when a journal or its snapshot can't be used for recovery
+    """
+    pass
+
+
+def encode_turn(command, before, after):
+    """
+    Pack the changes between two GameEngine.history_state()s, or None if progress went backwards
+    """
+    changes = []
+    if after[0] != before[0]:
+        changes.append(CHANGE.pack(MOVE, after[0]))
+    for index, op in BITSET_OPS:
+        old = before[2][index]
+        new = after[2][index]
+        if old != new:
+            if old & ~new:
+                return None  # Something was taken away - only a whole state describes that
+            changes.extend([CHANGE.pack(op, record_id) for record_id in iter_bits(new & ~old)])
+    if after[1] != before[1]:
+        changes.append(CHANGE.pack(FLAGS, after[1]))
+    text = command.encode("utf-8")[:0xFFFF]
+    return COMMAND_LENGTH.pack(len(text)) + text + b"".join(changes)
+
+
+class Journal:
+    """
+    An append-only event file with group commit and snapshot compaction
+    Appends are buffered and written with a single fsync once `batch_size`
+    events are waiting or `flush_interval` seconds have passed since the last
+    commit, whichever comes first. A flusher thread commits a batch that's
+    still waiting after `flush_interval`, so an idle session's last turns
+    reach the disk too.
+    """
+    def __init__(self, path, batch_size=256, flush_interval=0.05, fsync=True, contents=None):
+        self.path = path
+        self.snapshot_path = path + ".snap"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.pending = deque()  # Encoded records waiting for the next commit
+        self.last_commit = time.monotonic()
+        self.sequence = 0  # Sequence number of the last event appended
+        self.events_since_snapshot = 0
+        self.commits = 0
+        self.lock = threading.RLock()  # Held while writing, since the flusher commits from its own thread
+        self.waiting = threading.Event()  # Set while the flusher should be watching for old batches
+        self.closing = threading.Event()
+        self.flusher = None  # Started with the first append
+
+        # Reopen an existing journal where its last intact record ends
+        # (`contents` is read_journal's result, if the caller has already read it)
+        snapshot_sequence, _, records, valid_length = contents or read_journal(path)
+        if records:
+            self.sequence = records[-1][0]
+        else:
+            self.sequence = snapshot_sequence
+        self.events_since_snapshot = len(records)
+        self.file = open(path, "r+b" if os.path.exists(path) else "w+b")
+        if valid_length < len(JOURNAL_MAGIC):
+            self.file.truncate(0)
+            self.file.write(JOURNAL_MAGIC)
+        else:
+            self.file.truncate(valid_length)  # Drop a torn record from the last crash
+        self.file.seek(0, os.SEEK_END)
+
+    def append(self, kind, payload):
+        """
+        Queue an event, committing the batch if it's full or old enough
+        Returns the event's sequence number
+        """
+        self.sequence += 1
+        self.events_since_snapshot += 1
+        covered = RECORD_KIND.pack(self.sequence, kind) + payload
+        self.pending.append(struct.pack("<II", len(payload), zlib.crc32(covered)) + covered)
+        if len(self.pending) >= self.batch_size or time.monotonic() - self.last_commit >= self.flush_interval:
+            self.commit()
+        elif not self.waiting.is_set():
+            if self.flusher is None:
+                self.flusher = threading.Thread(target=self.flush_when_idle, daemon=True)
+                self.flusher.start()
+            self.waiting.set()
+        return self.sequence
+
+    def flush_when_idle(self):
+        """
+        The flusher thread: commit any batch that's waited `flush_interval` without an append committing it
+        """
+        # Asleep until events are waiting, then checking every flush_interval until they stop coming
+        while self.waiting.wait() and not self.closing.wait(self.flush_interval):
+            with self.lock:
+                if not self.pending:
+                    self.waiting.clear()
+                    if self.pending:
+                        self.waiting.set()  # An append slipped in before the clear
+                elif time.monotonic() - self.last_commit >= self.flush_interval:
+                    self.commit()
+
+    def commit(self):
+        """
+        Write every queued event with one write and one fsync
+        """
+        with self.lock:
+            if self.pending and not self.file.closed:
+                # Only as many as are queued now - appends don't take the lock, so more may arrive meanwhile
+                popleft = self.pending.popleft
+                self.file.write(b"".join([popleft() for _ in range(len(self.pending))]))
+                self.file.flush()
+                if self.fsync:
+                    os.fsync(self.file.fileno())
+                self.commits += 1
+            self.last_commit = time.monotonic()
+
+    def write_snapshot(self, snapshot):
+        """
+        Save a snapshot covering every event so far, then empty the journal
+        The snapshot is in place before the journal is truncated, and events
+        it already covers are skipped on recovery, so a crash in between is safe.
+        """
+        with self.lock:
+            temporary = self.snapshot_path + ".tmp"
+            with open(temporary, "wb") as file:
+                file.write(SNAPSHOT_SEQUENCE.pack(self.sequence) + snapshot)
+                file.flush()
+                if self.fsync:
+                    os.fsync(file.fileno())
+            os.replace(temporary, self.snapshot_path)
+
+            self.pending.clear()
+            self.file.seek(0)
+            self.file.truncate(0)
+            self.file.write(JOURNAL_MAGIC)
+            self.file.flush()
+            if self.fsync:
+                os.fsync(self.file.fileno())
+            self.events_since_snapshot = 0
+            self.last_commit = time.monotonic()
+
+    def close(self):
+        """
+        Commit anything still queued and close the file
+        """
+        with self.lock:
+            if not self.file.closed:
+                self.commit()
+                self.file.close()
+        if self.flusher is not None:
+            self.closing.set()
+            self.waiting.set()
+            self.flusher.join()
+
+
+def read_journal(path):
+    """
+    Read a journal and its snapshot
+    Returns (snapshot sequence, snapshot bytes or None, [(sequence, kind, payload)]
+    for the events after the snapshot, length of the journal's intact prefix).
+    Reading stops quietly at the first torn or corrupt record.
+    """
+    snapshot_sequence, snapshot = 0, None
+    try:
+        with open(path + ".snap", "rb") as file:
+            data = file.read()
+        if len(data) < SNAPSHOT_SEQUENCE.size:
+            raise JournalError(f"Snapshot {path}.snap is truncated")
+        (snapshot_sequence,) = SNAPSHOT_SEQUENCE.unpack_from(data)
+        snapshot = data[SNAPSHOT_SEQUENCE.size:]
+    except FileNotFoundError:
+        pass
+
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return snapshot_sequence, snapshot, [], 0
+    if not data.startswith(JOURNAL_MAGIC):
+        if data:
+            raise JournalError(f"{path} is not a Turbo's Quest journal")
+        return snapshot_sequence, snapshot, [], 0
+
+    records = []
+    position = len(JOURNAL_MAGIC)
+    header_size = RECORD_HEADER.size
+    while position + header_size <= len(data):
+        length, checksum, sequence, kind = RECORD_HEADER.unpack_from(data, position)
+        end = position + header_size + length
+        if end > len(data) or zlib.crc32(data[position + 8:end]) != checksum:
+            break
+        if sequence > snapshot_sequence:
+            records.append((sequence, kind, data[position + header_size:end]))
+        position = end
+    return snapshot_sequence, snapshot, records, position
+
+
+class RecoveryReport:
+    """
+    What recovering a session from its journal took
+    """
+    def __init__(self, sequence, replayed, seconds):
+        self.sequence = sequence  # Sequence number of the last event recovered
+        self.replayed = replayed  # Events replayed on top of the snapshot
+        self.seconds = seconds
+
+    def __str__(self):
+        return (f"♻️  Recovered to event {self.sequence}: replayed {self.replayed} events "
+                f"after the last snapshot in {self.seconds * 1000:.1f} ms")
+
+
+class JournaledSession:
+    """
+    A GameEngine whose progress is journaled turn by turn
+    """
+    def __init__(self, engine, journal, snapshot_every=10000):
+        self.engine = engine
+        self.journal = journal
+        self.snapshot_every = snapshot_every
+
+    @classmethod
+    def start(cls, data_loader, path, snapshot_every=10000, **journal_options):
+        """
+        Begin a brand new journaled game (replacing any old journal at `path`)
+        Returns (session, opening text).
+        """
+        for stale in (path, path + ".snap"):
+            if os.path.exists(stale):
+                os.remove(stale)
+        engine = GameEngine(data_loader, headless=True)
+        text = engine.new_game()
+        session = cls(engine, Journal(path, **journal_options), snapshot_every)
+        session.journal.write_snapshot(engine.snapshot())
+        return session, text
+
+    @classmethod
+    def recover(cls, data_loader, path, snapshot_every=10000, **journal_options):
+        """
+        Rebuild a session from its last snapshot plus the journal tail
+        Returns (session, RecoveryReport).
+        """
+        started = time.perf_counter()
+        contents = read_journal(path)
+        snapshot_sequence, snapshot, records, _ = contents
+        if snapshot is None:
+            raise JournalError(f"No snapshot found for {path}")
+
+        engine = GameEngine(data_loader, headless=True)
+        engine.restore(snapshot)
+        replay(engine, records)
+        session = cls(engine, Journal(path, contents=contents, **journal_options), snapshot_every)
+        report = RecoveryReport(session.journal.sequence, len(records), time.perf_counter() - started)
+        return session, report
+
+    def process_command(self, command):
+        """
+        Run one turn and journal whatever it changed
+        """
+        engine = self.engine
+        before = engine.history_state()
+        text = engine.process_command(command)
+        after = engine.history_state()
+        if after != before:
+            payload = encode_turn(command, before, after)
+            if payload is None:
+                self.journal.append(STATE, engine.snapshot())
+            else:
+                self.journal.append(TURN, payload)
+            if self.journal.events_since_snapshot >= self.snapshot_every:
+                self.journal.write_snapshot(engine.snapshot())
+        return text
+
+    def close(self):
+        """
+        Make sure every turn so far is on disk
+        """
+        self.journal.close()
+
+
+def replay(engine, records):
+    """
+    Apply journaled events to a restored engine, without re-running any commands
+    """
+    player = engine.player
+    location = player.current_location
+    bits = {DISCOVER: player.discovered_locations, VISIT: player.visited_locations,
+            COMPLETE: player.completed_actions, GIVE: player.inventory}
+    flags = None
+    for _, kind, payload in records:
+        if kind == STATE:
+            # A whole stored state replaces everything replayed before it
+            engine.restore(payload)
+            player = engine.player
+            location = player.current_location
+            bits = {DISCOVER: player.discovered_locations, VISIT: player.visited_locations,
+                    COMPLETE: player.completed_actions, GIVE: player.inventory}
+            flags = None
+            continue
+        (length,) = COMMAND_LENGTH.unpack_from(payload)
+        for op, value in CHANGE.iter_unpack(payload[COMMAND_LENGTH.size + length:]):
+            if op == MOVE:
+                location = value
+            elif op == FLAGS:
+                flags = value
+            else:
+                bits[op] |= 1 << value
+
+    player.current_location = location
+    player.discovered_locations = bits[DISCOVER]
+    player.visited_locations = bits[VISIT]
+    player.completed_actions = bits[COMPLETE]
+    player.inventory = bits[GIVE]
+    player.quest_items_found = (player.inventory & engine.world.quest_mask).bit_count()
+    if flags is not None:
+        player.size_realization_triggered = bool(flags & FLAG_REALIZATION)
+        player.revelation_triggered = bool(flags & FLAG_REVELATION)
+        player.game_won = bool(flags & FLAG_WON)
+        engine.game_running = bool(flags & FLAG_RUNNING)
+    # Undo starts from the replayed state, like it does after restore() or new_game()
+    engine.history = History(*engine.history_state())
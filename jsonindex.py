@@ -0,0 +1,229 @@
+"""
+Turbo's Quest - JSON Index
+Byte-offset indexes over huge JSON objects, so members can be loaded one at a time
+
+Building an index scans the file once with a regular expression that only
+stops at brackets (and at strings directly inside the indexed object),
+remembering where each member's value starts and ends. After that a member is parsed straight from its own byte range of
+a memory-mapped file, so memory use depends on how many members are actually
+loaded rather than on how big the file is.
+
+The index itself is small (a key plus a few integers per member) and is
+saved next to the data directory so later starts can skip the scan.
+"""
+
+import json
+import mmap
+import os
+import pickle
+import re
+import zlib
+from array import array
+from collections.abc import Mapping
+
+
+# Everything up to the next bracket, then the bracket - strings are skipped whole,
+# so brackets inside them don't count and the loop below only runs once per bracket
+# (written as "unrolled loops" so every byte matches exactly one way and nothing backtracks)
+SEGMENT = re.compile(rb'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*([{}\[\]])')
+# A string, flagged when it's a key
+STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"(\s*:)?')
+OPEN = frozenset(b"{[")
+
+# Bump whenever the saved index format changes
+INDEX_VERSION = 1
+
+
+def scan_members(buffer, start, filename):
+    """
+    Find every member of the JSON object whose '{' is at or after `start`
+    Returns parallel lists (keys, value starts, value ends); value ranges
+    still include the whitespace and comma that follow them.
+    """
+    position = buffer.find(b"{", start)
+    if position < 0:
+        raise ValueError(f"Invalid JSON format in {filename}: expected an object")
+    keys, starts, ends = [], [], []
+    depth = 0
+    for match in SEGMENT.finditer(buffer, position):
+        bracket = match.start(1)
+        if depth == 1:
+            # Only text directly inside the object holds member keys
+            for string in STRING.finditer(buffer, match.start(), bracket):
+                if string.group(1) is not None:
+                    if keys:
+                        ends.append(string.start())
+                    keys.append(json.loads(buffer[string.start():string.start(1)]))
+                    starts.append(string.end())
+        if buffer[bracket] in OPEN:
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                if keys:
+                    ends.append(bracket)
+                return keys, starts, ends
+    raise ValueError(f"Invalid JSON format in {filename}: unexpected end of file")
+
+
+class JsonIndex(Mapping):
+    """
+    A read-only mapping over the members of one JSON object in a file
+    Values are parsed from the file each time they're looked up, so callers
+    keep whatever they want to hold on to (the world does, in an LRU).
+    """
+    def __init__(self, path, member=None):
+        self.path = path
+        self.member = member  # Index this top-level member's object instead of the whole file
+        self.fingerprint = None  # (mtime_ns, size) of the file the index was built from
+        self.keys = []
+        self.positions = {}  # Key -> position in keys/starts/ends/checksums
+        self.starts = array("Q")
+        self.ends = array("Q")
+        self.checksums = array("I")  # crc32 of each member's bytes, for spotting edits on reload
+        self.file = None
+        self.buffer = None
+
+    def build(self, siblings=()):
+        """
+        Scan the file and record where every member lives
+        A member index can start from an already built index of the whole file
+        among `siblings` instead of scanning the top level again.
+        """
+        self.open()
+        filename = os.path.basename(self.path)
+        buffer = self.buffer
+        whole = None
+        if self.member is not None:
+            whole = next((index for index in siblings if index.path == self.path and index.member is None and
+                          index.fingerprint == self.fingerprint), None)
+        if whole is not None:
+            keys, starts, ends = whole.keys, whole.starts, whole.ends
+        else:
+            keys, starts, ends = scan_members(buffer, 0, filename)
+        if self.member is not None:
+            if self.member not in keys:
+                keys, starts, ends = [], [], []
+            else:
+                position = keys.index(self.member)
+                keys, starts, ends = scan_members(buffer, starts[position], filename)
+        self.keys = keys
+        self.positions = {key: position for position, key in enumerate(keys)}
+        self.starts = array("Q", starts)
+        self.ends = array("Q", ends)
+        self.checksums = array("I", (zlib.crc32(buffer[start:end].rstrip(b" \t\r\n,"))
+                                     for start, end in zip(starts, ends)))
+        return self
+
+    def open(self):
+        """
+        Map the file into memory (empty files can't be mapped, so they're read instead)
+        """
+        if self.buffer is None:
+            stat = os.stat(self.path)
+            if self.fingerprint is None:
+                self.fingerprint = (stat.st_mtime_ns, stat.st_size)
+            self.file = open(self.path, "rb")
+            if stat.st_size:
+                self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.buffer = b""
+        return self
+
+    def close(self):
+        """
+        Unmap the file
+        """
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        if self.file is not None:
+            self.file.close()
+        self.buffer = self.file = None
+
+    def is_current(self):
+        """
+        True if the file hasn't changed since the index was built
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return self.fingerprint == (stat.st_mtime_ns, stat.st_size)
+
+    def raw(self, key):
+        """
+        The bytes of one member's value
+        """
+        position = self.positions[key]
+        return self.buffer[self.starts[position]:self.ends[position]].rstrip(b" \t\r\n,")
+
+    def checksum(self, key):
+        """
+        crc32 of one member's bytes as they were when the index was built
+        """
+        return self.checksums[self.positions[key]]
+
+    def __getitem__(self, key):
+        try:
+            return json.loads(self.raw(key))
+        except ValueError:
+            raise Exception(f"Invalid JSON format for '{key}' in {os.path.basename(self.path)}")
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getstate__(self):
+        # The mapping itself can't be pickled; it's reopened when the index is loaded
+        state = self.__dict__.copy()
+        state["file"] = state["buffer"] = None
+        return state
+
+
+def load_indexes(index_path, wanted, current=None):
+    """
+    Get an up-to-date index for everything in `wanted` (name -> unbuilt JsonIndex)
+    Indexes in `current` (already open) are reused if their files haven't
+    changed, then indexes saved at index_path; anything else is scanned and
+    the saved indexes are rewritten.
+    """
+    current = current or {}
+    if all(name in current and current[name].is_current() for name in wanted):
+        return {name: current[name] for name in wanted}
+
+    saved = {}
+    try:
+        with open(index_path, "rb") as file:
+            content = pickle.load(file)
+        if content.get("version") == INDEX_VERSION:
+            saved = content["indexes"]
+    except Exception:
+        pass  # A missing or unreadable index just means scanning again
+
+    indexes = {}
+    rebuilt = False  # Only rewrite the saved indexes if something was scanned
+    for name, index in wanted.items():
+        if name in current and current[name].is_current():
+            indexes[name] = current[name]
+            continue
+        previous = saved.get(name)
+        if (previous is not None and previous.path == index.path and
+                previous.member == index.member and previous.is_current()):
+            indexes[name] = previous.open()
+        else:
+            indexes[name] = index.build(indexes.values())
+            rebuilt = True
+
+    if rebuilt:
+        try:
+            with open(index_path + ".tmp", "wb") as file:
+                pickle.dump({"version": INDEX_VERSION, "indexes": indexes}, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(index_path + ".tmp", index_path)
+        except OSError:
+            pass  # Read-only checkouts simply scan every time
+    return indexes
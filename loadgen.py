@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Turbo's Quest - Load Generator
+Opens thousands of connections to the network server and plays every one of them to a win
+
+Each simulated player connects, waits for the prompt, then types a winning
+transcript one command at a time, timing every command from sending it to
+seeing the next prompt. Once the script is done it types "quit" if the
+server hasn't already ended the game, and checks the server's final
+SESSION_OVER line says it won.
+
+By default a server is started in this same process on a free loopback
+port, so one command measures everything; --connect points it at a server
+that's already running instead.
+
+Run it with:
+    python loadgen.py [--connections N] [--script FILE] [--data DIR] [--connect HOST:PORT]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from main import DataLoader
+from server import PROMPT, SESSION_OVER, GameServer
+
+
+# What the server's prompt and last line look like on the wire
+PROMPT_BYTES = PROMPT.replace("\n", "\r\n").encode("utf-8")
+WON_BYTES = f"{SESSION_OVER} won".encode("utf-8")
+
+# Connections opened at the same moment (the rest wait their turn to dial)
+CONNECT_BURST = 500
+
+
+def read_script(path):
+    """
+    Read one command per line, skipping blank lines and # comments
+    """
+    with open(path, encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip() and not line.startswith("#")]
+
+
+def default_script(data_directory):
+    """
+    The transcript that wins a data directory: a generated world's solution.txt, or the full walkthrough
+    """
+    solution = os.path.join(data_directory, "solution.txt")
+    if os.path.exists(solution):
+        return solution
+    return os.path.join("transcripts", "full_win.txt")
+
+
+async def play(host, port, commands, latencies, dialing, timeout):
+    """
+    One simulated player: play `commands`, recording each command's latency in ns
+    Returns "won", "lost" or the name of what went wrong.
+    """
+    async with dialing:
+        reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+    try:
+        await asyncio.wait_for(reader.readuntil(PROMPT_BYTES), timeout)
+        ending = b""
+        for command in commands:
+            start = time.perf_counter_ns()
+            writer.write(command.encode("utf-8") + b"\r\n")
+            try:
+                await asyncio.wait_for(reader.readuntil(PROMPT_BYTES), timeout)
+            except asyncio.IncompleteReadError as e:
+                ending = e.partial  # The server ended the game (win_game) and hung up
+                latencies.append(time.perf_counter_ns() - start)
+                break
+            latencies.append(time.perf_counter_ns() - start)
+        else:
+            writer.write(b"quit\r\n")
+        ending += await asyncio.wait_for(reader.read(), timeout)
+        return "won" if WON_BYTES in ending else "lost"
+    except asyncio.TimeoutError:
+        return "timeout"
+    except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+        return type(e).__name__
+    finally:
+        writer.close()
+
+
+async def run_load(commands, connections=1000, data_directory="data", address=None, timeout=60.0):
+    """
+    Play `commands` over `connections` simultaneous connections and return the results
+    Starts an in-process server on a free loopback port unless `address`
+    (host, port) is given. Results are {"outcomes": {outcome: count},
+    "latencies": sorted ns, "elapsed": seconds, "server": GameServer or None}.
+    """
+    server = None
+    if address is None:
+        loader = DataLoader(data_directory, verbose=False)
+        if not loader.load_all_data():
+            raise SystemExit(1)
+        server = GameServer(loader, "127.0.0.1", 0, idle_timeout=timeout, max_connections=connections + 1)
+        address = ("127.0.0.1", await server.start())
+
+    latencies = []
+    dialing = asyncio.Semaphore(CONNECT_BURST)
+    start = time.perf_counter()
+    try:
+        results = await asyncio.gather(*[play(*address, commands, latencies, dialing, timeout)
+                                         for _ in range(connections)], return_exceptions=True)
+    finally:
+        elapsed = time.perf_counter() - start
+        if server is not None:
+            await server.shutdown()
+
+    outcomes = {}
+    for result in results:
+        outcome = type(result).__name__ if isinstance(result, BaseException) else result
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    return {"outcomes": outcomes, "latencies": sorted(latencies), "elapsed": elapsed, "server": server}
+
+
+def print_report(results, connections, commands):
+    """
+    Print outcomes, throughput and latency percentiles
+    """
+    latencies = results["latencies"]
+    elapsed = results["elapsed"]
+    outcomes = ", ".join(f"{count} {outcome}" for outcome, count in sorted(results["outcomes"].items()))
+    print(f"🐕 {connections} players x {len(commands)} commands in {elapsed:.2f}s: {outcomes}")
+    if not latencies:
+        return
+    print(f"   {len(latencies) / elapsed:,.0f} commands/sec")
+    for label, fraction in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99), ("p99.9", 0.999)):
+        value = latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+        print(f"   {label:>6}: {value / 1e6:8.2f} ms")
+    print(f"   {'max':>6}: {latencies[-1] / 1e6:8.2f} ms")
+    server = results["server"]
+    if server is not None:
+        print(f"   server: {server.accepted} accepted, {server.commands} commands, "
+              f"{server.idle_disconnects} idle, {server.slow_disconnects} slow disconnects")
+
+
+def main():
+    """
+    Run a load test from the command line
+    """
+    parser = argparse.ArgumentParser(description="Load test the Turbo's Quest server over loopback")
+    parser.add_argument("--connections", type=int, default=2000, help="simultaneous players")
+    parser.add_argument("--data", default="data", help="game data directory (for the in-process server)")
+    parser.add_argument("--script", help="winning transcript to play (default: solution.txt or full_win.txt)")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="load an already running server instead")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for any one reply")
+    args = parser.parse_args()
+
+    commands = read_script(args.script or default_script(args.data))
+    address = None
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        address = (host or "127.0.0.1", int(port))
+    results = asyncio.run(run_load(commands, args.connections, args.data, address, args.timeout))
+    print_report(results, args.connections, commands)
+    if results["outcomes"].get("won", 0) != args.connections:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,139 +11,1002 @@ This cleaned version removes:
 - Unused item effects
 """
 
+import copyreg
+import hashlib
+import io
 import json
 import os
+import pickle
+import re
+import struct
+import sys
+import time
+import weakref
+import zlib
+from collections import OrderedDict
+from types import MappingProxyType
+
+from commands import ACTION, GLOBAL, MOVE, CommandIndex
+from history import History
+from jsonindex import JsonIndex, load_indexes
+from metrics import Metrics, instrument, uninstrument
+import navigation
+from patching import COPY_LIMIT, patched
+import render
+from rules import EFFECTS, Effect, Requirement, action_index_for, compile_effect, compile_requirement, \
+    failed_requirement, required_items
+
+
+def iter_bits(bits):
+    """
+    Yield the ids stored in a bitset, lowest first
+    """
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
 
 
 class Player:
     """
     Represents Turbo, the adventurous German Shepherd
     This class manages Turbo's inventory and progress through the game
+    
+    Inventory, rooms and completed actions are bitsets (plain ints) indexed by
+    the world's compiled ids, so every check is a bit test and a whole player
+    takes a couple of hundred bytes
     """
-    def __init__(self, name="Turbo"):
+    __slots__ = ("name", "say", "inventory", "current_location", "discovered_locations",
+                 "visited_locations", "completed_actions", "quest_items_found",
+                 "size_realization_triggered", "revelation_triggered", "game_won")
+    
+    def __init__(self, name="Turbo", say=print):
         self.name = name
-        self.inventory = []  # Items Turbo is carrying or has found
+        self.say = say  # Where Turbo's messages go (the engine's turn buffer when headless)
+        self.inventory = 0  # Items Turbo is carrying or has found
         self.current_location = None  # Current room/area Turbo is in
-        self.discovered_locations = []  # Places Turbo has visited
-        self.completed_actions = []  # Actions completed (prevents repetition)
-        self.quest_items_found = 0  # Track progress toward the big revelation
+        self.discovered_locations = 0  # Places Turbo has moved to
+        self.visited_locations = 0  # Rooms whose first-visit text has been shown
+        self.completed_actions = 0  # Actions completed (prevents repetition)
+        self.quest_items_found = 0  # Quest items carried, kept up to date as items come and go
         self.size_realization_triggered = False  # Tracks if Turbo realized the size significance
+        self.revelation_triggered = False  # Maxwell's secret has been revealed
+        self.game_won = False
     
-    def add_item(self, item_id, items_data):
+    def add_item(self, item_id, items, quest_total):
         """
         Add an item to Turbo's inventory when he finds something
-        This method also tracks quest progress and shows pickup messages
+        This method also tracks quest progress (out of `quest_total` quest items) and shows pickup messages
         """
-        if item_id in items_data:
-            item = items_data[item_id]
-            self.inventory.append(item_id)
-            print(item.get("pickup_message", f"You found: {item['name']}"))
+        item = items[item_id]
+        is_new = not self.inventory >> item_id & 1
+        self.inventory |= 1 << item_id
+        self.say(item.pickup_message)
+        
+        # Check if this is a quest item (helmet, gloves, or bike)
+        if item.quest_item and is_new:
+            self.quest_items_found += 1
+            self.say(f"\n🎾 Progress: You've found {self.quest_items_found}/{quest_total} special items!")
             
-            # Check if this is a quest item (helmet, gloves, or bike)
-            if item.get("special_effect") == "quest_item":
-                self.quest_items_found += 1
-                print(f"\n🎾 Progress: You've found {self.quest_items_found}/3 special items!")
-                
-                # Show encouragement as Turbo gets closer to the revelation
-                if self.quest_items_found == 1:
-                    print("Maxwell purrs softly. You're on the right track!")
-                elif self.quest_items_found == 2:
-                    print("Maxwell's tail swishes with excitement. One more to go!")
-                elif self.quest_items_found == 3:
-                    print("Maxwell's eyes are bright with anticipation. You have all the pieces now...")
-                    print("💡 Try using 'examine all items' to understand what you've collected!")
-        else:
-            print(f"Error: Item '{item_id}' not found in game data.")
+            # Show encouragement as Turbo gets closer to the revelation
+            if self.quest_items_found == quest_total:
+                self.say("Maxwell's eyes are bright with anticipation. You have all the pieces now...")
+                self.say("💡 Try using 'examine all items' to understand what you've collected!")
+            elif self.quest_items_found == quest_total - 1:
+                self.say("Maxwell's tail swishes with excitement. One more to go!")
+            elif self.quest_items_found == 1:
+                self.say("Maxwell purrs softly. You're on the right track!")
     
-    def remove_item(self, item_id, items_data):
+    def remove_item(self, item_id, items):
         """
         Remove an item from Turbo's inventory when it's used
         """
-        if item_id in self.inventory:
-            self.inventory.remove(item_id)
-            if item_id in items_data:
-                item = items_data[item_id]
-                print(item.get("use_message", f"You used: {item['name']}"))
+        if self.inventory >> item_id & 1:
+            self.inventory &= ~(1 << item_id)
+            item = items[item_id]
+            if item.quest_item:
+                self.quest_items_found -= 1
+            self.say(item.use_message)
             return True
         else:
-            print(f"You don't have that item with you.")
+            self.say(f"You don't have that item with you.")
             return False
     
     def has_item(self, item_id):
         """
         Check if Turbo currently has a specific item in his inventory
         """
-        return item_id in self.inventory
+        return self.inventory >> item_id & 1 == 1
+    
+    def has_completed(self, action_id):
+        """
+        Check if a non-repeatable action has already been done
+        """
+        return self.completed_actions >> action_id & 1 == 1
+    
+    def complete_action(self, action_id):
+        """
+        Remember that an action has been done so it isn't repeated
+        """
+        self.completed_actions |= 1 << action_id
+    
+    def has_visited(self, location_id):
+        """
+        Check if Turbo has already seen a room's first-visit description
+        """
+        return self.visited_locations >> location_id & 1 == 1
+    
+    def mark_visited(self, location_id):
+        """
+        Remember that Turbo has seen a room
+        """
+        self.visited_locations |= 1 << location_id
+    
+    def discover(self, location_id):
+        """
+        Remember that Turbo has moved into a room
+        """
+        self.discovered_locations |= 1 << location_id
     
-    def show_inventory(self, items_data):
+    def show_inventory(self, items):
         """
         Display what Turbo is currently carrying
         This helps players track their progress and available tools
         """
         if self.inventory:
-            print(f"\n🎾 {self.name}'s Current Items:")
-            for item_id in self.inventory:
-                if item_id in items_data:
-                    item = items_data[item_id]
-                    print(f"  - {item['name']}: {item['description']}")
-                else:
-                    print(f"  - {item_id} (unknown item)")
+            self.say(f"\n🎾 {self.name}'s Current Items:")
+            for item_id in iter_bits(self.inventory):
+                item = items[item_id]
+                self.say(f"  - {item.name}: {item.description}")
         else:
-            print(f"\n{self.name} isn't carrying anything right now.")
+            self.say(f"\n{self.name} isn't carrying anything right now.")
     
-    def show_stats(self):
+    def show_stats(self, locations, quest_total):
         """
         Display Turbo's current status including progress toward the goal
         """
-        print(f"\n--- {self.name}'s Status ---")
-        print(f"Location: {self.current_location}")
-        print(f"Items Found: {len(self.inventory)}")
-        print(f"Quest Progress: {self.quest_items_found}/3 special items")
+        self.say(f"\n--- {self.name}'s Status ---")
+        self.say(f"Location: {locations[self.current_location].key}")
+        self.say(f"Items Found: {self.inventory.bit_count()}")
+        self.say(f"Quest Progress: {self.quest_items_found}/{quest_total} special items")
         if self.size_realization_triggered:
-            print("🧠 Understanding: You've realized something important about these items!")
-        print(f"Areas Explored: {len(self.discovered_locations)}")
+            self.say("🧠 Understanding: You've realized something important about these items!")
+        self.say(f"Areas Explored: {self.discovered_locations.bit_count()}")
+
+
+def freeze(value):
+    """
+    Return a read-only view of loaded JSON data
+    Dicts become mapping proxies and lists become tuples, all the way down,
+    so one loaded world can be shared safely by every game session
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class Item:
+    """
+    A compiled item record - messages are resolved once at load time
+    """
+    __slots__ = ("id", "key", "name", "description", "pickup_message", "use_message", "quest_item")
+    
+    def __init__(self, item_id, key, data):
+        self.id = item_id
+        self.key = key
+        self.name = data["name"]
+        self.description = data.get("description", "")
+        self.pickup_message = data.get("pickup_message", f"You found: {self.name}")
+        self.use_message = data.get("use_message", f"You used: {self.name}")
+        self.quest_item = data.get("special_effect") == "quest_item"
+
+
+class SpecialAction:
+    """
+    A compiled special action from story.json with its requirements and effects linked
+    """
+    __slots__ = ("id", "key", "description", "requirements", "required_items", "effects",
+                 "repeatable", "repeat_message")
+    
+    def __init__(self, action_id, key, data, requirements, effects):
+        self.id = action_id
+        self.key = key
+        self.description = data.get("description", "Something happens...")
+        self.requirements = requirements
+        self.required_items = required_items(requirements)  # One mask for item-only requirements, else None
+        self.effects = effects
+        self.repeatable = data.get("repeatable", False)
+        self.repeat_message = data.get("repeat_message", "You've already done that.")
+
+
+class Location:
+    """
+    A compiled room: exits point at location ids and actions at special action ids
+    """
+    __slots__ = ("id", "key", "name", "description", "first_visit_description", "visited",
+                 "exits", "moves", "actions", "aliases", "commands")
+    
+    def __init__(self, location_id, key, data):
+        self.id = location_id
+        self.key = key
+        self.name = data["name"]
+        self.description = data["description"]
+        self.first_visit_description = data.get("first_visit_description")
+        self.visited = data.get("visited", False)  # Content default - sessions track their own visits
+        self.exits = {}  # Exit name -> destination location id (in display order)
+        self.moves = {}  # Exit name or destination id -> destination location id
+        self.actions = {}  # Command -> special action id (in display order)
+        self.aliases = dict(data.get("aliases", {}))  # Extra phrases for commands in this room
+        self.commands = None  # CommandIndex, built once everything is linked
+
+
+class World:
+    """
+    The compiled, read-only game world shared by every session
+    Records are stored in lists indexed by their integer id, with name lookups on the side
+    
+    Ids are stable for the life of a world: when content is reloaded, new records
+    get fresh ids and removed ones leave a None behind, so session bitsets stay valid
+    """
+    def __init__(self, story_config):
+        self.story_config = story_config
+        self.version = 1  # Goes up by one with every hot reload
+        self.locations = []
+        self.location_ids = {}
+        self.items = []
+        self.item_ids = {}
+        self.actions = []
+        self.action_ids = {}
+        self.quest_items = ()  # Ids of the items Maxwell wants Turbo to find
+        self.quest_mask = 0  # The same quest items as a bitset
+        self.signature = 0  # Checksum of the id layout, so snapshots only load into a matching world
+        self.starting_location = None
+        self.issues = {}  # (kind, key) -> dangling references found while compiling that record
+        self.referrers = {}  # (kind, key) -> records whose raw data mentions it, for relinking (shared by versions)
+    
+    @property
+    def problems(self):
+        """
+        Every dangling reference in the world, as readable messages
+        """
+        return [problem for issues in self.issues.values() for problem in issues]
+    
+    def refer(self, target, source):
+        """
+        Remember that record `source` mentions `target`, so edits to one relink the other
+        """
+        self.referrers.setdefault(target, set()).add(source)
+
+
+def compile_item(world, key, data):
+    """
+    Compile one item into its slot in the world
+    """
+    item_id = world.item_ids[key]
+    world.items[item_id] = Item(item_id, key, data)
+    if world.items[item_id].quest_item:
+        world.quest_mask |= 1 << item_id
+    else:
+        world.quest_mask &= ~(1 << item_id)
+
+
+def compile_action(world, key, data):
+    """
+    Compile one special action, turning its requirements and effects into rules (see rules.py)
+    """
+    issues = []
+    requirements = tuple(compile_requirement(world, key, req, issues) for req in data.get("requirements", []))
+    effects = tuple(effect for effect in (compile_effect(world, key, raw, issues) for raw in data.get("effects", []))
+                    if effect is not None)
+    
+    action_id = world.action_ids[key]
+    world.actions[action_id] = SpecialAction(action_id, key, data, requirements, effects)
+    record_issues(world, ("action", key), issues)
+
+
+def compile_location(world, key, data):
+    """
+    Compile one room, linking its exits and actions by id and indexing its commands
+    """
+    issues = []
+    location = Location(world.location_ids[key], key, data)
+    for exit_name, destination in data.get("exits", {}).items():
+        world.refer(("location", destination), ("location", key))
+        if destination not in world.location_ids:
+            issues.append(f"Exit '{exit_name}' in '{key}' leads to unknown location '{destination}'")
+            continue
+        destination_id = world.location_ids[destination]
+        location.exits[exit_name] = destination_id
+        # The first exit matching a command wins, whether by exit name or destination id
+        location.moves.setdefault(exit_name, destination_id)
+        location.moves.setdefault(destination, destination_id)
+    for command, action_key in data.get("actions", {}).items():
+        world.refer(("action", action_key), ("location", key))
+        if action_key not in world.action_ids:
+            issues.append(f"Action '{command}' in '{key}' uses unknown special action '{action_key}'")
+            continue
+        location.actions[command] = world.action_ids[action_key]
+    
+    # Precompile the room's command index, with story-wide aliases under the room's own
+    global_aliases = world.story_config.get("game_settings", {}).get("command_aliases", {})
+    location.commands = CommandIndex.build(location, {**global_aliases, **location.aliases})
+    world.locations[location.id] = location
+    record_issues(world, ("location", key), issues)
+
+
+def record_issues(world, record, issues):
+    """
+    Replace the dangling-reference messages for one record
+    """
+    if issues:
+        world.issues[record] = issues
+    else:
+        world.issues.pop(record, None)
+
+
+def link_story_settings(world):
+    """
+    Resolve the story-wide settings that point at other records
+    """
+    world.quest_items = tuple(iter_bits(world.quest_mask))
+    starting_key = world.story_config.get("game_settings", {}).get("starting_location", "living_room")
+    world.starting_location = world.location_ids.get(starting_key)
+    if world.starting_location is None:
+        record_issues(world, ("story", "starting_location"),
+                      [f"Starting location '{starting_key}' does not exist"])
+    else:
+        record_issues(world, ("story", "starting_location"), [])
+
+
+def compile_world(locations, items, story_config):
+    """
+    Link the raw JSON content into a World of integer-indexed records
+    Dangling references are dropped and reported once in world.problems
+    instead of surfacing as runtime errors
+    """
+    world = World(story_config)
+    special_actions = story_config.get("special_actions", {})
+    
+    # Give every record an integer id first so references can be resolved in one pass
+    world.location_ids = {key: number for number, key in enumerate(locations)}
+    world.item_ids = {key: number for number, key in enumerate(items)}
+    world.action_ids = {key: number for number, key in enumerate(special_actions)}
+    world.locations = [None] * len(world.location_ids)
+    world.items = [None] * len(world.item_ids)
+    world.actions = [None] * len(world.action_ids)
+    
+    for key, data in items.items():
+        compile_item(world, key, data)
+    for key, data in special_actions.items():
+        compile_action(world, key, data)
+    for key, data in locations.items():
+        compile_location(world, key, data)
+    link_story_settings(world)
+    world.signature = layout_signature(world)
+    
+    return world
+
+
+def layout_signature(world):
+    """
+    Snapshots store integer ids, which only mean the same thing in a world with the same layout
+    """
+    layout = "\0".join([*world.location_ids, "", *world.item_ids, "", *world.action_ids])
+    return zlib.crc32(layout.encode("utf-8"))
+
+
+def patch_world(world, locations, items, story_config, changed):
+    """
+    Build the next version of a world, recompiling only what changed
+    `locations`, `items` and `story_config` are the complete new content and
+    `changed` maps "locations", "items" and "special_actions" to the keys that
+    were added, edited or removed. Records that mention a changed key are
+    relinked too. The old world is left untouched for sessions still using it.
+    """
+    special_actions = story_config.get("special_actions", {})
+    new = World.__new__(World)
+    new.__dict__.update(world.__dict__)
+    new.version = world.version + 1
+    new.story_config = story_config
+    new.issues = patched(world.issues)
+    # Referrers only ever grow (stale entries just cause a harmless extra relink),
+    # so every version of a world shares one map instead of copying it
+    
+    dirty = {"location": set(), "action": set()}
+    tables = (("item", items, "items", "item_ids"),
+              ("action", special_actions, "actions", "action_ids"),
+              ("location", locations, "locations", "location_ids"))
+    for kind, content, records_name, ids_name in tables:
+        keys = changed.get("special_actions" if kind == "action" else records_name, ())
+        if not keys:
+            continue
+        records = patched(getattr(world, records_name))
+        ids = getattr(world, ids_name)
+        for key in keys:
+            if key in content and key not in ids:
+                # Brand new record: fresh id, and anything that was dangling towards it relinks
+                ids = ids if ids is not getattr(world, ids_name) else patched(ids)
+                ids[key] = len(records)
+                records.append(None)
+                dirty_referrers(new, kind, key, dirty)
+            elif key not in content and key in ids:
+                # Removed record: leave a hole so every other id keeps its meaning
+                ids = ids if ids is not getattr(world, ids_name) else patched(ids)
+                records[ids.pop(key)] = None
+                new.issues.pop((kind, key), None)
+                dirty_referrers(new, kind, key, dirty)
+            if key in content and kind != "item":
+                dirty[kind].add(key)
+        setattr(new, records_name, records)
+        setattr(new, ids_name, ids)
+        
+        if kind == "item":
+            for key in keys:
+                if key in content:
+                    compile_item(new, key, content[key])
+                elif key in world.item_ids:
+                    new.quest_mask &= ~(1 << world.item_ids[key])
+    
+    # Story-wide aliases feed every room's command index
+    old_aliases = world.story_config.get("game_settings", {}).get("command_aliases", {})
+    new_aliases = story_config.get("game_settings", {}).get("command_aliases", {})
+    if old_aliases != new_aliases:
+        dirty["location"].update(new.location_ids)
+    
+    # Relinked records are written into copies, never into tables the old world still uses
+    if dirty["action"] and new.actions is world.actions:
+        new.actions = patched(world.actions)
+    if dirty["location"] and new.locations is world.locations:
+        new.locations = patched(world.locations)
+    
+    for key in dirty["action"]:
+        if key in special_actions:
+            compile_action(new, key, special_actions[key])
+    for key in dirty["location"]:
+        if key in locations:
+            compile_location(new, key, locations[key])
+    
+    link_story_settings(new)
+    return new
+
+
+def dirty_referrers(world, kind, key, dirty):
+    """
+    Mark every record that mentions (kind, key) for recompiling
+    """
+    for source_kind, source_key in world.referrers.get((kind, key), ()):
+        dirty[source_kind].add(source_key)
+
+
+class LazyTable:
+    """
+    A list-like table of records that are compiled on first use
+    Lazy worlds use these for their locations and actions. Only the most
+    recently used `capacity` records stay compiled; the rest are dropped and
+    compiled again from the indexed JSON if they're ever needed.
+    """
+    __slots__ = ("world", "keys", "content", "compile_record", "capacity", "records", "hits", "misses")
+    
+    def __init__(self, world, keys, content, compile_record, capacity):
+        self.world = world
+        self.keys = keys  # Record id -> key (None where a record was removed)
+        self.content = content  # Key -> raw JSON data, usually a JsonIndex
+        self.compile_record = compile_record  # compile_location or compile_action
+        self.capacity = max(1, capacity)
+        self.records = OrderedDict()  # Record id -> compiled record, least recently used first
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self):
+        return len(self.keys)
+    
+    def __getitem__(self, record_id):
+        records = self.records
+        record = records.get(record_id)
+        if record is not None:
+            records.move_to_end(record_id)
+            self.hits += 1
+            return record
+        key = self.keys[record_id]  # IndexError past the end, just like a list
+        if key is None:
+            return None
+        self.misses += 1
+        # Compiling writes the record back through __setitem__
+        self.compile_record(self.world, key, freeze(self.content[key]))
+        return records[record_id]
+    
+    def __setitem__(self, record_id, record):
+        records = self.records
+        records[record_id] = record
+        records.move_to_end(record_id)
+        if len(records) > self.capacity:
+            records.popitem(last=False)
+    
+    def __iter__(self):
+        for record_id in range(len(self.keys)):
+            yield self[record_id]
+
+
+class LazyWorld(World):
+    """
+    A World whose rooms and special actions are compiled on demand from indexed JSON
+    Only the id maps, the items and a bounded number of compiled records stay
+    in memory. Dangling references are reported as the records using them are
+    compiled. There's no referrer map: a reload builds a fresh lazy world
+    (keeping every id) instead of patching this one.
+    """
+    def refer(self, target, source):
+        pass
+
+
+def stable_ids(keys, previous_ids=None, previous_size=0):
+    """
+    Number keys for a lazy world, keeping any id an earlier version gave them
+    New keys are appended and removed ones leave a None behind.
+    Returns (key for each id, key -> id).
+    """
+    by_id = [None] * previous_size
+    ids = {}
+    for key in keys:
+        record_id = previous_ids.get(key) if previous_ids else None
+        if record_id is None:
+            record_id = len(by_id)
+            by_id.append(None)
+        by_id[record_id] = key
+        ids[key] = record_id
+    return by_id, ids
+
+
+def compile_lazy_world(locations, items, story_config, capacity, previous=None):
+    """
+    Build a LazyWorld over indexed locations and special actions
+    Items are compiled right away; rooms and actions wait until they're used.
+    Pass the world being replaced as `previous` to keep its ids.
+    """
+    world = LazyWorld(story_config)
+    special_actions = story_config.get("special_actions", {})
+    if previous is None:
+        # A fresh world numbers records in file order, which is exactly how they're indexed
+        location_keys, world.location_ids = locations.keys, locations.positions
+        item_keys, world.item_ids = stable_ids(items)
+        action_keys, world.action_ids = special_actions.keys, special_actions.positions
+    else:
+        world.version = previous.version + 1
+        location_keys, world.location_ids = stable_ids(locations, previous.location_ids, len(previous.locations))
+        item_keys, world.item_ids = stable_ids(items, previous.item_ids, len(previous.items))
+        action_keys, world.action_ids = stable_ids(special_actions, previous.action_ids, len(previous.actions))
+    
+    world.items = [None] * len(item_keys)
+    for key, data in items.items():
+        compile_item(world, key, data)
+    world.locations = LazyTable(world, location_keys, locations, compile_location, capacity)
+    world.actions = LazyTable(world, action_keys, special_actions, compile_action, capacity)
+    link_story_settings(world)
+    world.signature = previous.signature if previous is not None else layout_signature(world)
+    return world
+
+
+# Frozen mappings are pickled as plain dicts and re-wrapped on load
+copyreg.pickle(MappingProxyType, lambda mapping: (freeze, (dict(mapping),)))
+
+# The JSON files that make up a world, in the order they're loaded
+SOURCE_FILES = ("locations.json", "items.json", "story.json")
+
+# Bump whenever the compiled records change shape so old caches are rebuilt
+CACHE_VERSION = 3
 
 
 class DataLoader:
     """
     Handles loading all game data from JSON files
     This separates the game logic from the game content, making it easy to modify
+    
+    The compiled world is cached next to the data directory (data.cache for data/)
+    and reused for as long as the JSON files are unchanged
+    
+    For very large worlds, lazy=True indexes locations.json and story.json
+    instead (the index is kept in data.index) and compiles rooms and special
+    actions only when they're first used, keeping at most `cache_size` of each
+    in memory. The JSON files are memory-mapped while the world is live, so
+    replace them (write a new file and rename it) rather than rewriting them
+    in place.
     """
-    def __init__(self, data_directory="data"):
+    def __init__(self, data_directory="data", use_cache=True, verbose=True, lazy=False, cache_size=4096):
         self.data_dir = data_directory
+        self.cache_path = data_directory.rstrip("/\\") + ".cache" if use_cache else None
+        self.index_path = data_directory.rstrip("/\\") + ".index"
+        self.verbose = verbose  # Print the banner and content warnings
+        self.lazy = lazy  # Compile rooms and actions on demand from indexed JSON
+        self.cache_size = cache_size  # Compiled rooms (and actions) a lazy world keeps
+        self.indexes = {}  # JsonIndexes behind a lazy world, by name
         self.locations = {}
         self.items = {}
         self.story_config = {}
+        self.world = None
+        self.loaded = False
+        self.loaded_from_cache = False
+        self.fingerprints = {}  # (mtime_ns, size, sha256) of each JSON file as last loaded
+        self.sessions = weakref.WeakSet()  # Live GameEngines sharing this world, for reload reports
     
     def load_all_data(self):
         """
-        Load all game data from JSON files
+        Load all game data from JSON files (or the compiled cache)
         Returns True if successful, False if there's an error
+        
+        The loaded world is frozen: per-game progress lives on the Player instead
         """
         try:
-            self.locations = self.load_json_file("locations.json")
-            self.items = self.load_json_file("items.json")
-            self.story_config = self.load_json_file("story.json")
-            print("🎮 Game data loaded successfully!")
+            if self.lazy:
+                self.load_indexed()
+            else:
+                self.loaded_from_cache = self.load_cache()
+                if not self.loaded_from_cache:
+                    self.load_sources()
+            if self.world.starting_location is None:
+                raise Exception(self.world.issues[("story", "starting_location")][0])
+            self.loaded = True
+            if self.verbose:
+                print("🎮 Game data loaded successfully!")
+                # Broken links are reported once here rather than on every command
+                for problem in self.world.problems:
+                    print(f"⚠️  {problem}")
             return True
         except Exception as e:
             print(f"❌ Error loading game data: {e}")
             print("Make sure you have the 'data' folder with all JSON files!")
             return False
     
+    def load_sources(self):
+        """
+        Parse and compile the JSON files, then refresh the cache
+        """
+        fingerprints = {}
+        contents = []
+        for filename in SOURCE_FILES:
+            raw = self.read_source(filename)
+            fingerprints[filename] = self.fingerprint(filename, raw)
+            contents.append(freeze(self.parse_json(filename, raw)))
+        self.locations, self.items, self.story_config = contents
+        self.world = compile_world(self.locations, self.items, self.story_config)
+        self.fingerprints = fingerprints
+        self.save_cache(fingerprints)
+    
+    def load_indexed(self):
+        """
+        Index locations.json and story.json and build a lazy world over them
+        Only items.json and the story's own settings are parsed up front.
+        """
+        self.indexes = self.read_indexes()
+        self.locations, self.items, self.story_config = self.indexed_content(self.indexes)
+        self.world = compile_lazy_world(self.locations, self.items, self.story_config, self.cache_size)
+    
+    def read_indexes(self, current=None):
+        """
+        Get up-to-date indexes for the big JSON files, scanning only the ones that changed
+        """
+        wanted = {}
+        for name, filename, member in (("locations", "locations.json", None), ("story", "story.json", None),
+                                       ("special_actions", "story.json", "special_actions")):
+            path = os.path.join(self.data_dir, filename)
+            if not os.path.exists(path):
+                raise Exception(f"Could not find {filename} in {self.data_dir} directory")
+            wanted[name] = JsonIndex(path, member)
+        return load_indexes(self.index_path, wanted, current)
+    
+    def indexed_content(self, indexes):
+        """
+        Assemble (locations, items, story_config) for a lazy world from its indexes
+        """
+        story = indexes["story"]
+        story_config = {key: freeze(story[key]) for key in story if key != "special_actions"}
+        story_config["special_actions"] = indexes["special_actions"]
+        items = freeze(self.load_json_file("items.json"))
+        return indexes["locations"], items, MappingProxyType(story_config)
+    
     def load_json_file(self, filename):
         """
         Load a specific JSON file from the data directory
         Handles file not found and JSON parsing errors
         """
+        return self.parse_json(filename, self.read_source(filename))
+    
+    def read_source(self, filename):
+        """
+        Read the raw bytes of one of the JSON files
+        """
         filepath = os.path.join(self.data_dir, filename)
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                return json.load(file)
+            with open(filepath, 'rb') as file:
+                return file.read()
         except FileNotFoundError:
             raise Exception(f"Could not find {filename} in {self.data_dir} directory")
-        except json.JSONDecodeError:
+    
+    def parse_json(self, filename, raw):
+        """
+        Parse JSON file contents, reporting which file is broken
+        """
+        try:
+            return json.loads(raw.decode('utf-8'))
+        except (json.JSONDecodeError, UnicodeDecodeError):
             raise Exception(f"Invalid JSON format in {filename}")
+    
+    def fingerprint(self, filename, raw=None):
+        """
+        Return (mtime_ns, size, sha256) for a JSON file
+        The hash is skipped (None) unless the raw contents are passed in
+        """
+        stat = os.stat(os.path.join(self.data_dir, filename))
+        digest = hashlib.sha256(raw).hexdigest() if raw is not None else None
+        return (stat.st_mtime_ns, stat.st_size, digest)
+    
+    def load_cache(self):
+        """
+        Load the compiled world from the cache if it still matches the JSON files
+        A matching mtime and size is trusted as-is; if only the mtime moved
+        (a touched or re-saved file) the contents are hashed before deciding.
+        Returns True on a cache hit.
+        """
+        if self.cache_path is None:
+            return False
+        try:
+            with open(self.cache_path, 'rb') as file:
+                blob = file.read()  # The whole cache in one read
+            stream = io.BytesIO(blob)
+            header = pickle.load(stream)
+            if header.get("version") != CACHE_VERSION:
+                return False
+            fingerprints = dict(header["sources"])
+            touched = False
+            for filename, (mtime_ns, size, digest) in header["sources"].items():
+                current_mtime, current_size, _ = self.fingerprint(filename)
+                if current_size != size:
+                    return False
+                if current_mtime != mtime_ns:
+                    fingerprints[filename] = self.fingerprint(filename, self.read_source(filename))
+                    if fingerprints[filename][2] != digest:
+                        return False
+                    touched = True
+            self.locations, self.items, self.story_config, self.world = pickle.load(stream)
+            self.fingerprints = fingerprints
+            if touched:
+                self.save_cache(fingerprints)  # Remember the new mtimes so we don't hash again
+            return True
+        except Exception:
+            # A missing, stale or unreadable cache just means compiling from JSON
+            return False
+    
+    def save_cache(self, fingerprints):
+        """
+        Write the compiled world and the fingerprints of its JSON files to the cache
+        """
+        if self.cache_path is None:
+            return
+        header = {"version": CACHE_VERSION, "sources": fingerprints}
+        payload = (self.locations, self.items, self.story_config, self.world)
+        try:
+            with open(self.cache_path + ".tmp", 'wb') as file:
+                pickle.dump(header, file, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(payload, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(self.cache_path + ".tmp", self.cache_path)
+        except OSError:
+            pass  # Read-only checkouts simply run without a cache
+    
+    def reload(self):
+        """
+        Pick up edits to the JSON files without restarting live sessions
+        Only files whose mtime or size moved are re-read, only records that differ
+        are recompiled, and the new world is swapped in with a single assignment,
+        so each session switches over at the start of its next turn.
+        Returns a ReloadReport, or None if the new content can't be used
+        (in which case the current world stays live).
+        """
+        start = time.perf_counter()
+        if self.lazy:
+            return self.reload_indexed(start)
+        content = {"locations.json": self.locations, "items.json": self.items,
+                   "story.json": self.story_config}
+        fingerprints = dict(self.fingerprints)
+        try:
+            for filename in SOURCE_FILES:
+                mtime_ns, size, _ = self.fingerprint(filename)
+                old = self.fingerprints.get(filename)
+                if old is not None and old[:2] == (mtime_ns, size):
+                    continue
+                raw = self.read_source(filename)
+                fingerprints[filename] = self.fingerprint(filename, raw)
+                if old is None or fingerprints[filename][2] != old[2]:
+                    content[filename] = freeze(self.parse_json(filename, raw))
+        except Exception as e:
+            print(f"❌ Error reloading game data: {e}")
+            return None
+        
+        locations, items, story_config = (content[filename] for filename in SOURCE_FILES)
+        changed = {
+            "locations": changed_keys(self.locations, locations),
+            "items": changed_keys(self.items, items),
+            "special_actions": changed_keys(self.story_config.get("special_actions", {}),
+                                            story_config.get("special_actions", {})),
+        }
+        report = self.swap_world(locations, items, story_config, changed, start)
+        if report is not None:
+            self.fingerprints = fingerprints
+        return report
+    
+    def reload_indexed(self, start):
+        """
+        Reload for lazy worlds: re-index the files that changed and start a fresh lazy world
+        Edits are spotted by comparing each member's checksum, without parsing anything.
+        """
+        try:
+            indexes = self.read_indexes(self.indexes)
+            locations, items, story_config = self.indexed_content(indexes)
+        except Exception as e:
+            print(f"❌ Error reloading game data: {e}")
+            return None
+        
+        changed = {
+            "locations": changed_members(self.indexes["locations"], indexes["locations"]),
+            "items": changed_keys(self.items, items),
+            "special_actions": changed_members(self.indexes["special_actions"], indexes["special_actions"]),
+        }
+        world = compile_lazy_world(locations, items, story_config, self.cache_size, previous=self.world)
+        report = self.install_world(world, locations, items, story_config, changed, start)
+        if report is not None:
+            self.indexes = indexes
+        return report
+    
+    def apply_changes(self, locations=None, items=None, special_actions=None):
+        """
+        Hot-patch individual records without touching the files
+        Each argument maps keys to their new JSON data, or to None to remove them.
+        Returns a ReloadReport like reload(), or None if the change was rejected.
+        """
+        start = time.perf_counter()
+        if self.lazy:
+            print("❌ Lazily loaded worlds can't be patched in memory - edit the files and reload()")
+            return None
+        story_config = self.story_config
+        if special_actions:
+            story_config = MappingProxyType({
+                **story_config,
+                "special_actions": merge_changes(story_config.get("special_actions", {}), special_actions),
+            })
+        changed = {
+            "locations": list(locations or ()),
+            "items": list(items or ()),
+            "special_actions": list(special_actions or ()),
+        }
+        return self.swap_world(merge_changes(self.locations, locations), merge_changes(self.items, items),
+                               story_config, changed, start)
+    
+    def swap_world(self, locations, items, story_config, changed, start):
+        """
+        Patch the world with new content and make it the live version
+        """
+        world = patch_world(self.world, locations, items, story_config, changed)
+        return self.install_world(world, locations, items, story_config, changed, start)
+    
+    def install_world(self, world, locations, items, story_config, changed, start):
+        """
+        Make a new version of the world live, unless it has nowhere to start
+        """
+        if world.starting_location is None:
+            print(f"❌ Reload rejected: {world.issues[('story', 'starting_location')][0]}")
+            return None
+        
+        old_problems = set(self.world.problems)
+        navigation.carry_over(self.world, world)  # Keeps every route the change didn't affect
+        self.locations, self.items, self.story_config = locations, items, story_config
+        self.world = world  # The swap itself: sessions pick this up on their next turn
+        
+        if self.verbose:
+            for problem in world.problems:
+                if problem not in old_problems:
+                    print(f"⚠️  {problem}")
+        sessions = []
+        for engine in list(self.sessions):
+            problems = engine.world_problems(world)
+            if problems:
+                sessions.append((engine, problems))
+        return ReloadReport(world.version, changed, sessions, time.perf_counter() - start)
+
+
+def changed_keys(old, new):
+    """
+    Keys that were added, edited or removed between two versions of a JSON object
+    """
+    if old is new:
+        return []
+    changed = [key for key, value in new.items() if old.get(key) != value]
+    changed.extend(key for key in old if key not in new)
+    return changed
+
+
+def changed_members(old, new):
+    """
+    Keys added, edited or removed between two indexes of the same JSON object
+    """
+    if old is new:
+        return []
+    changed = [key for key in new if key not in old or old.checksum(key) != new.checksum(key)]
+    changed.extend(key for key in old if key not in new)
+    return changed
+
+
+def merge_changes(content, updates):
+    """
+    Apply {key: new data or None to delete} to a frozen JSON object, returning a new one
+    """
+    if not updates:
+        return content
+    # A proxy's copy() copies the mapping underneath: a dict outright (big ones are
+    # then layered, so only the first patch copies them) or a patched one copy-on-write
+    merged = content.copy()
+    if isinstance(merged, dict) and len(merged) > COPY_LIMIT:
+        merged = patched(merged)
+    for key, data in updates.items():
+        if data is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = freeze(data)
+    return MappingProxyType(merged)
+
+
+class ReloadReport:
+    """
+    What a hot reload changed, and which live sessions lost something they were using
+    """
+    def __init__(self, version, changed, sessions, seconds):
+        self.version = version  # The new world version
+        self.changed = changed  # "locations"/"items"/"special_actions" -> changed keys
+        self.sessions = sessions  # (GameEngine, [problem, ...]) for every affected session
+        self.seconds = seconds
+    
+    def __str__(self):
+        counts = ", ".join(f"{len(keys)} {kind}" for kind, keys in self.changed.items())
+        lines = [f"🔄 World v{self.version}: {counts} changed in {self.seconds * 1000:.1f} ms"]
+        for _, problems in self.sessions:
+            lines.extend(f"⚠️  {problem}" for problem in problems)
+        return "\n".join(lines)
+
+
+# Session snapshots: magic, version, flags, world signature, location id and the
+# byte lengths of the four bitsets, followed by the bitsets themselves
+SNAPSHOT_MAGIC = b"TQ"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<2sBBIIHHHH")
+
+# Bits in the snapshot flags byte
+FLAG_REALIZATION = 1
+FLAG_REVELATION = 2
+FLAG_WON = 4
+FLAG_RUNNING = 8
+
+# Save slot names become file names, so keep them simple
+SAVE_SLOT_PATTERN = re.compile(r"^[a-z0-9_-]{1,32}$")
+
+# Said instead of saving or loading in sessions that have no save directory
+NO_SAVES_MESSAGE = "💾 Saved games aren't available here."
+
+# Commands that start a multi-room trip ("go to balcony")
+TRAVEL_PREFIXES = ("go to ", "travel to ", "walk to ")
+
+# "what if <command>; <command>..." tries commands out and then puts everything back
+WHAT_IF_PREFIX = "what if "
+
+# Said instead of saving, loading or quitting inside a 'what if'
+IMAGINING_MESSAGE = "🔮 That only works for real - Turbo is just imagining right now!"
+
+# Commands that move through history rather than making it
+HISTORY_COMMANDS = ("undo", "rewind", "what_if")
+
+
+class SnapshotError(Exception):
+    """
+    Raised when a session snapshot can't be restored into this world
+    """
 
 
 class GameEngine:
@@ -152,310 +1015,635 @@ class GameEngine:
     Handles the game loop, commands, and Maxwell's mysterious guidance
     This is the heart of the game that brings everything together
     """
-    def __init__(self):
+    def __init__(self, data_loader=None, output=None, headless=False):
+        """
+        Set up a game session
+        Pass an already loaded data_loader to share one world between many sessions.
+        Output is collected per turn and written to `output` in a single write
+        (stdout by default). With headless=True and no output, turns are only
+        returned as text from process_command.
+        """
         self.player = None
         self.game_running = True
-        self.data_loader = DataLoader()
-        self.game_won = False
-        self.revelation_triggered = False
+        self.save_directory = "saves"  # Where 'save' and 'load' keep their files (None turns them off)
+        self.metrics = None  # Metrics being collected for this session, if enabled
+        self.history = None  # Every turn that changed something, for undo and rewind
+        self.imagining = False  # Inside a 'what if', which can't be nested
         
-        # Load all game data from JSON files
-        if not self.data_loader.load_all_data():
+        # Everything the game says during a turn is gathered here first
+        self.output = output if output is not None or headless else sys.stdout
+        self.pending_output = []
+        
+        # Load all game data from JSON files (unless we were handed a loaded world)
+        self.data_loader = data_loader or DataLoader()
+        if not self.data_loader.loaded and not self.data_loader.load_all_data():
             print("Failed to load game data. Exiting...")
-            exit(1)
+            sys.exit(1)
         
         # Create quick references to loaded data for easier access
-        self.locations = self.data_loader.locations
-        self.items = self.data_loader.items
-        self.story_config = self.data_loader.story_config
+        self.use_world(self.data_loader.world)
+        self.data_loader.sessions.add(self)
+    
+    def enable_metrics(self, metrics=None):
+        """
+        Start timing this session's turns, actions, effects and rendering
+        Pass one Metrics to several sessions to collect them all in one place.
+        Returns the Metrics being filled in.
+        """
+        self.disable_metrics()
+        self.metrics = metrics if metrics is not None else Metrics()
+        instrument(self)
+        return self.metrics
+    
+    def disable_metrics(self):
+        """
+        Stop collecting metrics - the session goes back to its uninstrumented methods
+        """
+        uninstrument(self)
+        self.metrics = None
+    
+    def use_world(self, world):
+        """
+        Point this session's quick references at a (possibly newer) world
+        """
+        self.world = world
+        self.locations = world.locations
+        self.items = world.items
+        self.actions = world.actions
+        self.story_config = world.story_config
+        self.renderer = render.renderer_for(world)
+    
+    def world_problems(self, world):
+        """
+        Describe anything this session uses that no longer exists in `world`
+        """
+        if self.player is None:
+            return []
+        problems = []
+        player = self.player
+        location = player.current_location
+        if location >= len(world.locations) or world.locations[location] is None:
+            problems.append(f"Session {id(self):x} is in removed location "
+                            f"'{self.world.locations[location].key}'")
+        for action_id in iter_bits(player.completed_actions):
+            if action_id >= len(world.actions) or world.actions[action_id] is None:
+                problems.append(f"Session {id(self):x} completed removed action "
+                                f"'{self.world.actions[action_id].key}'")
+        for item_id in iter_bits(player.inventory):
+            if item_id >= len(world.items) or world.items[item_id] is None:
+                problems.append(f"Session {id(self):x} carries removed item "
+                                f"'{self.world.items[item_id].key}'")
+        return problems
+    
+    def adopt_world(self, world):
+        """
+        Move this session onto a reloaded world, keeping its progress by stable id
+        Anything that was removed is dropped; if Turbo's room is gone he's
+        carried back to the starting location.
+        """
+        if self.player is not None:
+            self.drop_removed(world)
+            # Earlier turns may mention records that are gone, so history starts again from here
+            self.history = History(*self.history_state())
+        self.use_world(world)
     
-    def start_game(self):
+    def drop_removed(self, world):
+        """
+        Forget progress on records `world` doesn't have, carrying Turbo to the start if his room is gone
+        """
+        def surviving(bits, records):
+            for record_id in iter_bits(bits):
+                if record_id >= len(records) or records[record_id] is None:
+                    bits &= ~(1 << record_id)
+            return bits
+        
+        player = self.player
+        player.inventory = surviving(player.inventory, world.items)
+        player.completed_actions = surviving(player.completed_actions, world.actions)
+        player.discovered_locations = surviving(player.discovered_locations, world.locations)
+        player.visited_locations = surviving(player.visited_locations, world.locations)
+        player.quest_items_found = (player.inventory & world.quest_mask).bit_count()
+        
+        location = player.current_location
+        if location >= len(world.locations) or world.locations[location] is None:
+            player.current_location = world.starting_location
+            self.say("✨ The house seems to rearrange itself around you...")
+            self.say(f"You find yourself back in the {world.locations[world.starting_location].name}.")
+    
+    @property
+    def game_won(self):
+        """True once this session's player has solved Maxwell's mystery"""
+        return self.player is not None and self.player.game_won
+    
+    @property
+    def revelation_triggered(self):
+        """True once this session's player has seen the final revelation"""
+        return self.player is not None and self.player.revelation_triggered
+    
+    def say(self, text=""):
+        """
+        Queue a line of game text for the current turn
+        Nothing is written until the turn ends, so each turn costs one write
+        """
+        self.pending_output.append(str(text))
+    
+    def flush_output(self):
+        """
+        Send everything queued this turn to the output sink in a single write
+        Returns the rendered text so headless callers can use it directly
+        """
+        if not self.pending_output:
+            return ""
+        text = "\n".join(self.pending_output) + "\n"
+        self.pending_output.clear()
+        if self.output is not None:
+            self.output.write(text)
+        return text
+    
+    def start_game(self, commands=None):
         """
         Initialize and start Turbo's adventure
         Sets up the player and shows the opening story
+        
+        Pass any iterable of commands to play without a terminal;
+        otherwise commands are read with input() as usual.
         """
         intro = self.story_config.get("intro_text", {})
         
-        print("=" * 60)
-        print(intro.get("welcome_message", "🐕 Welcome to Turbo's Quest! 🐕"))
-        print("=" * 60)
-        print(intro.get("game_description", "A mysterious adventure awaits..."))
-        print()
+        self.say("=" * 60)
+        self.say(intro.get("welcome_message", "🐕 Welcome to Turbo's Quest! 🐕"))
+        self.say("=" * 60)
+        self.say(intro.get("game_description", "A mysterious adventure awaits..."))
+        self.say()
         
-        # Simple start prompt for our story
-        input(intro.get("name_prompt", "Press Enter to begin Turbo's adventure..."))
+        # Simple start prompt for our story (skipped when commands are scripted)
+        if commands is None:
+            self.flush_output()
+            input(intro.get("name_prompt", "Press Enter to begin Turbo's adventure..."))
+        
+        self.new_game()
+        
+        # Start the main game loop
+        self.game_loop(commands)
+    
+    def new_game(self):
+        """
+        Create Turbo at the starting location and describe it
+        Returns the opening text (also written to the output sink, if any)
+        """
+        intro = self.story_config.get("intro_text", {})
         
         # Create Turbo - no health system needed
-        self.player = Player("Turbo")
+        self.player = Player("Turbo", say=self.say)
+        self.game_running = True
         
         # Set Turbo's starting location
-        starting_location = self.story_config.get("game_settings", {}).get("starting_location", "living_room")
-        self.player.current_location = starting_location
+        self.player.current_location = self.world.starting_location
         
-        print(f"\n🐕 You are Turbo, and something mysterious is happening...")
-        print(intro.get("instruction_text", "Follow Maxwell's guidance!"))
-        print("\n🎯 Trust Maxwell's cat intuition to discover his wonderful secret!")
+        self.say(f"\n🐕 You are Turbo, and something mysterious is happening...")
+        self.say(intro.get("instruction_text", "Follow Maxwell's guidance!"))
+        self.say("\n🎯 Trust Maxwell's cat intuition to discover his wonderful secret!")
         
         # Show the starting location description
         self.describe_current_location()
+        self.history = History(*self.history_state())
+        return self.flush_output()
+    
+    def snapshot(self):
+        """
+        Pack this session's state (not the world) into a compact binary record
+        The record is versioned and tied to the world's id layout
+        """
+        location, flags, bitsets = self.history_state()
+        blobs = [bits.to_bytes((bits.bit_length() + 7) // 8, "little") for bits in bitsets]
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, self.world.signature,
+                                      location, *map(len, blobs))
+        return header + b"".join(blobs)
+    
+    def history_state(self):
+        """
+        This session's state as (location, FLAG_* bits, (inventory, discovered, visited, completed))
+        """
+        player = self.player
+        flags = ((FLAG_REALIZATION if player.size_realization_triggered else 0) |
+                 (FLAG_REVELATION if player.revelation_triggered else 0) |
+                 (FLAG_WON if player.game_won else 0) |
+                 (FLAG_RUNNING if self.game_running else 0))
+        return (player.current_location, flags, (player.inventory, player.discovered_locations,
+                                                  player.visited_locations, player.completed_actions))
+    
+    def set_state(self, location, flags, bitsets):
+        """
+        Replace this session's state with one from history_state() (or a snapshot)
+        """
+        player = Player("Turbo", say=self.say)
+        player.current_location = location
+        player.inventory, player.discovered_locations, player.visited_locations, player.completed_actions = bitsets
+        player.quest_items_found = (player.inventory & self.world.quest_mask).bit_count()
+        player.size_realization_triggered = bool(flags & FLAG_REALIZATION)
+        player.revelation_triggered = bool(flags & FLAG_REVELATION)
+        player.game_won = bool(flags & FLAG_WON)
+        self.player = player
+        self.game_running = bool(flags & FLAG_RUNNING)
+    
+    def restore(self, data):
+        """
+        Replace this session's state with one packed by snapshot()
+        Raises SnapshotError if the record is damaged or from a different world
         
-        # Start the main game loop
-        self.game_loop()
+        Hot reloads keep the id layout, so a snapshot can mention rooms, items or
+        actions removed since it was taken - those are dropped like adopt_world() does.
+        """
+        try:
+            magic, version, flags, signature, location, *sizes = SNAPSHOT_HEADER.unpack_from(data)
+        except struct.error:
+            raise SnapshotError("Snapshot is truncated")
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise SnapshotError("Not a Turbo's Quest snapshot (or from an unsupported version)")
+        if signature != self.world.signature:
+            raise SnapshotError("Snapshot was saved with different game data")
+        if SNAPSHOT_HEADER.size + sum(sizes) != len(data):
+            raise SnapshotError("Snapshot is truncated")
+        
+        # The four bitsets follow the header back to back
+        inventory_end = SNAPSHOT_HEADER.size + sizes[0]
+        discovered_end = inventory_end + sizes[1]
+        visited_end = discovered_end + sizes[2]
+        from_bytes = int.from_bytes
+        self.set_state(location, flags, (from_bytes(data[SNAPSHOT_HEADER.size:inventory_end], "little"),
+                                         from_bytes(data[inventory_end:discovered_end], "little"),
+                                         from_bytes(data[discovered_end:visited_end], "little"),
+                                         from_bytes(data[visited_end:], "little")))
+        self.drop_removed(self.world)
+        if self.history is None:
+            self.history = History(*self.history_state())  # A restored session's history starts here
+    
+    def save_game(self, slot):
+        """
+        Save the current game to a slot in the save directory
+        """
+        if self.imagining:
+            self.say(IMAGINING_MESSAGE)
+            return
+        if self.save_directory is None:
+            self.say(NO_SAVES_MESSAGE)
+            return
+        if not SAVE_SLOT_PATTERN.match(slot):
+            self.say("Save slots can only use letters, numbers, '-' and '_'.")
+            return
+        os.makedirs(self.save_directory, exist_ok=True)
+        path = os.path.join(self.save_directory, f"{slot}.sav")
+        
+        # Write to a temporary file first so a crash never leaves half a save behind
+        with open(path + ".tmp", "wb") as file:
+            file.write(self.snapshot())
+        os.replace(path + ".tmp", path)
+        self.say(f"💾 Game saved to slot '{slot}'. Use 'load {slot}' to come back to it.")
+    
+    def load_game(self, slot):
+        """
+        Load a game saved with save_game and show where Turbo is
+        """
+        if self.imagining:
+            self.say(IMAGINING_MESSAGE)
+            return
+        if self.save_directory is None:
+            self.say(NO_SAVES_MESSAGE)
+            return
+        if not SAVE_SLOT_PATTERN.match(slot):
+            self.say("Save slots can only use letters, numbers, '-' and '_'.")
+            return
+        path = os.path.join(self.save_directory, f"{slot}.sav")
+        try:
+            with open(path, "rb") as file:
+                self.restore(file.read())
+        except FileNotFoundError:
+            self.say(f"There's no saved game in slot '{slot}'.")
+            return
+        except SnapshotError as e:
+            self.say(f"Couldn't load slot '{slot}': {e}.")
+            return
+        self.say(f"💾 Loaded slot '{slot}'.")
+        self.describe_current_location()
     
-    def game_loop(self):
+    def rewind(self, turns):
+        """
+        Take back the last `turns` turns that changed anything and show where Turbo is
+        """
+        head = self.history.head
+        target = head.ancestor(turns)
+        if target is head:
+            self.say("There's nothing to undo yet - this is where the adventure began!")
+            return
+        taken_back = head.depth - target.depth
+        if taken_back == 1:
+            self.say(f"⏪ Undid '{head.command}'.")
+        else:
+            first = head.ancestor(taken_back - 1)  # The earliest turn being taken back
+            self.say(f"⏪ Rewound {taken_back} turns, back to before '{first.command}'.")
+        self.rewind_to(target)
+        self.describe_current_location()
+    
+    def checkpoint(self):
+        """
+        The current point in history, to come back to later with rewind_to()
+        Checkpoints stay valid on any branch: playing on after rewinding starts
+        a new branch that shares every turn before it.
+        """
+        return self.history.head
+    
+    def rewind_to(self, turn):
+        """
+        Put the session back exactly as it was at a checkpoint
+        """
+        self.set_state(turn.location, turn.flags, self.history.move_to(turn))
+    
+    def what_if(self, commands):
+        """
+        Play commands on a branch of history, then come back to where Turbo really is
+        Saving, loading and quitting are refused on the branch, since they'd reach past it.
+        """
+        if self.imagining:
+            self.say("🔮 Turbo is already imagining - one 'what if' at a time!")
+            return
+        if not commands:
+            self.say("🔮 What if... what? Try something like 'what if kitchen; take cookie'.")
+            return
+        reality = self.checkpoint()
+        self.imagining = True
+        self.say("🔮 Turbo imagines what might happen...")
+        try:
+            for command in commands:
+                self.say(f"\n🔮 > {command}")  # Not the real prompt, so transcripts don't count it as typed
+                self.run_turn(command)
+                if not self.game_running:
+                    break
+        finally:
+            self.imagining = False
+            self.rewind_to(reality)
+        self.say("\n🔮 ...and snaps back to reality. Nothing really happened!")
+    
+    def game_loop(self, commands=None):
         """
         Main game loop - keeps Turbo's adventure running
-        This continues until the player quits or wins the game
-        """
-        while self.game_running:
-            # Check if we should trigger the final revelation
-            if (not self.revelation_triggered and 
-                self.player.size_realization_triggered and 
-                self.check_all_items_collected()):
-                self.trigger_final_revelation()
-            
-            # Get player input and process it
-            user_input = input("\n🐕 > ").strip().lower()
-            self.process_command(user_input)
+        This continues until the player quits, wins the game or runs out of commands
+        """
+        if commands is None:
+            commands = self.read_commands()
+        
+        for command in commands:
+            self.process_command(command)
+            if not self.game_running:
+                break
+    
+    def read_commands(self):
+        """
+        Yield commands typed at the terminal until input runs out
+        """
+        while True:
+            try:
+                yield input("\n🐕 > ")
+            except EOFError:
+                return
     
     def process_command(self, command):
+        """
+        Run one full turn for a command and return everything it printed
+        The text is also written to the output sink in a single write
+        """
+        # Content may have been hot-reloaded since the last turn
+        if self.world is not self.data_loader.world:
+            self.adopt_world(self.data_loader.world)
+        
+        self.run_turn(" ".join(command.lower().split()))
+        return self.flush_output()
+    
+    def run_turn(self, command):
+        """
+        Play one already normalized command, leaving its text queued
+        """
+        kind = self.execute_command(command)
+        
+        # Check if we should trigger the final revelation
+        if (self.game_running and
+            not self.player.revelation_triggered and 
+            self.player.size_realization_triggered and 
+            self.check_all_items_collected()):
+            self.trigger_final_revelation()
+        
+        # Remember the turn for undo (if it changed anything)
+        if kind not in HISTORY_COMMANDS:
+            if self.history is None:
+                self.history = History(*self.history_state())
+            else:
+                self.history.record(command, *self.history_state())
+    
+    def execute_command(self, command):
         """
         Process Turbo's commands and execute appropriate actions
         This is where we interpret what the player wants to do
         
         Automatically shows location info after most actions to help players stay oriented
+        Returns the kind of command it was ("move", "action", "invalid", or the
+        global command's name) for metrics.
         """
         # Flag to track if we should show location info after this command
         show_location_after = True
         
+        # Save and load take an optional slot name, so they're matched by their first word
+        verb, _, slot = command.partition(" ")
+        if slot and verb in ("save", "load"):
+            self.save_game(slot) if verb == "save" else self.load_game(slot)
+            return verb
+        if slot and verb == "rewind":
+            if slot.isdigit() and int(slot) > 0:
+                self.rewind(int(slot))
+            else:
+                self.say("Tell Turbo how many turns to rewind, like 'rewind 3'.")
+            return verb
+        
+        # One indexed lookup covers global commands, exits, actions and aliases
+        match = self.locations[self.player.current_location].commands.resolve(command)
+        kind, target = match if match is not None else (None, None)
+        
         # Basic commands that work everywhere
-        if command in ["quit", "exit"]:
+        if kind == GLOBAL and target == "quit" and self.imagining:
+            self.say(IMAGINING_MESSAGE)
+            return target
+        
+        elif kind == GLOBAL and target == "quit":
             messages = self.story_config.get("messages", {})
             exit_msg = messages.get("exit_message", f"Thanks for playing!")
-            print(exit_msg)
+            self.say(exit_msg)
             self.game_running = False
-            return
+            return target
         
-        elif command == "help":
-            self.show_help()
-            show_location_after = False  # Help already shows what you need
-            
-        elif command in ["inventory", "i"]:
-            self.player.show_inventory(self.items)
-            show_location_after = False  # Inventory is separate from location
-            
-        elif command == "stats":
-            self.player.show_stats()
-            show_location_after = False  # Stats are separate from location
-            
-        elif command in ["look", "l"]:
-            self.describe_current_location()
-            show_location_after = False  # We just showed location info
-            
-        # Special command to examine all quest items together
-        elif command in ["examine all items", "examine items", "compare items", "look at all items"]:
-            self.examine_all_quest_items()
-            # After this major story moment, show where we are
+        elif kind == GLOBAL:
+            if target == "help":
+                self.show_help()
+            elif target == "inventory":
+                self.player.show_inventory(self.items)
+            elif target == "stats":
+                self.player.show_stats(self.locations, len(self.world.quest_items))
+            elif target == "look":
+                self.describe_current_location()
+            elif target == "save":
+                self.save_game("quicksave")
+            elif target == "load":
+                self.load_game("quicksave")
+            elif target in ("undo", "rewind"):
+                self.rewind(1)
             
+            # Special command to examine all quest items together
+            if target == "examine_items":
+                self.examine_all_quest_items()
+                # After this major story moment, show where we are
+            else:
+                show_location_after = False  # These already show what you need
+        
         # Handle movement commands - simplified to use location names
-        elif self.handle_movement_command(command):
+        elif kind == MOVE:
+            self.move_player(target)
             show_location_after = False  # Movement already shows new location
             
-        # Check special actions available in current location
-        elif self.handle_location_action(command):
+        # Special actions available in current location
+        elif kind == ACTION:
+            self.handle_special_action(target)
             # After performing an action, we'll show location info
-            pass
+        
+        # "go to <place>" walks the whole way to a room Turbo already knows
+        elif match is None and command.startswith(TRAVEL_PREFIXES):
+            kind = "travel"
+            # Arriving already shows the new location; a trip that can't start gets the reminder
+            show_location_after = self.travel_to(command.partition(" to ")[2]) is None
+        
+        # "what if ..." plays commands out and then puts everything back the way it was
+        elif match is None and command.startswith(WHAT_IF_PREFIX):
+            kind = "what_if"
+            self.what_if([part.strip() for part in command[len(WHAT_IF_PREFIX):].split(";") if part.strip()])
+            show_location_after = False
             
         else:
             # Command not recognized - give helpful feedback
             messages = self.story_config.get("messages", {})
             invalid_msg = messages.get("invalid_command", "You tilt your head, confused.")
-            print(invalid_msg)
+            self.say(invalid_msg)
             show_location_after = False  # We'll show help instead
             
+            # Point out what they probably meant before listing everything
+            suggestions = self.locations[self.player.current_location].commands.suggest(command)
+            if suggestions:
+                self.say("🤔 Did you mean: " + ", ".join(f"'{phrase}'" for phrase in suggestions) + "?")
+            
             # Show available options to help the player
             self.show_current_options()
         
         # Show location info after most actions to keep player oriented
         if show_location_after and self.game_running:
             self.show_quick_location_reminder()
-    
-    def handle_movement_command(self, command):
-        """
-        Handle movement between locations
-        Returns True if the command was a valid movement, False otherwise
-        """
-        current_loc = self.locations[self.player.current_location]
-        exits = current_loc.get("exits", {})
-        
-        # Check if command matches any exit destination
-        for exit_key, destination in exits.items():
-            if command == exit_key or command == destination:
-                self.move_player(destination)
-                return True
-        return False
-    
-    def handle_location_action(self, command):
-        """
-        Handle special actions available in the current location
-        Returns True if the command was a valid action, False otherwise
-        """
-        current_loc = self.locations[self.player.current_location]
-        actions = current_loc.get("actions", {})
         
-        if command in actions:
-            action_id = actions[command]
-            self.handle_special_action(action_id)
-            return True
-        return False
+        return target if kind == GLOBAL else kind or "invalid"
     
     def show_current_options(self):
         """
         Show what the player can currently do - used when they enter invalid commands
         This helps players understand their options without being overwhelming
         """
-        current_loc = self.locations[self.player.current_location]
-        actions = current_loc.get("actions", {})
-        exits = current_loc.get("exits", {})
-        
-        print("\n💡 You can try:")
-        
-        # Show available actions first (most important)
-        if actions:
-            for action in actions.keys():
-                print(f"  - {action}")
-        
-        # Show movement options
-        if exits:
-            print("  Or go to:")
-            for exit_name in exits.keys():
-                print(f"  - {exit_name}")
-        
-        # Show basic commands
-        print("  Other commands: 'help', 'inventory', 'look', 'stats'")
-        
-        # If player has all quest items but hasn't realized the size significance, give a hint
-        if (self.check_all_items_collected() and 
-            not self.player.size_realization_triggered):
-            print("\n🎯 QUEST UPDATE: You have all three special items!")
-            print("💡 HINT: Try 'examine all items' to understand what they have in common.")
-        # If player has size realization but hasn't triggered final revelation
-        elif (self.player.size_realization_triggered and 
-              not self.revelation_triggered):
-            print("\n🎯 QUEST PHASE 2: Ready for Maxwell's final revelation!")
-            print("💫 Move to any location or use 'look' to discover the truth!")
+        self.say(self.renderer.current_options(self.player.current_location, self.quest_phase()))
     
     def show_quick_location_reminder(self):
         """
         Show a brief reminder of where Turbo is and what he can do
         This appears after actions to keep players oriented without being too verbose
         """
-        location_id = self.player.current_location
-        location = self.locations[location_id]
-        
-        print(f"\n📍 Currently in: {location['name']}")
-        
-        # Show available actions in a compact format
-        actions = location.get("actions", {})
-        if actions:
-            actions_list = list(actions.keys())
-            if len(actions_list) <= 3:
-                # If few actions, show them all
-                print(f"🎯 Can do: {', '.join(actions_list)}")
-            else:
-                # If many actions, show first few and indicate there are more
-                print(f"🎯 Can do: {', '.join(actions_list[:3])}, and more ('look' to see all)")
-        
-        # Show available exits in a compact format
-        exits = location.get("exits", {})
-        if exits:
-            exits_list = list(exits.keys())
-            print(f"🚪 Can go to: {', '.join(exits_list)}")
-        
-        # Show quest progress if relevant
-        if self.player.quest_items_found > 0:
-            if not self.player.size_realization_triggered:
-                print(f"🎾 Quest Phase 1: {self.player.quest_items_found}/3 special items found")
-            elif not self.revelation_triggered:
-                print(f"🎾 Quest Phase 2: Understanding achieved, final revelation pending")
-            else:
-                print(f"🎉 Quest Complete: Maxwell's wonderful secret revealed!")
+        self.say(self.renderer.reminder(self.player.current_location, self.quest_phase(),
+                                        self.player.quest_items_found))
+    
+    def quest_phase(self):
+        """
+        Where Turbo is in the story - decides which hints the room views show
+        """
+        player = self.player
+        if player.revelation_triggered:
+            return render.COMPLETE
+        if player.size_realization_triggered:
+            return render.UNDERSTOOD
+        if self.check_all_items_collected():
+            return render.ALL_ITEMS
+        return render.SEARCHING
     
     def examine_all_quest_items(self):
         """
         Allows Turbo to examine all quest items together
         This triggers the size realization - the intermediate step before the final revelation!
         """
-        quest_items = ["child_mtb_helmet", "child_mtb_gloves", "small_mtb_bike"]
-        
         # Check if player has all quest items
-        if not all(self.player.has_item(item) for item in quest_items):
-            print("You don't have all the special items yet to compare them properly.")
-            print("Keep following Maxwell's guidance!")
+        if not self.world.quest_items:
+            self.say(render.NO_QUEST_ITEMS)
+            return
+        if not self.check_all_items_collected():
+            self.say(render.MISSING_ITEMS)
             return
         
         # If already triggered, just show a brief description
         if self.player.size_realization_triggered:
-            print("You look at the three items together again:")
-            print("The colorful helmet, the adventure gloves, and the beautiful bike.")
-            print("Now you understand - they're all designed for someone special...")
-            print("Maxwell's plan is becoming clearer!")
+            self.say(render.REALIZATION_AGAIN)
             return
         
         # Trigger the size realization scene
-        print("\n" + "="*50)
-        print("🧠 MOMENT OF UNDERSTANDING 🧠")
-        print("="*50)
-        
-        print("\nYou gather all three special items together and examine them carefully...")
-        print("The colorful helmet with its protective padding...")
-        print("The adventure gloves with their sturdy grip...")
-        print("The beautiful bike, perfectly crafted and ready for fun...")
-        print("\nYou tilt your head as you study each item more closely.")
-        print("Wait a minute... something's becoming clear about these items...")
-        print("\nAs you look at them all together, a pattern emerges.")
-        print("They're not just random adventure gear...")
-        print("They all seem to be made for the same person!")
-        print("But who in your family would need ALL of these things?")
-        print("\nYour ears perk up with growing excitement...")
-        print("These items aren't meant for any of the adult humans you know...")
-        print("They're all perfectly sized for someone much smaller!")
-        print("Someone who doesn't live in your house yet...")
-        print("\nYour tail starts wagging as understanding dawns.")
-        print("Maxwell appears beside you, purring softly, his eyes twinkling")
-        print("with approval. You're getting closer to understanding his secret!")
-        
-        print("\n💡 You're starting to understand Maxwell's mysterious quest!")
-        print("But there's still one more piece to the puzzle...")
-        print("What does this all MEAN for your family?")
-        print("="*50)
+        self.say(render.SIZE_REALIZATION)
         
         # Mark the size realization as triggered
         self.player.size_realization_triggered = True
         
-        print("\n🎯 QUEST PROGRESS: You've unlocked the next phase!")
-        print("💭 Now that you understand these items have a special purpose,")
-        print("   you need to discover WHY Maxwell wanted you to find them.")
-        print("\n🎮 NEXT STEP: Visit any location or use 'look' to trigger Maxwell's")
-        print("   final revelation about what these items really mean!")
+        self.say(render.NEXT_PHASE)
     
     def move_player(self, new_location):
         """
         Move Turbo to a new location
         Updates player position and shows the new area description
         """
-        if new_location in self.locations:
-            self.player.current_location = new_location
-            
-            # Add to discovered locations if not already visited
-            if new_location not in self.player.discovered_locations:
-                self.player.discovered_locations.append(new_location)
-            
-            location_name = self.locations[new_location]['name']
-            print(f"\n🐕 You move to the {location_name}...")
-            self.describe_current_location()
-        else:
-            print(f"Error: Location '{new_location}' not found!")
+        self.player.current_location = new_location
+        
+        # Add to discovered locations
+        self.player.discover(new_location)
+        
+        location_name = self.locations[new_location].name
+        self.say(f"\n🐕 You move to the {location_name}...")
+        self.describe_current_location()
+    
+    def travel_to(self, place):
+        """
+        Walk Turbo along the shortest route to a room he has already found
+        The route only passes through rooms he knows, each counting as visited.
+        Returns the destination's key, or None if Turbo couldn't go there.
+        """
+        navigator = navigation.navigator_for(self.world)
+        player = self.player
+        known = player.discovered_locations | player.visited_locations
+        destination = navigator.find(place, known)
+        if destination is None:
+            self.say(f"🤔 Turbo doesn't know a place called '{place}'.")
+            return None
+        name = self.locations[destination].name
+        if destination == player.current_location:
+            self.say(f"You're already in the {name}!")
+            return None
+        if not known >> destination & 1:
+            self.say(f"🐾 Turbo hasn't found the way to the {name} yet. Keep exploring!")
+            return None
+        route = navigator.route(player.current_location, destination, known)
+        if route is None:
+            self.say(f"🚪 There's no way to get to the {name} from here.")
+            return None
+        
+        # Trot through the rooms on the way, then arrive like any other move
+        for location_id in route[:-1]:
+            player.discover(location_id)
+            player.mark_visited(location_id)
+            self.say(f"🐾 You trot through the {self.locations[location_id].name}...")
+        self.move_player(destination)
+        return self.locations[destination].key
     
     def describe_current_location(self):
         """
@@ -463,145 +1651,87 @@ class GameEngine:
         Uses first-visit description for new areas, regular description for revisits
         """
         location_id = self.player.current_location
-        location = self.locations[location_id]
         
-        print(f"\n--- 🏠 {location['name']} ---")
+        # Use the first-visit description for rooms this game hasn't seen yet
+        visited = self.locations[location_id].visited or self.player.has_visited(location_id)
+        self.say(self.renderer.room(location_id, bool(visited), self.quest_phase()))
         
-        # Show first visit description if available and not visited before
-        if not location.get("visited", False) and "first_visit_description" in location:
-            print(location["first_visit_description"])
-        else:
-            print(location["description"])
-        
-        # Show available actions (simplified and clear)
-        actions = location.get("actions", {})
-        if actions:
-            print("\n🎯 You can:")
-            for action in actions:
-                print(f"  - {action}")
-        
-        # Show available exits
-        exits = location.get("exits", {})
-        if exits:
-            print("\n🚪 You can go to:")
-            for direction in exits:
-                print(f"  - {direction}")
-        
-        # Add quest progress hints based on current phase
-        if (self.check_all_items_collected() and 
-            not self.player.size_realization_triggered):
-            print("\n🎯 QUEST PHASE 1: You have all three special items!")
-            print("💭 Try 'examine all items' to understand their significance.")
-        elif (self.player.size_realization_triggered and 
-              not self.revelation_triggered):
-            print("\n🎯 QUEST PHASE 2: Maxwell's final revelation awaits!")
-            print("💫 Continue exploring to discover the wonderful truth!")
-        
-        # Mark this location as visited
-        location["visited"] = True
+        # Mark this location as visited (for this game only - the world is shared)
+        self.player.mark_visited(location_id)
     
     def handle_special_action(self, action_id):
         """
         Handle special actions defined in the story JSON
         This is where the main story events happen
         """
-        special_actions = self.story_config.get("special_actions", {})
-        
-        if action_id not in special_actions:
-            print(f"Error: Action '{action_id}' not found!")
-            return
-        
-        action = special_actions[action_id]
+        action = self.actions[action_id]
         
         # Check if this action was already completed (prevents repetition)
-        if action_id in self.player.completed_actions:
-            repeat_message = action.get("repeat_message", "You've already done that.")
-            print(repeat_message)
+        if self.player.has_completed(action_id):
+            self.say(action.repeat_message)
             return
         
         # Check if Turbo has the required items for this action
-        requirements = action.get("requirements", [])
-        for req in requirements:
-            if req.get("type") == "has_item":
-                required_item = req.get("item")
-                if not self.player.has_item(required_item):
-                    req_message = req.get("message", f"You need {required_item} to do that.")
-                    print(req_message)
-                    return
+        if not self.requirements_met(action):
+            return
         
         # Show what happens when Turbo performs this action
-        print(action.get("description", "Something happens..."))
+        self.say(action.description)
         
         # Apply the effects of this action (give items, trigger events, etc.)
-        effects = action.get("effects", [])
-        for effect in effects:
+        for effect in action.effects:
             self.apply_effect(effect)
         
         # Mark action as completed if it shouldn't be repeated
-        if action.get("repeatable", False) == False:
-            self.player.completed_actions.append(action_id)
+        if not action.repeatable:
+            self.player.complete_action(action_id)
+    
+    def requirements_met(self, action):
+        """
+        Check a special action's requirements, explaining the first one that isn't met
+        """
+        message = failed_requirement(action, self.player)
+        if message is not None:
+            self.say(message)
+            return False
+        return True
     
     def apply_effect(self, effect):
         """
         Apply an effect from a special action
-        Effects can give items or trigger story events
+        Effects can give or take items or trigger story events
         """
-        effect_type = effect.get("type")
-        
-        if effect_type == "give_item":
-            item_id = effect.get("item")
-            if item_id:
-                self.player.add_item(item_id, self.items)
-        
-        elif effect_type == "trigger_revelation":
-            # This effect prepares for the final revelation scene
-            # But now we require the size realization first!
-            if self.player.size_realization_triggered:
-                self.revelation_triggered = True
-            else:
-                print("You sense that Maxwell's quest is almost complete...")
-                print("But you feel like you need to understand something about these items first.")
-        
-        elif effect_type == "win_game":
-            self.game_won = True
-            self.game_running = False
+        EFFECTS[effect.op](self, effect)
+    
+    def available_actions(self):
+        """
+        The commands for every action Turbo can do in his current room right now
+        """
+        return action_index_for(self.world).available(self.player.current_location, self.player)
     
     def check_all_items_collected(self):
         """
-        Check if Turbo has found all three quest items
+        Check if Turbo has found every quest item
         This is used for both the size realization and final revelation
+        
+        The player keeps a running count of quest items, so this is a single comparison.
+        A world without quest items never counts as collected, so its story can't jump ahead.
         """
-        required_items = ["child_mtb_helmet", "child_mtb_gloves", "small_mtb_bike"]
-        return all(self.player.has_item(item) for item in required_items)
+        total = len(self.world.quest_items)
+        return total > 0 and self.player.quest_items_found == total
     
     def trigger_final_revelation(self):
         """
         Trigger the final revelation scene - the heart of the story!
         This is where Turbo realizes what Maxwell has been trying to tell him
         """
-        if not self.revelation_triggered:
-            print("\n" + "="*60)
-            print("🎉 THE WONDERFUL REVELATION! 🎉")
-            print("="*60)
-            
-            print("\nMaxwell's mysterious behavior suddenly makes perfect sense!")
-            print("You sit quietly, thinking about the special items...")
-            print("Helmet... gloves... bike... all perfectly sized for someone small...")
-            print("\nSuddenly, your tail starts wagging uncontrollably!")
-            print("\n🍼 A NEW LITTLE FAMILY MEMBER IS COMING! 🍼")
-            print("\nA tiny human who will grow up to use these adventure items!")
-            print("\nMaxwell appears beside you, purring loudly.")
-            print("His feline intuition knew this wonderful secret all along!")
-            print("\nYou spin in a happy circle, barking with joy!")
-            print("A new baby is coming to your family!")
-            print("="*60)
+        if not self.player.revelation_triggered:
+            self.say(render.REVELATION)
             
-            self.revelation_triggered = True
-            self.game_won = True
+            self.player.revelation_triggered = True
+            self.player.game_won = True
             
-            print("\n🎾 Congratulations! You've solved Maxwell's mystery!")
-            print("Thanks for playing Turbo's Quest!")
-            print("\nType 'quit' to end the adventure.")
+            self.say(render.VICTORY)
     
     def show_help(self):
         """
@@ -614,6 +1744,10 @@ class GameEngine:
             "Follow Maxwell's guidance and explore each location!",
             "Type the action you want to take or the place you want to go.",
             "Use 'help', 'look', 'inventory', 'stats', or 'quit'.",
+            "Use 'save' or 'load' (optionally with a slot name) to keep your progress.",
+            "Use 'go to <place>' to walk straight back to anywhere you've been.",
+            "Use 'undo' or 'rewind <turns>' to take moves back, and 'what if <command>'",
+            "to see what would happen without really doing it.",
             "",
             "Special commands:",
             "- 'examine all items' - Look at your quest items together",
@@ -625,7 +1759,7 @@ class GameEngine:
         ])
         
         for line in help_lines:
-            print(line)
+            self.say(line)
 
 
 def main():
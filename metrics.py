@@ -0,0 +1,230 @@
+"""
+Turbo's Quest - Metrics
+Opt-in timings and counters for everything that happens inside a turn
+
+Instrumenting an engine moves that one instance onto a subclass whose hot
+methods are timed, so an engine without metrics runs exactly the same code
+it always did - there's not even an "is it enabled?" check left behind. One Metrics object can be
+shared by many sessions to see where time goes across a whole server.
+
+    metrics = engine.enable_metrics()
+    ...
+    print(metrics.prometheus())
+"""
+
+import time
+
+
+# What each timed metric measures, and the name of the label it's broken down by
+TIMINGS = {
+    "turn": ("Whole turns in process_command, by command kind", "kind"),
+    "command": ("Resolving and running a command, by command kind", "kind"),
+    "move": ("Moving between rooms, by destination", "destination"),
+    "travel": ("Multi-room 'go to' trips, by destination", "destination"),
+    "action": ("Special actions, by action id", "action"),
+    "requirements": ("Checking a special action's requirements, by action id", "action"),
+    "effect": ("Applying special action effects, by effect type", "effect"),
+    "render": ("Building and writing output, by view", "view"),
+}
+
+# Counters that aren't just the number of timings
+COUNTERS = {
+    "invalid_commands": ("Commands that didn't match anything, by what was typed", "command"),
+}
+
+# Distinct invalid commands remembered before the rest are lumped together
+MAX_INVALID_LABELS = 100
+
+# Prefix for every metric in the Prometheus dump
+PROMETHEUS_PREFIX = "turbo_"
+
+
+class Metrics:
+    """
+    Timings and counters collected from one or more instrumented engines
+    """
+    def __init__(self):
+        self.timings = {}  # (metric, label) -> [count, total ns, max ns]
+        self.counters = {}  # (counter, label) -> count
+        self.invalid_labels = 0  # Distinct labels under "invalid_commands", kept so counting stays O(1)
+        self.last_kind = None  # Kind of the command being run, so the whole turn can be labelled
+        self.clock = time.perf_counter_ns
+
+    def observe(self, metric, label, nanoseconds):
+        """
+        Record one timing
+        """
+        timing = self.timings.get((metric, label))
+        if timing is None:
+            self.timings[(metric, label)] = [1, nanoseconds, nanoseconds]
+        else:
+            timing[0] += 1
+            timing[1] += nanoseconds
+            if nanoseconds > timing[2]:
+                timing[2] = nanoseconds
+
+    def count(self, counter, label):
+        """
+        Add one to a counter
+        """
+        key = (counter, label)
+        self.counters[key] = self.counters.get(key, 0) + 1
+
+    def count_invalid(self, command):
+        """
+        Count a command that fell through to the 'invalid command' path
+        Only the first MAX_INVALID_LABELS distinct phrases get their own label.
+        """
+        key = ("invalid_commands", command)
+        if key not in self.counters:
+            if self.invalid_labels >= MAX_INVALID_LABELS:
+                key = ("invalid_commands", "(other)")
+            if key not in self.counters:
+                self.invalid_labels += 1
+        self.counters[key] = self.counters.get(key, 0) + 1
+
+    def reset(self):
+        """
+        Forget everything recorded so far
+        """
+        self.timings.clear()
+        self.counters.clear()
+        self.invalid_labels = 0
+
+    def snapshot(self):
+        """
+        Everything recorded so far as plain nested dicts
+        {"timings": {metric: {label: {count, total_ns, mean_ns, max_ns}}},
+         "counters": {counter: {label: count}}}
+        """
+        timings = {}
+        for (metric, label), (count, total, longest) in self.timings.items():
+            timings.setdefault(metric, {})[label] = {
+                "count": count,
+                "total_ns": total,
+                "mean_ns": total / count,
+                "max_ns": longest,
+            }
+        counters = {}
+        for (counter, label), count in self.counters.items():
+            counters.setdefault(counter, {})[label] = count
+        return {"timings": timings, "counters": counters}
+
+    def prometheus(self):
+        """
+        Everything recorded so far in the Prometheus text exposition format
+        Timings become summaries (seconds) plus a gauge for the slowest call.
+        """
+        lines = []
+        snapshot = self.snapshot()
+        for metric, (help_text, label_name) in TIMINGS.items():
+            series = snapshot["timings"].get(metric)
+            if not series:
+                continue
+            name = f"{PROMETHEUS_PREFIX}{metric}_seconds"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for label, timing in sorted(series.items()):
+                selector = f'{{{label_name}="{escape_label(label)}"}}'
+                lines.append(f"{name}_count{selector} {timing['count']}")
+                lines.append(f"{name}_sum{selector} {timing['total_ns'] / 1e9:.9f}")
+            lines.append(f"# HELP {name}_max Slowest single call")
+            lines.append(f"# TYPE {name}_max gauge")
+            for label, timing in sorted(series.items()):
+                lines.append(f'{name}_max{{{label_name}="{escape_label(label)}"}} {timing["max_ns"] / 1e9:.9f}')
+        for counter, (help_text, label_name) in COUNTERS.items():
+            series = snapshot["counters"].get(counter)
+            if not series:
+                continue
+            name = f"{PROMETHEUS_PREFIX}{counter}_total"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for label, count in sorted(series.items()):
+                lines.append(f'{name}{{{label_name}="{escape_label(label)}"}} {count}')
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def escape_label(value):
+    """
+    Escape a label value for the Prometheus text format
+    """
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def label_command(engine, metrics, args, result):
+    """
+    Label a command by its kind, remembering it for the turn and counting misses
+    Commands played inside a 'what if' don't label the turn - the 'what if' itself does.
+    """
+    if not engine.imagining:
+        metrics.last_kind = result
+    if result == "invalid":
+        metrics.count_invalid(args[0])
+    return result
+
+
+# How each instrumented method's timing is labelled: method -> (metric, label(engine, metrics, args, result))
+HOOKS = {
+    "process_command": ("turn", lambda engine, metrics, args, result: metrics.last_kind),
+    "execute_command": ("command", label_command),
+    "move_player": ("move", lambda engine, metrics, args, result: engine.locations[args[0]].key),
+    "travel_to": ("travel", lambda engine, metrics, args, result: result or "(nowhere)"),
+    "handle_special_action": ("action", lambda engine, metrics, args, result: engine.actions[args[0]].key),
+    "requirements_met": ("requirements", lambda engine, metrics, args, result: args[0].key),
+    "apply_effect": ("effect", lambda engine, metrics, args, result: args[0].type),
+    "describe_current_location": ("render", lambda engine, metrics, args, result: "describe"),
+    "show_quick_location_reminder": ("render", lambda engine, metrics, args, result: "reminder"),
+    "show_current_options": ("render", lambda engine, metrics, args, result: "options"),
+    "flush_output": ("render", lambda engine, metrics, args, result: "flush"),
+}
+
+
+# Instrumented subclasses already built, by the engine class they wrap
+INSTRUMENTED_CLASSES = {}
+
+
+def timed(method, metric, label):
+    """
+    Wrap an engine method so every call is timed into the session's metrics
+    """
+    def wrapper(self, *args):
+        metrics = self.metrics
+        started = metrics.clock()
+        result = method(self, *args)
+        metrics.observe(metric, label(self, metrics, args, result), metrics.clock() - started)
+        return result
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+def instrumented_class(engine_class):
+    """
+    A subclass of engine_class whose hot methods are timed
+    """
+    subclass = INSTRUMENTED_CLASSES.get(engine_class)
+    if subclass is None:
+        methods = {method_name: timed(getattr(engine_class, method_name), metric, label)
+                   for method_name, (metric, label) in HOOKS.items()}
+        methods["uninstrumented_class"] = engine_class
+        subclass = type(f"Instrumented{engine_class.__name__}", (engine_class,), methods)
+        INSTRUMENTED_CLASSES[engine_class] = subclass
+    return subclass
+
+
+def instrument(engine):
+    """
+    Start timing an engine's hot methods into engine.metrics
+    Swapping the instance's class (rather than patching methods onto it) leaves
+    the instance itself untouched, so switching metrics off again costs nothing.
+    """
+    if not hasattr(engine, "uninstrumented_class"):
+        engine.__class__ = instrumented_class(type(engine))
+
+
+def uninstrument(engine):
+    """
+    Put an engine back on its original, untimed class
+    """
+    if hasattr(engine, "uninstrumented_class"):
+        engine.__class__ = engine.uninstrumented_class
@@ -0,0 +1,369 @@
+"""
+Turbo's Quest - Navigation
+Shortest routes across the house, so "go to balcony" works from anywhere Turbo has been
+
+The exits of every room are compiled once into an adjacency table (and its
+reverse). Routes come from shortest-path trees: one breadth-first search
+backwards from a destination gives the next hop towards it from every room
+at once. Small worlds work out the tree for every room up front (all-pairs
+next hops); big ones build trees as destinations are asked for and keep the
+most recently used ones. Following a route is then one array lookup per room.
+
+Trips only ever pass through rooms Turbo already knows: when the shortest
+way crosses one he hasn't found, the route is searched again through the
+ones he has, so no room's first visit is skipped.
+
+Lazy worlds (see DataLoader's lazy option) get a LazyNavigator instead,
+since building the whole graph would mean reading every room: it reads exits
+straight from the rooms' raw JSON, and only searches the rooms Turbo knows.
+
+A world never changes once compiled, so each world gets its own navigator
+(see derived.py).
+When content is hot-reloaded, the new world's navigator starts from the old
+one: only the rooms that changed are re-read, and every cached tree the
+change can't have affected is kept.
+"""
+
+from array import array
+from collections import OrderedDict
+
+from derived import LRUCache, WorldCache, WorldHelper, room_cache_size
+from patching import changed_slots, flattened, patched
+
+
+# Worlds with up to this many rooms get every route worked out up front
+ALL_PAIRS_LIMIT = 256
+
+# Shortest-path trees kept for bigger worlds (each is two ints per room)
+TREE_CACHE_SIZE = 64
+
+UNREACHABLE = -1
+
+
+class Navigator(WorldHelper):
+    """
+    Routes between the rooms of one compiled world
+    """
+    def __init__(self, world):
+        super().__init__(world)
+        self.exits = None  # Location id -> destination ids, in exit order (None until built)
+        self.incoming = None  # Location id -> ids of the rooms with an exit leading here
+        self.places = None  # Room name, key or key with spaces (lower case) -> ids of the rooms called that, lowest first
+        self.trees = OrderedDict()  # Destination id -> (next hops, distances), least recently used first
+        self.capacity = TREE_CACHE_SIZE
+        self.hits = 0
+        self.misses = 0
+
+    def build(self):
+        """
+        Compile the exits graph and the place names (on first use)
+        """
+        if self.exits is not None:
+            return self
+        locations = self.world.locations
+        self.exits = [row_for(location) for location in locations]
+        self.incoming = [[] for _ in range(len(self.exits))]
+        for room, destinations in enumerate(self.exits):
+            for destination in destinations:
+                self.incoming[destination].append(room)
+        self.places = places_for(locations)
+        if len(self.exits) <= ALL_PAIRS_LIMIT:
+            self.capacity = len(self.exits)
+            for location_id, location in enumerate(locations):
+                if location is not None:
+                    self.tree(location_id)
+        return self
+
+    def find(self, name, known=0):
+        """
+        The location id for a place the player typed, or None
+        `known` (the rooms Turbo knows, as bits) only narrows names down in lazy worlds.
+        """
+        rooms = self.build().places.get(name)
+        return rooms[0] if rooms else None
+
+    def tree(self, destination):
+        """
+        Next hops and distances towards `destination` from every room
+        """
+        trees = self.trees
+        tree = trees.get(destination)
+        if tree is not None:
+            trees.move_to_end(destination)
+            self.hits += 1
+            return tree
+        self.misses += 1
+
+        size = len(self.exits)
+        next_hops = array("i", [UNREACHABLE]) * size
+        distances = array("i", [UNREACHABLE]) * size
+        next_hops[destination] = destination
+        distances[destination] = 0
+        # A search reads every room's incoming exits anyway, so a patched table is flattened first
+        incoming = self.incoming = flattened(self.incoming)
+        frontier = [destination]
+        distance = 0
+        while frontier:
+            distance += 1
+            following = []
+            for room in frontier:
+                for source in incoming[room]:
+                    if distances[source] < 0:
+                        distances[source] = distance
+                        next_hops[source] = room
+                        following.append(source)
+            frontier = following
+
+        tree = trees[destination] = (next_hops, distances)
+        if len(trees) > self.capacity:
+            trees.popitem(last=False)
+        return tree
+
+    def route(self, start, destination, known=None):
+        """
+        Every room on the shortest way from `start` to `destination` through known rooms (not counting start)
+        `known` is a bitset of the rooms Turbo knows (None allows every room).
+        Returns None if there's no way there.
+        """
+        next_hops, distances = self.build().tree(destination)
+        if distances[start] < 0:
+            return None
+        path = []
+        room = start
+        while room != destination:
+            room = next_hops[room]
+            path.append(room)
+        if known is None or all(known >> room & 1 for room in path[:-1]):
+            return path
+        # The shortest way crosses a room Turbo hasn't found, so look again through the ones he has
+        return search_route(self.exits.__getitem__, start, destination, known)
+
+    def derive(self, world):
+        """
+        A navigator for a newer version of this world, keeping every route the changes didn't affect
+        Rooms are compared by identity: patching a world only replaces the records it recompiled,
+        and every table is patched copy-on-write (see patching.py), so this costs as much as the change.
+        """
+        old_locations, new_locations = self.world.locations, world.locations
+        if self.exits is None or room_cache_size(self.world) is not None or room_cache_size(world) is not None:
+            return new_navigator(world)  # Lazy worlds read their rooms on demand, so start afresh
+        navigator = Navigator(world)
+
+        changed = [location_id for location_id in changed_slots(old_locations, new_locations)
+                   if location_id >= len(old_locations) or new_locations[location_id] is not old_locations[location_id]]
+        size = len(new_locations)
+        exits, incoming, places = patched(self.exits), patched(self.incoming), patched(self.places)
+        while len(exits) < size:
+            exits.append(())
+            incoming.append([])
+        copied = set()  # Incoming lists already copied, so the old navigator's are never touched
+        old_rows = {}
+        for room in changed:
+            old_location = old_locations[room] if room < len(old_locations) else None
+            for name in names_for(old_location):
+                places[name] = tuple(other for other in places[name] if other != room)
+                if not places[name]:
+                    del places[name]
+            for name in names_for(new_locations[room]):
+                places[name] = tuple(sorted({*places.get(name, ()), room}))
+            old_rows[room] = exits[room]
+            exits[room] = row_for(new_locations[room])
+            for destination in set(old_rows[room]).symmetric_difference(exits[room]):
+                if destination not in copied:
+                    incoming[destination] = list(incoming[destination])
+                    copied.add(destination)
+                if destination in old_rows[room]:
+                    incoming[destination].remove(room)
+                else:
+                    incoming[destination].append(room)
+        navigator.exits = exits
+        navigator.incoming = incoming
+        navigator.places = places
+
+        if size <= ALL_PAIRS_LIMIT:
+            navigator.capacity = size
+        for destination, tree in self.trees.items():
+            if new_locations[destination] is None:
+                continue
+            tree = still_valid(tree, changed, exits, destination, size)
+            if tree is not None:
+                navigator.trees[destination] = tree
+        if size <= ALL_PAIRS_LIMIT:
+            for location_id, location in enumerate(new_locations):
+                if location is not None:
+                    navigator.tree(location_id)
+        return navigator
+
+
+class LazyNavigator(WorldHelper):
+    """
+    Routes between the rooms of a lazy world, read from raw JSON without compiling any rooms
+    Routes are searched forwards from Turbo's room through the rooms he knows
+    (plus the destination), so a trip costs as many rooms as he's found
+    rather than as many as the world has. Place names are looked for the same way.
+    """
+    def __init__(self, world):
+        super().__init__(world)
+        self.rows = LRUCache(room_cache_size(world))  # Location id -> (lower case name, destination ids)
+
+    def row(self, location_id):
+        """
+        A room's name and the distinct destinations of its exits, straight from its JSON
+        """
+        row = self.rows.get(location_id)
+        if row is None:
+            world = self.world
+            locations = world.locations
+            data = locations.content[locations.keys[location_id]]
+            location_ids = world.location_ids
+            destinations = [location_ids.get(destination) for destination in data.get("exits", {}).values()]
+            row = self.rows[location_id] = (
+                data.get("name", "").lower(),
+                tuple(dict.fromkeys(destination for destination in destinations if destination is not None)),
+            )
+        return row
+
+    def find(self, name, known=0):
+        """
+        The location id for a place the player typed, or None
+        Keys are looked up directly; names only among the rooms in `known` (bits).
+        """
+        location_ids = self.world.location_ids
+        for key in (name, name.replace(" ", "_")):
+            location_id = location_ids.get(key)
+            if location_id is not None and self.world.locations.keys[location_id] is not None:
+                return location_id
+        for location_id in known_rooms(known):
+            if self.row(location_id)[0] == name:
+                return location_id
+        return None
+
+    def route(self, start, destination, known=None):
+        """
+        Every room on the shortest way from `start` to `destination` through known rooms (not counting start)
+        `known` is a bitset of the rooms Turbo knows (None allows every room).
+        Returns None if there's no way there.
+        """
+        return search_route(lambda room: self.row(room)[1], start, destination, known)
+
+
+def search_route(exits_of, start, destination, known):
+    """
+    Breadth-first route from `start` to `destination` through the rooms in `known` (bits, None for all)
+    `exits_of` gives a room's destination ids. Returns the rooms on the way
+    (not counting start), or None if there's no way there.
+    """
+    allowed = None if known is None else known | 1 << destination
+    previous = {start: start}
+    frontier = [start]
+    while frontier and destination not in previous:
+        following = []
+        for room in frontier:
+            for neighbour in exits_of(room):
+                if neighbour not in previous and (allowed is None or allowed >> neighbour & 1):
+                    previous[neighbour] = room
+                    following.append(neighbour)
+        frontier = following
+    if destination not in previous:
+        return None
+    path = []
+    room = destination
+    while room != start:
+        path.append(room)
+        room = previous[room]
+    path.reverse()
+    return path
+
+
+def known_rooms(bits):
+    """
+    The location ids set in a bitmask, lowest first
+    """
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+def row_for(location):
+    """
+    The distinct destinations of a room's exits, in exit order
+    """
+    if location is None:
+        return ()
+    return tuple(dict.fromkeys(location.exits.values()))
+
+
+def names_for(location):
+    """
+    Every way of naming a room for "go to" - its name, its key, and its key with spaces
+    """
+    if location is None:
+        return set()
+    return {location.name.lower(), location.key, location.key.replace("_", " ")}
+
+
+def places_for(locations):
+    """
+    The rooms each place name could mean, lowest id first
+    """
+    places = {}
+    for location in locations:
+        for name in names_for(location):
+            places.setdefault(name, []).append(location.id)
+    return {name: tuple(rooms) for name, rooms in places.items()}
+
+
+def still_valid(tree, changed, exits, destination, size):
+    """
+    A shortest-path tree carried over to changed exits, or None if it needs rebuilding
+    Every distance has to still be one more than the best of the room's
+    exits (with the old next hop still among them); if that holds for every
+    changed room, nothing else can have moved either.
+    """
+    next_hops, distances = tree
+    old_size = len(distances)
+    for room in changed:
+        if room == destination:
+            continue
+        best = UNREACHABLE
+        for neighbour in exits[room]:
+            distance = distances[neighbour] if neighbour < old_size else UNREACHABLE
+            if distance >= 0 and (best < 0 or distance + 1 < best):
+                best = distance + 1
+        current = distances[room] if room < old_size else UNREACHABLE
+        if best != current or (current > 0 and next_hops[room] not in exits[room]):
+            return None
+    if old_size < size:
+        next_hops = next_hops + array("i", [UNREACHABLE]) * (size - old_size)
+        distances = distances + array("i", [UNREACHABLE]) * (size - old_size)
+    return next_hops, distances
+
+
+def new_navigator(world):
+    """
+    A fresh navigator of the right kind for a world
+    """
+    if room_cache_size(world) is None:
+        return Navigator(world)
+    return LazyNavigator(world)
+
+
+# One navigator per live world, dropped along with the world
+NAVIGATORS = WorldCache(new_navigator)
+
+
+def navigator_for(world):
+    """
+    The shared Navigator for a world, created the first time it's needed
+    """
+    return NAVIGATORS(world)
+
+
+def carry_over(old_world, new_world):
+    """
+    Start the new world's navigator from the old one's, if routes were ever asked for
+    """
+    navigator = NAVIGATORS.get(old_world)
+    if isinstance(navigator, Navigator) and navigator.exits is not None:
+        NAVIGATORS[new_world] = navigator.derive(new_world)
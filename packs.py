@@ -0,0 +1,220 @@
+"""
+Turbo's Quest - Story Packs
+Hosts many variants of the story in one process, storing what they have in common only once
+
+A story pack is a complete data directory (locations.json, items.json and
+story.json): a translation, a seasonal edition, a copy with one room
+reworded. Loaded on their own, a hundred near-identical packs cost a hundred
+whole worlds. The registry still loads each pack with its own DataLoader,
+but then runs everything it loaded through a ContentPool shared by every
+pack: strings are interned, and any tuple, dict, loaded JSON object or
+compiled record (rooms, items, special actions, requirements, effects,
+command indexes) equal to one already pooled is swapped for that one. What
+each extra pack costs is then mostly what makes it different.
+
+This is safe because nothing in a loaded world changes once it's built: a
+hot reload compiles new records into new lists, and sessions keep their
+progress on their own Player.
+
+Sessions are routed to their pack by id:
+
+    registry = PackRegistry()
+    registry.load_directory("packs")  # Every subdirectory is a pack, named after it
+    print(registry.open("alice", "winter"))
+    print(registry.send("alice", "kitchen"))
+    print(registry.stats())
+"""
+
+import os
+import sys
+from types import MappingProxyType
+
+from commands import CommandIndex
+from main import DataLoader, GameEngine, Item, Location, SpecialAction
+from patching import flattened
+from rules import Effect, Requirement
+from sessionstore import release
+
+
+# Compiled records pooled slot by slot (their slots only hold pooled values)
+RECORD_TYPES = (Item, Location, SpecialAction, Requirement, Effect, CommandIndex)
+
+# Compared by value when pooling - everything else is compared by identity once it's been pooled
+SCALARS = (int, float)
+
+
+class PackError(Exception):
+    """
+    Raised when a story pack can't be loaded
+    """
+    pass
+
+
+class ContentPool:
+    """
+    One canonical copy of every distinct value seen, so equal content is only stored once
+    Keys are built from the identities of already pooled parts, so checking
+    a big structure never compares anything deeper than one level.
+    """
+    def __init__(self):
+        self.canonical = {}  # Structural key -> the shared copy
+        self.pooled = 0  # Values looked up
+        self.reused = 0  # ...that were already in the pool
+
+    def token(self, value):
+        """
+        What a pooled value contributes to its parent's key
+        """
+        kind = type(value)
+        if kind is str or kind in RECORD_TYPES:
+            return value  # Interned strings and records (equal only to themselves) compare in one step
+        if kind in SCALARS:
+            return (kind, value)  # The type keeps 1 and 1.0 apart
+        return id(value)  # Pooled, so equal values are the same object (and it stays alive)
+
+    def share(self, value):
+        """
+        The pooled copy of `value`, pooling everything inside it first
+        Records are pooled in place, so pass only records nothing else is using yet
+        (or ones that are pooled already).
+        """
+        kind = type(value)
+        if kind is str:
+            return sys.intern(value)
+        if kind in SCALARS or kind is bool or value is None:
+            return value
+        token = self.token
+        if kind is tuple:
+            value = tuple([self.share(item) for item in value])
+            key = (tuple, *map(token, value))
+        elif kind is list:
+            value = [self.share(item) for item in value]
+            key = (list, *map(token, value))
+        elif kind is dict:
+            value = {self.share(name): self.share(item) for name, item in value.items()}
+            key = (dict, *[part for name, item in value.items() for part in (token(name), token(item))])
+        elif kind is frozenset:
+            value = frozenset([self.share(item) for item in value])
+            key = (frozenset, frozenset(map(token, value)))
+        elif kind is MappingProxyType:
+            inner = self.share(dict(value))
+            key = (MappingProxyType, id(inner))
+            if key not in self.canonical:
+                value = MappingProxyType(inner)
+        elif kind in RECORD_TYPES:
+            for slot in kind.__slots__:
+                setattr(value, slot, self.share(getattr(value, slot)))
+            key = (kind, *[token(getattr(value, slot)) for slot in kind.__slots__])
+        else:
+            return value  # Nothing else appears in loaded worlds; leave it unshared
+        self.pooled += 1
+        canonical = self.canonical.setdefault(key, value)
+        if canonical is not value:
+            self.reused += 1
+        return canonical
+
+
+class PackRegistry:
+    """
+    Many story packs loaded side by side over one ContentPool, with sessions routed by pack id
+    """
+    def __init__(self):
+        self.pool = ContentPool()
+        self.packs = {}  # Pack id -> DataLoader
+        self.sessions = {}  # Session id -> (pack id, GameEngine)
+
+    def add(self, pack_id, data_directory):
+        """
+        Load a pack from a data directory and pool it with the others, returning its DataLoader
+        """
+        loader = DataLoader(data_directory, verbose=False)
+        if not loader.load_all_data():
+            raise PackError(f"Couldn't load story pack '{pack_id}' from {data_directory}")
+        self.pool_world(loader)
+        self.packs[pack_id] = loader
+        return loader
+
+    def load_directory(self, directory):
+        """
+        Add every subdirectory with a locations.json as a pack named after it, returning their ids
+        """
+        added = []
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if os.path.isfile(os.path.join(path, "locations.json")):
+                self.add(name, path)
+                added.append(name)
+        return added
+
+    def reload(self, pack_id):
+        """
+        Hot reload one pack (see DataLoader.reload) and pool whatever it recompiled
+        Packs must be reloaded through here rather than their DataLoader, which
+        would try to change content the other packs share.
+        """
+        loader = self.packs[pack_id]
+        # A reload adds to the world's referrer sets in place, so the pack gets its own copies first
+        loader.world.referrers = {target: set(sources) for target, sources in loader.world.referrers.items()}
+        report = loader.reload()
+        self.pool_world(loader)
+        return report
+
+    def pool_world(self, data_loader):
+        """
+        Swap a loader's content and compiled world for their pooled copies
+        """
+        share = self.pool.share
+        data_loader.locations = share(data_loader.locations)
+        data_loader.items = share(data_loader.items)
+        data_loader.story_config = share(data_loader.story_config)
+        world = data_loader.world
+        world.story_config = share(world.story_config)
+        for name in ("locations", "items", "actions", "location_ids", "item_ids", "action_ids",
+                     "quest_items", "issues"):
+            setattr(world, name, share(flattened(getattr(world, name))))  # Reloads may have patched them
+        # Frozen so nothing can add to a set another pack is using (reload() thaws them first)
+        world.referrers = share({target: frozenset(sources) for target, sources in world.referrers.items()})
+
+    def open(self, session_id, pack_id):
+        """
+        Start a new game in a pack for a session (replacing any earlier one), returning its opening text
+        Raises KeyError for a pack that isn't loaded.
+        """
+        engine = GameEngine(self.packs[pack_id], headless=True)
+        text = engine.new_game()
+        self.end(session_id)
+        self.sessions[session_id] = (pack_id, engine)
+        return text
+
+    def send(self, session_id, command):
+        """
+        Run one command in a session's pack
+        Raises KeyError for a session that was never opened.
+        """
+        return self.sessions[session_id][1].process_command(command)
+
+    def pack_of(self, session_id):
+        """
+        The id of the pack a session is playing
+        """
+        return self.sessions[session_id][0]
+
+    def end(self, session_id):
+        """
+        Forget a session
+        """
+        _, engine = self.sessions.pop(session_id, (None, None))
+        if engine is not None:
+            release(engine)
+
+    def stats(self):
+        """
+        Pack and session counts, and how much of the content the pool has shared
+        """
+        return {
+            "packs": len(self.packs),
+            "sessions": len(self.sessions),
+            "pooled": self.pool.pooled,
+            "reused": self.pool.reused,
+            "distinct": len(self.pool.canonical),
+        }
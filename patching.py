@@ -0,0 +1,167 @@
+"""
+Turbo's Quest - Patching
+Copy-on-write tables, so a hot reload costs as much as the change rather than the whole house
+
+Patching a world (see DataLoader.apply_changes) mustn't touch anything the
+old version still uses, but copying every record list and dict for each
+edit makes a one-room fix slower the bigger the house gets. Instead the new
+version gets a PatchedTable or PatchedMapping: the older version's table
+underneath, with only the slots that changed written on top. Patching a
+patched table again starts from the same base, so lookups never go more
+than one layer deep. Once enough slots have changed to make the layer
+a real cost, the table is flattened back into a plain list or dict.
+
+Small tables are simply copied, since that's as cheap as layering them
+and keeps lookups at full speed.
+"""
+
+from collections.abc import MutableMapping
+
+
+# Tables up to this many entries are copied outright when patched
+COPY_LIMIT = 1024
+
+# A patched table is flattened once more than 1/2**FLATTEN_SHIFT of its slots have changed
+FLATTEN_SHIFT = 4
+
+
+class PatchedTable:
+    """
+    A list-like table of records: a base list with some slots replaced (and maybe some appended)
+    """
+    __slots__ = ("base", "changes", "size")
+
+    def __init__(self, base, changes, size):
+        self.base = base  # The plain list underneath, never written to
+        self.changes = changes  # Record id -> record, for every slot written since the base
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, record_id):
+        changes = self.changes
+        if record_id in changes:
+            return changes[record_id]
+        if record_id >= self.size:
+            raise IndexError("table index out of range")
+        return self.base[record_id]
+
+    def __setitem__(self, record_id, record):
+        if record_id >= self.size:
+            raise IndexError("table assignment index out of range")
+        self.changes[record_id] = record
+
+    def append(self, record):
+        self.changes[self.size] = record
+        self.size += 1
+
+    def __iter__(self):
+        base, changes = self.base, self.changes
+        for record_id in range(self.size):
+            yield changes[record_id] if record_id in changes else base[record_id]
+
+
+class PatchedMapping(MutableMapping):
+    """
+    A dict-like mapping: a base dict with some keys replaced, added or removed
+    Keys come out in the same order a copied dict would give.
+    """
+    def __init__(self, base, changes, removed, size):
+        self.base = base  # The plain dict underneath, never written to
+        self.changes = changes  # Key -> value, for every key set since the base (in the order they were set)
+        self.removed = removed  # Base keys that were removed (or removed and set again, which moves them to the end)
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key):
+        changes = self.changes
+        if key in changes:
+            return changes[key]
+        if key in self.removed:
+            raise KeyError(key)
+        return self.base[key]
+
+    def __contains__(self, key):
+        return key in self.changes or (key in self.base and key not in self.removed)
+
+    def get(self, key, default=None):
+        changes = self.changes
+        if key in changes:
+            return changes[key]
+        if key in self.removed:
+            return default
+        return self.base.get(key, default)
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self.size += 1
+            if key in self.base:
+                self.removed.add(key)  # Set again after removal, so it now comes last like in a dict
+        self.changes[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.changes.pop(key, None)
+        if key in self.base:
+            self.removed.add(key)
+        self.size -= 1
+
+    def __iter__(self):
+        changes, removed = self.changes, self.removed
+        for key in self.base:
+            if key not in removed:
+                yield key
+        for key in changes:
+            if key not in self.base or key in removed:
+                yield key
+
+    def copy(self):
+        return patched(self)
+
+    def __repr__(self):
+        return f"PatchedMapping({dict(self)!r})"
+
+
+def patched(table):
+    """
+    A copy of a record list or dict to write the next version into, sharing everything that doesn't change
+    """
+    if isinstance(table, PatchedTable):
+        if len(table.changes) > table.size >> FLATTEN_SHIFT:
+            return list(table)
+        return PatchedTable(table.base, dict(table.changes), table.size)
+    if isinstance(table, PatchedMapping):
+        if len(table.changes) + len(table.removed) > len(table.base) >> FLATTEN_SHIFT:
+            return dict(table)
+        return PatchedMapping(table.base, dict(table.changes), set(table.removed), table.size)
+    if len(table) <= COPY_LIMIT:
+        return table.copy()
+    if isinstance(table, list):
+        return PatchedTable(table, {}, len(table))
+    return PatchedMapping(table, {}, set(), len(table))
+
+
+def changed_slots(old, new):
+    """
+    The record ids that can differ between two versions of a table (all of them unless one was patched from the other)
+    """
+    if new is old:
+        return ()
+    if isinstance(new, PatchedTable) and new.base is getattr(old, "base", old):
+        return sorted(new.changes)
+    return range(len(new))
+
+
+def flattened(table):
+    """
+    A plain list or dict with the same contents as a (possibly patched) table
+    """
+    if isinstance(table, PatchedTable):
+        return list(table)
+    if isinstance(table, PatchedMapping):
+        return dict(table)
+    return table
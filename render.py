@@ -0,0 +1,251 @@
+"""
+Turbo's Quest - Renderer
+Builds the text the game shows from precompiled templates, caching whole views
+
+Most turns end with the same room reminder the player saw last turn, so every
+room view is rendered once per (location, visited flag, quest phase) and then
+served straight from the cache. The long story scenes are joined into single
+blocks up front instead of being said one line at a time. Rendered blocks are
+plain strings that GameEngine.say() queues like any other line, so a turn is
+still sent with one write.
+
+A world never changes once compiled (hot reload builds a new one), so each
+world gets its own Renderer (see derived.py) and nothing ever needs
+invalidating. Lazy worlds keep only their most recently used views.
+"""
+
+from derived import LRUCache, WorldCache, WorldHelper, room_cache_size
+
+
+# Quest phases, in the order the story moves through them
+SEARCHING = 0  # Still looking for the special items
+ALL_ITEMS = 1  # Carrying every quest item, but hasn't examined them together
+UNDERSTOOD = 2  # Size realization done, waiting for Maxwell's revelation
+COMPLETE = 3  # The secret is out!
+
+# Room view templates
+ROOM_HEADER = "\n--- 🏠 {name} ---"
+ROOM_ACTIONS = "\n🎯 You can:"
+ROOM_EXITS = "\n🚪 You can go to:"
+LIST_ENTRY = "  - {entry}"
+ROOM_HINTS = {
+    ALL_ITEMS: ("\n🎯 QUEST PHASE 1: You have all {count} special items!\n"
+                "💭 Try 'examine all items' to understand their significance."),
+    UNDERSTOOD: ("\n🎯 QUEST PHASE 2: Maxwell's final revelation awaits!\n"
+                 "💫 Continue exploring to discover the wonderful truth!"),
+}
+
+# Quick reminder templates
+REMINDER_HEADER = "\n📍 Currently in: {name}"
+REMINDER_ACTIONS = "🎯 Can do: {actions}"
+REMINDER_MORE_ACTIONS = "🎯 Can do: {actions}, and more ('look' to see all)"
+REMINDER_EXITS = "🚪 Can go to: {exits}"
+REMINDER_PROGRESS = {
+    SEARCHING: "🎾 Quest Phase 1: {found}/{total} special items found",
+    ALL_ITEMS: "🎾 Quest Phase 1: {found}/{total} special items found",
+    UNDERSTOOD: "🎾 Quest Phase 2: Understanding achieved, final revelation pending",
+    COMPLETE: "🎉 Quest Complete: Maxwell's wonderful secret revealed!",
+}
+REMINDER_ACTION_LIMIT = 3  # Actions listed before pointing at 'look'
+
+# Option list templates (shown after an invalid command)
+OPTIONS_HEADER = "\n💡 You can try:"
+OPTIONS_EXITS = "  Or go to:"
+OPTIONS_FOOTER = "  Other commands: 'help', 'inventory', 'look', 'stats'"
+OPTIONS_HINTS = {
+    ALL_ITEMS: ("\n🎯 QUEST UPDATE: You have all {count} special items!\n"
+                "💡 HINT: Try 'examine all items' to understand what they have in common."),
+    UNDERSTOOD: ("\n🎯 QUEST PHASE 2: Ready for Maxwell's final revelation!\n"
+                 "💫 Move to any location or use 'look' to discover the truth!"),
+}
+
+# The story's big scenes, each said as one block
+MISSING_ITEMS = ("You don't have all the special items yet to compare them properly.\n"
+                 "Keep following Maxwell's guidance!")
+NO_QUEST_ITEMS = "There are no special items to compare in this story - just follow Maxwell's lead!"
+
+REALIZATION_AGAIN = "\n".join([
+    "You look at the three items together again:",
+    "The colorful helmet, the adventure gloves, and the beautiful bike.",
+    "Now you understand - they're all designed for someone special...",
+    "Maxwell's plan is becoming clearer!",
+])
+
+SIZE_REALIZATION = "\n".join([
+    "\n" + "=" * 50,
+    "🧠 MOMENT OF UNDERSTANDING 🧠",
+    "=" * 50,
+    "\nYou gather all three special items together and examine them carefully...",
+    "The colorful helmet with its protective padding...",
+    "The adventure gloves with their sturdy grip...",
+    "The beautiful bike, perfectly crafted and ready for fun...",
+    "\nYou tilt your head as you study each item more closely.",
+    "Wait a minute... something's becoming clear about these items...",
+    "\nAs you look at them all together, a pattern emerges.",
+    "They're not just random adventure gear...",
+    "They all seem to be made for the same person!",
+    "But who in your family would need ALL of these things?",
+    "\nYour ears perk up with growing excitement...",
+    "These items aren't meant for any of the adult humans you know...",
+    "They're all perfectly sized for someone much smaller!",
+    "Someone who doesn't live in your house yet...",
+    "\nYour tail starts wagging as understanding dawns.",
+    "Maxwell appears beside you, purring softly, his eyes twinkling",
+    "with approval. You're getting closer to understanding his secret!",
+    "\n💡 You're starting to understand Maxwell's mysterious quest!",
+    "But there's still one more piece to the puzzle...",
+    "What does this all MEAN for your family?",
+    "=" * 50,
+])
+
+NEXT_PHASE = "\n".join([
+    "\n🎯 QUEST PROGRESS: You've unlocked the next phase!",
+    "💭 Now that you understand these items have a special purpose,",
+    "   you need to discover WHY Maxwell wanted you to find them.",
+    "\n🎮 NEXT STEP: Visit any location or use 'look' to trigger Maxwell's",
+    "   final revelation about what these items really mean!",
+])
+
+REVELATION = "\n".join([
+    "\n" + "=" * 60,
+    "🎉 THE WONDERFUL REVELATION! 🎉",
+    "=" * 60,
+    "\nMaxwell's mysterious behavior suddenly makes perfect sense!",
+    "You sit quietly, thinking about the special items...",
+    "Helmet... gloves... bike... all perfectly sized for someone small...",
+    "\nSuddenly, your tail starts wagging uncontrollably!",
+    "\n🍼 A NEW LITTLE FAMILY MEMBER IS COMING! 🍼",
+    "\nA tiny human who will grow up to use these adventure items!",
+    "\nMaxwell appears beside you, purring loudly.",
+    "His feline intuition knew this wonderful secret all along!",
+    "\nYou spin in a happy circle, barking with joy!",
+    "A new baby is coming to your family!",
+    "=" * 60,
+])
+
+VICTORY = "\n".join([
+    "\n🎾 Congratulations! You've solved Maxwell's mystery!",
+    "Thanks for playing Turbo's Quest!",
+    "\nType 'quit' to end the adventure.",
+])
+
+
+# Small counts are written out in the hints ("all three special items")
+COUNT_WORDS = ("no", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten")
+
+
+def count_word(number):
+    """
+    A count as a word for hints, or as digits once it's past ten
+    """
+    return COUNT_WORDS[number] if number < len(COUNT_WORDS) else str(number)
+
+
+class Renderer(WorldHelper):
+    """
+    Rendered views for one compiled world, cached per location and quest phase
+    """
+    def __init__(self, world):
+        super().__init__(world)
+        size = room_cache_size(world)
+        self.rooms = LRUCache(size)  # (location id, visited, phase) -> full room description
+        self.reminders = LRUCache(size)  # (location id, phase, quest items found) -> quick reminder
+        self.options = LRUCache(size)  # (location id, phase) -> what you can try here
+        # The hints and progress line count this world's quest items (and a world with none never shows
+        # the "all of them" hints)
+        self.quest_total = len(world.quest_items)
+        count = count_word(self.quest_total)
+        self.room_hints = {phase: hint.format(count=count) for phase, hint in ROOM_HINTS.items()
+                           if self.quest_total or phase != ALL_ITEMS}
+        self.options_hints = {phase: hint.format(count=count) for phase, hint in OPTIONS_HINTS.items()
+                              if self.quest_total or phase != ALL_ITEMS}
+        self.hits = 0
+        self.misses = 0
+
+    def room(self, location_id, visited, phase):
+        """
+        The full description of a room, as shown on arrival or with 'look'
+        """
+        key = (location_id, visited, phase)
+        text = self.rooms.get(key)
+        if text is not None:
+            self.hits += 1
+            return text
+        self.misses += 1
+
+        location = self.world.locations[location_id]
+        lines = [ROOM_HEADER.format(name=location.name)]
+        # First visit description if available and the room hasn't been seen before
+        if not visited and location.first_visit_description is not None:
+            lines.append(location.first_visit_description)
+        else:
+            lines.append(location.description)
+        if location.actions:
+            lines.append(ROOM_ACTIONS)
+            lines.extend(LIST_ENTRY.format(entry=action) for action in location.actions)
+        if location.exits:
+            lines.append(ROOM_EXITS)
+            lines.extend(LIST_ENTRY.format(entry=direction) for direction in location.exits)
+        if phase in self.room_hints:
+            lines.append(self.room_hints[phase])
+        text = self.rooms[key] = "\n".join(lines)
+        return text
+
+    def reminder(self, location_id, phase, found):
+        """
+        The short 'where am I' reminder shown after most actions
+        """
+        key = (location_id, phase, found)
+        text = self.reminders.get(key)
+        if text is not None:
+            self.hits += 1
+            return text
+        self.misses += 1
+
+        location = self.world.locations[location_id]
+        lines = [REMINDER_HEADER.format(name=location.name)]
+        actions = list(location.actions)
+        if len(actions) > REMINDER_ACTION_LIMIT:
+            lines.append(REMINDER_MORE_ACTIONS.format(actions=", ".join(actions[:REMINDER_ACTION_LIMIT])))
+        elif actions:
+            lines.append(REMINDER_ACTIONS.format(actions=", ".join(actions)))
+        if location.exits:
+            lines.append(REMINDER_EXITS.format(exits=", ".join(location.exits)))
+        if found > 0:
+            lines.append(REMINDER_PROGRESS[phase].format(found=found, total=self.quest_total))
+        text = self.reminders[key] = "\n".join(lines)
+        return text
+
+    def current_options(self, location_id, phase):
+        """
+        Everything the player can try in a room, shown after an invalid command
+        """
+        key = (location_id, phase)
+        text = self.options.get(key)
+        if text is not None:
+            self.hits += 1
+            return text
+        self.misses += 1
+
+        location = self.world.locations[location_id]
+        lines = [OPTIONS_HEADER]
+        lines.extend(LIST_ENTRY.format(entry=action) for action in location.actions)
+        if location.exits:
+            lines.append(OPTIONS_EXITS)
+            lines.extend(LIST_ENTRY.format(entry=exit_name) for exit_name in location.exits)
+        lines.append(OPTIONS_FOOTER)
+        if phase in self.options_hints:
+            lines.append(self.options_hints[phase])
+        text = self.options[key] = "\n".join(lines)
+        return text
+
+
+# One renderer per live world, dropped along with the world
+RENDERERS = WorldCache(Renderer)
+
+
+def renderer_for(world):
+    """
+    The shared Renderer for a world, created the first time it's needed
+    """
+    return RENDERERS(world)
@@ -0,0 +1,523 @@
+"""
+Turbo's Quest - Rules
+Special action requirements and effects, compiled once when the world loads
+
+Every requirement in story.json is compiled into a small instruction: an
+opcode plus a ready-made operand (usually a bitmask over the player's
+inventory, visited rooms or completed actions). Checking one is a table
+lookup and a couple of integer operations, with no string comparisons or
+dict walking left at play time. Effects are compiled the same way.
+
+New kinds of requirement or effect are added by registering a compile
+function for their "type":
+
+    @requirement_type("has_pet")
+    def compile_has_pet(world, action_key, data, issues):
+        return HAS_ITEMS, 1 << world.item_ids["maxwell"], None
+
+Requirement types understood out of the box:
+    {"type": "has_item", "item": "rope"}
+    {"type": "item_count", "items": ["helmet", "gloves", "bike"], "at_least": 2}
+    {"type": "visited", "location": "garden"}
+    {"type": "completed", "action": "open_shed"}
+    {"type": "flag", "flag": "size_realization"}  (or "revelation")
+    {"type": "not", "requirement": {...}}
+    {"type": "any", "requirements": [...]} and {"type": "all", "requirements": [...]}
+
+Compiled records only hold ints, strings, tuples and module-level names, so
+they pickle into the world cache like everything else.
+"""
+
+from commands import ACTION
+from derived import LRUCache, WorldCache, WorldHelper, room_cache_size
+
+
+# Requirement opcodes - each one indexes TESTS
+ALWAYS = 0  # Unknown requirement types never block anything (as they always have)
+NEVER = 1  # Needs something that doesn't exist
+HAS_ITEMS = 2  # operand: item bitmask, all of it carried
+ITEM_COUNT = 3  # operand: (item bitmask, how many of them must be carried)
+VISITED = 4  # operand: location bitmask, all of it visited
+COMPLETED = 5  # operand: action bitmask, all of it done
+FLAG = 6  # operand: name of a Player story flag
+NOT = 7  # operand: one Requirement
+ANY = 8  # operand: tuple of Requirements
+ALL = 9  # operand: tuple of Requirements
+ANY_ITEM = 10  # operand: item bitmask, at least one of it carried
+
+# Effect opcodes - each one indexes EFFECTS
+NOTHING = 0  # Unknown effect types do nothing (as they always have)
+GIVE_ITEM = 1
+TAKE_ITEM = 2
+TRIGGER_REVELATION = 3
+WIN_GAME = 4
+
+# Story flags a "flag" requirement can check, by the name used in story.json
+FLAGS = {
+    "size_realization": "size_realization_triggered",
+    "revelation": "revelation_triggered",
+}
+
+# Distinct states remembered per room by ActionIndex before its cache starts over
+MAX_STATES_PER_ROOM = 256
+
+
+class Requirement:
+    """
+    A compiled action requirement: an opcode, its operand and the message shown when it isn't met
+    `item` is the item id for has_item requirements (None otherwise, or if
+    the item doesn't exist), for tools that only care about items.
+    """
+    __slots__ = ("type", "op", "operand", "message", "item")
+
+    def __init__(self, req_type, op, operand, message, item=None):
+        self.type = req_type
+        self.op = op
+        self.operand = operand
+        self.message = message
+        self.item = item
+
+
+class Effect:
+    """
+    A compiled action effect, e.g. "give_item" with the item's integer id
+    """
+    __slots__ = ("type", "op", "item")
+
+    def __init__(self, effect_type, op=NOTHING, item=None):
+        self.type = effect_type
+        self.op = op
+        self.item = item
+
+
+# Compile functions by type: (world, action key, raw data, issues) -> (op, operand, item id or None)
+REQUIREMENT_TYPES = {}
+
+# Compile functions by type: (world, action key, raw data, issues) -> (op, item id or None), or None to drop it
+EFFECT_TYPES = {}
+
+
+def requirement_type(name):
+    """
+    Register a compile function for a requirement type
+    """
+    def register(compile_function):
+        REQUIREMENT_TYPES[name] = compile_function
+        return compile_function
+    return register
+
+
+def effect_type(name):
+    """
+    Register a compile function for an effect type
+    """
+    def register(compile_function):
+        EFFECT_TYPES[name] = compile_function
+        return compile_function
+    return register
+
+
+def compile_requirement(world, action_key, data, issues):
+    """
+    Compile one requirement (and any it contains) from its raw JSON
+    """
+    req_type = data.get("type")
+    compile_function = REQUIREMENT_TYPES.get(req_type)
+    if compile_function is None:
+        issues.append(f"Action '{action_key}' has a requirement of unknown type '{req_type}'")
+        op, operand, item = ALWAYS, None, None
+    else:
+        op, operand, item = compile_function(world, action_key, data, issues)
+    if "message" in data:
+        message = data["message"]
+    elif "item" in data or req_type == "has_item":
+        message = f"You need {data.get('item')} to do that."
+    else:
+        message = "You can't do that yet."
+    return Requirement(req_type, op, operand, message, item)
+
+
+def compile_effect(world, action_key, data, issues):
+    """
+    Compile one effect from its raw JSON, or return None if it should be dropped
+    """
+    kind = data.get("type")
+    compile_function = EFFECT_TYPES.get(kind)
+    if compile_function is None:
+        issues.append(f"Action '{action_key}' has an effect of unknown type '{kind}'")
+        return Effect(kind)
+    compiled = compile_function(world, action_key, data, issues)
+    if compiled is None:
+        return None
+    op, item = compiled
+    return Effect(kind, op, item)
+
+
+def required_items(requirements):
+    """
+    The items an action's requirements ask for, as one bitmask
+    Returns None if any requirement is about something other than carrying
+    items, since then the mask alone can't decide it.
+    """
+    mask = 0
+    for requirement in requirements:
+        if requirement.op != HAS_ITEMS:
+            return None
+        mask |= requirement.operand
+    return mask
+
+
+def referenced_record(world, kind, key, action_key, issues, message):
+    """
+    The id of the record a requirement or effect names, or None (with an issue) if it doesn't exist
+    """
+    if key is not None:
+        world.refer((kind, key), ("action", action_key))
+    record_id = getattr(world, f"{kind}_ids").get(key)
+    if record_id is None:
+        issues.append(message)
+    return record_id
+
+
+@requirement_type("has_item")
+def compile_has_item(world, action_key, data, issues):
+    """
+    Carrying one item
+    """
+    item_key = data.get("item")
+    item_id = referenced_record(world, "item", item_key, action_key, issues,
+                                f"Action '{action_key}' requires unknown item '{item_key}'")
+    if item_id is None:
+        return NEVER, None, None  # An item missing from items.json can never be held
+    return HAS_ITEMS, 1 << item_id, item_id
+
+
+@requirement_type("item_count")
+def compile_item_count(world, action_key, data, issues):
+    """
+    Carrying at least `at_least` of a list of items
+    """
+    mask = 0
+    for item_key in data.get("items", []):
+        item_id = referenced_record(world, "item", item_key, action_key, issues,
+                                    f"Action '{action_key}' counts unknown item '{item_key}'")
+        if item_id is not None:
+            mask |= 1 << item_id
+    return ITEM_COUNT, (mask, data.get("at_least", len(data.get("items", [])))), None
+
+
+@requirement_type("visited")
+def compile_visited(world, action_key, data, issues):
+    """
+    Having seen a room
+    """
+    location_key = data.get("location")
+    location_id = referenced_record(world, "location", location_key, action_key, issues,
+                                    f"Action '{action_key}' requires visiting unknown location '{location_key}'")
+    if location_id is None:
+        return NEVER, None, None
+    return VISITED, 1 << location_id, None
+
+
+@requirement_type("completed")
+def compile_completed(world, action_key, data, issues):
+    """
+    Having done another (non-repeatable) action
+    """
+    other_key = data.get("action")
+    other_id = referenced_record(world, "action", other_key, action_key, issues,
+                                 f"Action '{action_key}' requires unknown action '{other_key}'")
+    if other_id is None:
+        return NEVER, None, None
+    return COMPLETED, 1 << other_id, None
+
+
+@requirement_type("flag")
+def compile_flag(world, action_key, data, issues):
+    """
+    A story flag being set
+    """
+    flag = data.get("flag")
+    if flag not in FLAGS:
+        issues.append(f"Action '{action_key}' requires unknown flag '{flag}'")
+        return NEVER, None, None
+    return FLAG, FLAGS[flag], None
+
+
+@requirement_type("not")
+def compile_not(world, action_key, data, issues):
+    """
+    The opposite of another requirement
+    """
+    child = compile_requirement(world, action_key, data.get("requirement", {}), issues)
+    if child.op == NOT:
+        inner = child.operand  # not(not(x)) is just x
+        return inner.op, inner.operand, inner.item
+    if child.op in (ALWAYS, NEVER):
+        return NEVER if child.op == ALWAYS else ALWAYS, None, None
+    return NOT, child, None
+
+
+@requirement_type("any")
+def compile_any(world, action_key, data, issues):
+    """
+    At least one of several requirements
+    Single items are folded into one "any of these items" mask test.
+    """
+    children = []
+    items = 0
+    pending = [compile_requirement(world, action_key, child, issues) for child in data.get("requirements", [])]
+    while pending:
+        child = pending.pop(0)
+        if child.op == ALWAYS:
+            return ALWAYS, None, None
+        if child.op == ANY:
+            pending[:0] = child.operand
+        elif child.op == ANY_ITEM or (child.op == HAS_ITEMS and child.operand.bit_count() == 1):
+            items |= child.operand
+        elif child.op != NEVER:
+            children.append(child)
+    if items:
+        children.insert(0, Requirement("item_count", ANY_ITEM, items, None))
+    return folded(ANY, children, NEVER)
+
+
+@requirement_type("all")
+def compile_all(world, action_key, data, issues):
+    """
+    Every one of several requirements
+    Item, room and action requirements are folded into one mask test each.
+    """
+    children = []
+    masks = {HAS_ITEMS: 0, VISITED: 0, COMPLETED: 0}
+    pending = [compile_requirement(world, action_key, child, issues) for child in data.get("requirements", [])]
+    while pending:
+        child = pending.pop(0)
+        if child.op == NEVER:
+            return NEVER, None, None
+        if child.op == ALL:
+            pending[:0] = child.operand
+        elif child.op in masks:
+            masks[child.op] |= child.operand
+        elif child.op != ALWAYS:
+            children.append(child)
+    children[:0] = [Requirement(None, op, mask, None) for op, mask in masks.items() if mask]
+    return folded(ALL, children, ALWAYS)
+
+
+def folded(op, children, empty):
+    """
+    An any/all over simplified children: nothing left is `empty`, one child is just that child
+    """
+    if not children:
+        return empty, None, None
+    if len(children) == 1:
+        child = children[0]
+        return child.op, child.operand, child.item
+    return op, tuple(children), None
+
+
+def item_effect(op, verb):
+    """
+    Compile function for an effect that hands over or takes away one item
+    """
+    def compile_item_effect(world, action_key, data, issues):
+        item_key = data.get("item")
+        if not item_key:
+            return None
+        item_id = referenced_record(world, "item", item_key, action_key, issues,
+                                    f"Action '{action_key}' {verb} unknown item '{item_key}'")
+        return None if item_id is None else (op, item_id)
+    return compile_item_effect
+
+
+effect_type("give_item")(item_effect(GIVE_ITEM, "gives"))
+effect_type("take_item")(item_effect(TAKE_ITEM, "takes"))
+effect_type("trigger_revelation")(lambda world, action_key, data, issues: (TRIGGER_REVELATION, None))
+effect_type("win_game")(lambda world, action_key, data, issues: (WIN_GAME, None))
+
+
+def any_met(children, player):
+    """
+    True if at least one compiled requirement is met
+    """
+    for child in children:
+        if TESTS[child.op](child.operand, player):
+            return True
+    return False
+
+
+def all_met(children, player):
+    """
+    True if every compiled requirement is met
+    """
+    for child in children:
+        if not TESTS[child.op](child.operand, player):
+            return False
+    return True
+
+
+# Requirement tests by opcode: (operand, player) -> met?
+TESTS = (
+    lambda operand, player: True,
+    lambda operand, player: False,
+    lambda operand, player: player.inventory & operand == operand,
+    lambda operand, player: (player.inventory & operand[0]).bit_count() >= operand[1],
+    lambda operand, player: player.visited_locations & operand == operand,
+    lambda operand, player: player.completed_actions & operand == operand,
+    lambda operand, player: getattr(player, operand),
+    lambda operand, player: not TESTS[operand.op](operand.operand, player),
+    any_met,
+    all_met,
+    lambda operand, player: player.inventory & operand != 0,
+)
+
+
+def failed_requirement(action, player):
+    """
+    The message of the first requirement `player` doesn't meet, or None if they're all met
+    Actions that only need items (almost all of them) are decided by one mask test.
+    """
+    required = action.required_items
+    if required is not None and player.inventory & required == required:
+        return None
+    for requirement in action.requirements:
+        if not TESTS[requirement.op](requirement.operand, player):
+            return requirement.message
+    return None
+
+
+def give_item(engine, effect):
+    """
+    Hand Turbo an item
+    """
+    engine.player.add_item(effect.item, engine.items, len(engine.world.quest_items))
+
+
+def take_item(engine, effect):
+    """
+    Use up one of Turbo's items
+    """
+    engine.player.remove_item(effect.item, engine.items)
+
+
+def trigger_revelation(engine, effect):
+    """
+    Reveal Maxwell's secret, once Turbo understands the items
+    """
+    # This effect prepares for the final revelation scene
+    # But now we require the size realization first!
+    if engine.player.size_realization_triggered:
+        engine.player.revelation_triggered = True
+    else:
+        engine.say("You sense that Maxwell's quest is almost complete...")
+        engine.say("But you feel like you need to understand something about these items first.")
+
+
+def win_game(engine, effect):
+    """
+    End the game in victory
+    """
+    engine.player.game_won = True
+    engine.game_running = False
+
+
+# Effect handlers by opcode: (engine, effect)
+EFFECTS = (
+    lambda engine, effect: None,
+    give_item,
+    take_item,
+    trigger_revelation,
+    win_game,
+)
+
+
+def footprint(requirements):
+    """
+    Everything a list of requirements looks at, as (items, visited, completed, uses flags)
+    Two players that agree on these bits get the same answer from every requirement.
+    """
+    items = visited = completed = 0
+    flags = False
+    stack = list(requirements)
+    while stack:
+        requirement = stack.pop()
+        op, operand = requirement.op, requirement.operand
+        if op in (HAS_ITEMS, ANY_ITEM):
+            items |= operand
+        elif op == ITEM_COUNT:
+            items |= operand[0]
+        elif op == VISITED:
+            visited |= operand
+        elif op == COMPLETED:
+            completed |= operand
+        elif op == FLAG:
+            flags = True
+        elif op == NOT:
+            stack.append(operand)
+        elif op in (ANY, ALL):
+            stack.extend(operand)
+    return items, visited, completed, flags
+
+
+class ActionIndex(WorldHelper):
+    """
+    Which of a room's actions can be done right now, for one compiled world
+    Each room's actions are indexed by the state they depend on: the answer
+    is cached under just those bits of the player's state, so it's only
+    worked out again when something that matters has changed. Lazy worlds
+    keep only their most recently used rooms.
+    """
+    def __init__(self, world):
+        super().__init__(world)
+        # Location id -> (actions, items, visited, completed, uses flags, {state: available})
+        self.rooms = LRUCache(room_cache_size(world))
+
+    def room(self, location_id):
+        """
+        A room's actions and the slice of player state they depend on
+        """
+        room = self.rooms.get(location_id)
+        if room is None:
+            world = self.world
+            location = world.locations[location_id]
+            actions = []
+            for command, action_id in location.actions.items():
+                # Actions shadowed by a global command or an exit can never run here
+                if location.commands.exact.get(command) == (ACTION, action_id):
+                    actions.append((command, world.actions[action_id]))
+            items, visited, completed, flags = footprint(
+                [requirement for _, action in actions for requirement in action.requirements])
+            # Actions already done don't show up again, so their own completion matters too
+            for _, action in actions:
+                if not action.repeatable:
+                    completed |= 1 << action.id
+            room = self.rooms[location_id] = (tuple(actions), items, visited, completed, flags, {})
+        return room
+
+    def available(self, location_id, player):
+        """
+        The commands for every action in a room that `player` can do right now, in display order
+        """
+        actions, items, visited, completed, flags, cache = self.room(location_id)
+        state = (player.inventory & items, player.visited_locations & visited, player.completed_actions & completed,
+                 (player.size_realization_triggered, player.revelation_triggered) if flags else None)
+        commands = cache.get(state)
+        if commands is None:
+            if len(cache) >= MAX_STATES_PER_ROOM:
+                cache.clear()
+            commands = cache[state] = tuple(
+                command for command, action in actions
+                if not (player.completed_actions >> action.id & 1) and failed_requirement(action, player) is None)
+        return commands
+
+
+# One action index per live world, dropped along with the world
+INDEXES = WorldCache(ActionIndex)
+
+
+def action_index_for(world):
+    """
+    The shared ActionIndex for a world, created the first time it's needed
+    """
+    return INDEXES(world)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Turbo's Quest - Network Server
+Serves one game per connection to many players at once from a single process
+
+Players connect with any line-based client (telnet, nc) and type commands
+just like at the terminal. Every connection gets its own headless GameEngine
+sharing one loaded world, all running in one asyncio event loop:
+
+- Output is backpressured: a turn's text is flushed before the next command
+  is read, and a client that stops reading for `drain_timeout` seconds is
+  disconnected instead of piling up memory.
+- Connections idle for `idle_timeout` seconds are closed.
+- Network sessions can't save or load: save slots are files on the server,
+  which every player would otherwise share (and could fill the disk with).
+- Shutting down stops accepting, says goodbye to everyone waiting at the
+  prompt and gives turns still being sent `grace` seconds to finish.
+
+When a session ends the server sends one last line starting with
+SESSION_OVER, followed by "won" or "not won", so scripts can tell how it went.
+
+Run it with:
+    python server.py [--host HOST] [--port PORT] [--data DIR] [--idle-timeout SECONDS]
+"""
+
+import argparse
+import asyncio
+import re
+import signal
+
+from main import DataLoader, GameEngine
+
+
+PROMPT = "\n🐕 > "
+SESSION_OVER = "🏁 Session over:"
+
+IDLE_MESSAGE = "\n💤 Turbo curled up for a nap after waiting so long. Come back soon!"
+SHUTDOWN_MESSAGE = "\n🔔 The house is closing up for the night - see you next time!"
+BUSY_MESSAGE = "🚪 The house is full right now, please try again in a moment."
+LONG_LINE_MESSAGE = "🤔 That's far too much for Turbo to remember at once!"
+
+# Telnet option negotiation (IAC sequences) that clients may mix into their input
+TELNET_COMMAND = re.compile(rb"\xff[\xfb-\xfe].|\xff[\xf0-\xfa\xff]", re.DOTALL)
+
+# Start waiting for a slow client once this much output is queued for it
+WRITE_BUFFER_HIGH = 64 * 1024
+
+
+class Connection:
+    """
+    One connected player and the game they're playing
+    """
+    __slots__ = ("reader", "writer", "engine", "task", "reading")
+
+    def __init__(self, reader, writer, engine, task):
+        self.reader = reader
+        self.writer = writer
+        self.engine = engine
+        self.task = task
+        self.reading = False  # Waiting at the prompt (safe to interrupt for shutdown)
+
+
+class GameServer:
+    """
+    A telnet-style line protocol server with one game session per connection
+    """
+    def __init__(self, data_loader, host="127.0.0.1", port=4000, idle_timeout=300.0, drain_timeout=30.0,
+                 max_line=1024, max_connections=10000):
+        self.data_loader = data_loader
+        self.host = host
+        self.port = port  # 0 picks a free port; the real one is filled in by start()
+        self.idle_timeout = idle_timeout
+        self.drain_timeout = drain_timeout
+        self.max_line = max_line
+        self.max_connections = max_connections
+        self.server = None
+        self.connections = set()
+        self.closing = False
+        # Running totals
+        self.accepted = 0
+        self.commands = 0
+        self.idle_disconnects = 0
+        self.slow_disconnects = 0
+
+    async def start(self):
+        """
+        Start listening, returning the port actually bound
+        """
+        self.server = await asyncio.start_server(self.handle, self.host, self.port, limit=self.max_line,
+                                                 backlog=min(self.max_connections, 4096))
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def send(self, writer, text):
+        """
+        Write text the telnet way (CRLF line endings) and wait until the client has taken it
+        """
+        writer.write(text.replace("\n", "\r\n").encode("utf-8"))
+        await asyncio.wait_for(writer.drain(), self.drain_timeout)
+
+    async def handle(self, reader, writer):
+        """
+        Play one game for a connection, from the opening text to the last line
+        """
+        if self.closing or len(self.connections) >= self.max_connections:
+            writer.write(BUSY_MESSAGE.encode("utf-8") + b"\r\n")
+            writer.close()
+            return
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH)
+        engine = GameEngine(self.data_loader, headless=True)
+        engine.save_directory = None
+        connection = Connection(reader, writer, engine, asyncio.current_task())
+        self.connections.add(connection)
+        self.accepted += 1
+        farewell = ""
+        try:
+            await self.send(writer, engine.new_game() + PROMPT)
+            while engine.game_running:
+                connection.reading = True
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    self.idle_disconnects += 1
+                    farewell = IDLE_MESSAGE
+                    break
+                except ValueError:
+                    farewell = LONG_LINE_MESSAGE  # Longer than max_line without a newline
+                    break
+                finally:
+                    connection.reading = False
+                if not line:
+                    break  # The player hung up
+                command = TELNET_COMMAND.sub(b"", line).decode("utf-8", "replace").strip()
+                text = engine.process_command(command)
+                self.commands += 1
+                await self.send(writer, text + (PROMPT if engine.game_running else ""))
+        except asyncio.CancelledError:
+            farewell = SHUTDOWN_MESSAGE  # Only shutdown() cancels connections
+        except (asyncio.TimeoutError, ConnectionError):
+            self.slow_disconnects += 1  # Stopped reading (or vanished) - don't wait any longer
+            writer.transport.abort()
+        finally:
+            self.connections.discard(connection)
+            self.data_loader.sessions.discard(engine)
+        await self.say_goodbye(writer, engine, farewell)
+
+    async def say_goodbye(self, writer, engine, farewell):
+        """
+        Send the last words and the session outcome, then hang up
+        """
+        if writer.is_closing():
+            return
+        outcome = "won" if engine.game_won else "not won"
+        try:
+            writer.write(f"{farewell}\n{SESSION_OVER} {outcome}\n".replace("\n", "\r\n").encode("utf-8"))
+            await asyncio.wait_for(writer.drain(), 1.0)
+            writer.close()
+            await asyncio.wait_for(writer.wait_closed(), 1.0)
+        except (asyncio.TimeoutError, ConnectionError):
+            writer.transport.abort()
+
+    async def shutdown(self, grace=5.0):
+        """
+        Stop accepting players, say goodbye to everyone and wait for connections to close
+        Players waiting at the prompt are let go straight away; turns still
+        being written get `grace` seconds before they're cut off.
+        """
+        self.closing = True
+        if self.server is not None:
+            self.server.close()
+        for connection in list(self.connections):
+            if connection.reading:
+                connection.task.cancel()
+        tasks = [connection.task for connection in self.connections]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=grace)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending, timeout=1.0)
+        if self.server is not None:
+            await self.server.wait_closed()
+
+
+async def serve(data_loader, host, port, idle_timeout):
+    """
+    Run a server until SIGINT or SIGTERM, then shut it down gracefully
+    """
+    server = GameServer(data_loader, host, port, idle_timeout=idle_timeout)
+    await server.start()
+    print(f"🏠 Turbo's Quest is open on {host}:{server.port} (Ctrl+C to close)")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stop.set)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C still ends asyncio.run()
+    await stop.wait()
+
+    print(f"🔔 Closing up: saying goodbye to {len(server.connections)} players...")
+    await server.shutdown()
+    print(f"👋 Served {server.accepted} players and {server.commands} commands")
+
+
+def main():
+    """
+    Start the server from the command line
+    """
+    parser = argparse.ArgumentParser(description="Serve Turbo's Quest over TCP")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=4000, help="port to listen on (0 for any free port)")
+    parser.add_argument("--data", default="data", help="game data directory")
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="seconds before idle players are let go")
+    args = parser.parse_args()
+
+    loader = DataLoader(args.data)
+    if not loader.load_all_data():
+        raise SystemExit(1)
+    asyncio.run(serve(loader, args.host, args.port, args.idle_timeout))
+
+
+if __name__ == "__main__":
+    main()
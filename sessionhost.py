@@ -0,0 +1,293 @@
+"""
+Turbo's Quest - Session Host
+Runs many headless game sessions across a pool of worker processes
+
+One CPython process only ever uses one core, so the host starts `workers`
+processes and spreads sessions over them. Routing is sticky: a session id
+always hashes to the same worker, which keeps that session's GameEngine for
+its whole life, so no game state ever moves between processes.
+
+Workers share one copy of the world instead of each building their own:
+
+    "mapped" (default)  every worker opens the world lazily over the same
+                        memory-mapped JSON files and saved index, so the
+                        file pages live once in the OS page cache and each
+                        worker only compiles the rooms its sessions visit
+    "fork"              the host loads the world once and forks the workers,
+                        which share its pages copy-on-write (the collector is
+                        frozen first so it doesn't touch them)
+    "copy"              every worker loads its own world - the baseline
+
+    host = SessionHost("data", workers=4)
+    print(host.open("alice"))
+    print(host.send("alice", "kitchen"))
+    replies = host.run_batch([("alice", "look"), ("bob", "garden")])  # A failed command gets its error instead
+    host.close()
+"""
+
+import gc
+import multiprocessing
+import os
+import zlib
+
+from main import DataLoader, GameEngine
+
+
+MODES = ("mapped", "fork", "copy")
+
+# Set in the host just before forking, so "fork" workers inherit the loaded world
+SHARED_LOADER = None
+
+
+class SessionHostError(Exception):
+    """
+    Raised when a worker can't run a request (or has died)
+    """
+    pass
+
+
+def memory_usage():
+    """
+    This process's memory in KiB: {"rss": resident, "private": not shared with any other process}
+    """
+    usage = {"rss": 0, "private": 0}
+    try:
+        with open("/proc/self/smaps_rollup") as smaps:
+            for line in smaps:
+                field, _, value = line.partition(":")
+                if field == "Rss":
+                    usage["rss"] = int(value.split()[0])
+                elif field in ("Private_Clean", "Private_Dirty"):
+                    usage["private"] += int(value.split()[0])
+    except OSError:
+        import resource  # Not Linux: peak RSS is the best we can do
+        usage["rss"] = usage["private"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage
+
+
+def open_world(data_directory, mode, cache_size):
+    """
+    The DataLoader a worker plays from
+    """
+    if mode == "fork" and SHARED_LOADER is not None:
+        return SHARED_LOADER
+    loader = DataLoader(data_directory, verbose=False, lazy=mode == "mapped", cache_size=cache_size)
+    if not loader.load_all_data():
+        raise SessionHostError(f"Worker {os.getpid()} couldn't load {data_directory}")
+    return loader
+
+
+def worker_main(connection, data_directory, mode, cache_size):
+    """
+    A worker process: keep a GameEngine per session and answer batches of commands
+    Requests are (op, payload) tuples and every reply is ("ok", result) or ("error", message).
+    """
+    try:
+        loader = open_world(data_directory, mode, cache_size)
+    except Exception as e:
+        connection.send(("error", str(e)))
+        return
+    connection.send(("ok", os.getpid()))
+    sessions = {}
+
+    while True:
+        try:
+            op, payload = connection.recv()
+        except EOFError:
+            break  # The host went away
+        try:
+            if op == "run":
+                # [(session id, command or None to open it), ...] -> [("ok", text) or ("error", message), ...]
+                # Each command gets its own reply, so one that fails doesn't lose the rest of the batch
+                replies = []
+                for session_id, command in payload:
+                    try:
+                        engine = sessions.get(session_id)
+                        if command is None:
+                            engine = sessions[session_id] = GameEngine(loader, headless=True)
+                            replies.append(("ok", engine.new_game()))
+                        elif engine is None:
+                            raise SessionHostError(f"Unknown session '{session_id}'")
+                        else:
+                            replies.append(("ok", engine.process_command(command)))
+                    except Exception as e:
+                        replies.append(("error", f"{type(e).__name__}: {e}"))
+                result = replies
+            elif op == "end":
+                for session_id in payload:
+                    engine = sessions.pop(session_id, None)
+                    if engine is not None:
+                        loader.sessions.discard(engine)
+                result = len(sessions)
+            elif op == "stats":
+                result = {"pid": os.getpid(), "sessions": len(sessions), **memory_usage()}
+            elif op == "stop":
+                connection.send(("ok", None))
+                break
+            else:
+                raise SessionHostError(f"Unknown request '{op}'")
+            connection.send(("ok", result))
+        except Exception as e:
+            connection.send(("error", f"{type(e).__name__}: {e}"))
+    connection.close()
+
+
+def reply_text(reply):
+    """
+    The text of one run_batch reply, raising it if the command failed
+    """
+    if isinstance(reply, SessionHostError):
+        raise reply
+    return reply
+
+
+class SessionHost:
+    """
+    A pool of worker processes, each driving the sessions that hash to it
+    """
+    def __init__(self, data_directory="data", workers=None, mode="mapped", cache_size=4096):
+        global SHARED_LOADER
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode '{mode}' (choose from {', '.join(MODES)})")
+        self.data_directory = data_directory
+        self.mode = mode
+        self.worker_count = workers or os.cpu_count() or 1
+        self.connections = []
+        self.processes = []
+
+        if mode == "fork":
+            if "fork" not in multiprocessing.get_all_start_methods():
+                raise SessionHostError("Sharing a world by forking needs a platform with fork()")
+            SHARED_LOADER = DataLoader(data_directory, verbose=False)
+            if not SHARED_LOADER.load_all_data():
+                raise SessionHostError(f"Couldn't load {data_directory}")
+            gc.freeze()  # Keep the collector from writing to (and so copying) the world's pages
+            context = multiprocessing.get_context("fork")
+        else:
+            if mode == "mapped":
+                # Build and save the index once so workers only have to open it
+                if not DataLoader(data_directory, verbose=False, lazy=True).load_all_data():
+                    raise SessionHostError(f"Couldn't load {data_directory}")
+            context = multiprocessing.get_context("spawn")
+
+        try:
+            for _ in range(self.worker_count):
+                host_end, worker_end = context.Pipe()
+                process = context.Process(target=worker_main, daemon=True,
+                                          args=(worker_end, data_directory, mode, cache_size))
+                process.start()
+                worker_end.close()
+                self.connections.append(host_end)
+                self.processes.append(process)
+            for connection in self.connections:
+                self.receive(connection)  # Each worker reports once its world is ready
+        except Exception:
+            self.close()
+            raise
+        finally:
+            if mode == "fork":
+                SHARED_LOADER = None
+                gc.unfreeze()
+
+    def worker_for(self, session_id):
+        """
+        The worker a session always runs on
+        crc32 rather than hash() so routing doesn't change between runs
+        """
+        return zlib.crc32(str(session_id).encode("utf-8")) % self.worker_count
+
+    def receive(self, connection):
+        """
+        Wait for one reply from a worker
+        """
+        try:
+            status, result = connection.recv()
+        except EOFError:
+            raise SessionHostError("A worker process died")
+        if status != "ok":
+            raise SessionHostError(result)
+        return result
+
+    def run_batch(self, requests):
+        """
+        Run [(session id, command), ...] across the workers, returning the replies in order
+        A command of None opens the session and returns its opening text. Every
+        worker gets its share in one message and they all run at the same time.
+        A command that fails (like one for a session that was never opened)
+        gets a SessionHostError in its place; only a worker dying raises.
+        """
+        shares = [[] for _ in range(self.worker_count)]
+        positions = [[] for _ in range(self.worker_count)]
+        for position, (session_id, command) in enumerate(requests):
+            worker = self.worker_for(session_id)
+            shares[worker].append((session_id, command))
+            positions[worker].append(position)
+        busy = [worker for worker in range(self.worker_count) if shares[worker]]
+        for worker in busy:
+            self.connections[worker].send(("run", shares[worker]))
+        replies = [None] * len(requests)
+        error = None
+        for worker in busy:
+            try:
+                for position, (status, text) in zip(positions[worker], self.receive(self.connections[worker])):
+                    replies[position] = text if status == "ok" else SessionHostError(text)
+            except SessionHostError as e:
+                error = error or e  # Keep collecting so no reply is left in a pipe
+        if error is not None:
+            raise error
+        return replies
+
+    def open(self, session_id):
+        """
+        Start a new game for a session, returning its opening text
+        """
+        return reply_text(self.run_batch([(session_id, None)])[0])
+
+    def send(self, session_id, command):
+        """
+        Run one command for a session, returning what the game said
+        """
+        return reply_text(self.run_batch([(session_id, command)])[0])
+
+    def end(self, session_ids):
+        """
+        Forget finished sessions
+        """
+        shares = [[] for _ in range(self.worker_count)]
+        for session_id in session_ids:
+            shares[self.worker_for(session_id)].append(session_id)
+        for worker, share in enumerate(shares):
+            if share:
+                self.connections[worker].send(("end", share))
+                self.receive(self.connections[worker])
+
+    def stats(self):
+        """
+        Sessions and memory use (KiB) for every worker
+        """
+        for connection in self.connections:
+            connection.send(("stats", None))
+        return [self.receive(connection) for connection in self.connections]
+
+    def close(self):
+        """
+        Stop every worker
+        """
+        for connection, process in zip(self.connections, self.processes):
+            try:
+                connection.send(("stop", None))
+                connection.recv()
+            except (OSError, EOFError):
+                pass
+            connection.close()
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.connections = []
+        self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,212 @@
+"""
+Turbo's Quest - Session Store
+Hosts huge numbers of sessions in a fixed memory budget by spilling idle ones to disk
+
+Only the most recently used sessions keep a live GameEngine. When the
+resident sessions would go over the memory budget, the least recently used
+ones are packed with GameEngine.snapshot() (a few dozen bytes each) and
+written to a local SQLite file; the next command for a spilled session pages
+it back in transparently. Because only the resident sessions are ever in
+memory, a million mostly idle players cost what the hot ones cost, plus the
+disk file.
+
+Spilling keeps a session's game but not its undo history, which starts over
+when it's paged back in (just like loading a save).
+
+    store = SessionStore(loader, "sessions.db", memory_budget=64 * 1024 * 1024)
+    print(store.open("alice"))
+    print(store.send("alice", "kitchen"))
+    print(store.stats())
+    store.close()
+"""
+
+import sqlite3
+import time
+import tracemalloc
+from collections import OrderedDict
+
+from main import GameEngine, SnapshotError
+
+
+# Resident sessions are spilled down to this fraction of the budget at a time,
+# so evictions happen in batches (one transaction) rather than one per command
+LOW_WATER = 0.9
+
+# Page-in latencies kept for percentiles (the most recent ones)
+LATENCY_SAMPLES = 100000
+
+
+def session_size(data_loader, samples=200):
+    """
+    Roughly how many bytes one resident session takes, measured by starting some
+    """
+    engines = OrderedDict()  # Kept the way SessionStore keeps them, so the bookkeeping counts too
+    tracing = tracemalloc.is_tracing()  # Someone else's trace is left running
+    if not tracing:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for number in range(samples):
+        engine = engines[f"session-{number}"] = GameEngine(data_loader, headless=True)
+        engine.new_game()
+    size = (tracemalloc.get_traced_memory()[0] - before) / samples
+    if not tracing:
+        tracemalloc.stop()
+    for engine in engines.values():
+        release(engine)
+    return max(1, int(size))
+
+
+def release(engine):
+    """
+    Let go of an engine straight away
+    Its Player speaks through the engine's say(), a reference cycle that would
+    otherwise wait for the garbage collector.
+    """
+    engine.data_loader.sessions.discard(engine)
+    engine.player = None
+    engine.history = None
+
+
+class SessionStore:
+    """
+    Sessions by id: the hot ones resident, the rest spilled to SQLite
+    """
+    def __init__(self, data_loader, path="sessions.db", memory_budget=64 * 1024 * 1024, max_resident=None):
+        self.data_loader = data_loader
+        self.path = path
+        if max_resident is None:
+            max_resident = memory_budget // session_size(data_loader)
+        self.max_resident = max(1, int(max_resident))
+        self.resident = OrderedDict()  # Session id -> GameEngine, least recently used first
+
+        self.database = sqlite3.connect(path, isolation_level=None)
+        self.database.execute("PRAGMA journal_mode=WAL")
+        self.database.execute("PRAGMA synchronous=NORMAL")  # Durable across crashes of this process
+        self.database.execute("CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, state BLOB NOT NULL)")
+
+        # Counters
+        self.hits = 0  # Commands for a session that was already resident
+        self.misses = 0  # Commands that had to page a session in
+        self.evicted = 0  # Sessions spilled to disk
+        self.page_ins = []  # Recent page-in latencies in ns
+
+    def open(self, session_id):
+        """
+        Start a new game for a session (replacing any earlier one), returning its opening text
+        """
+        engine = GameEngine(self.data_loader, headless=True)
+        text = engine.new_game()
+        old = self.resident.pop(session_id, None)
+        if old is not None:
+            release(old)
+        self.resident[session_id] = engine
+        self.make_room()
+        return text
+
+    def send(self, session_id, command):
+        """
+        Run one command for a session, paging it in if it was spilled
+        Raises KeyError for a session that was never opened.
+        """
+        engine = self.resident.get(session_id)
+        if engine is not None:
+            self.hits += 1
+            self.resident.move_to_end(session_id)
+        else:
+            engine = self.page_in(session_id)
+        return engine.process_command(command)
+
+    def page_in(self, session_id):
+        """
+        Bring a spilled session back into memory
+        """
+        start = time.perf_counter_ns()
+        row = self.database.execute("SELECT state FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            raise KeyError(session_id)
+        engine = GameEngine(self.data_loader, headless=True)
+        try:
+            engine.restore(row[0])
+        except SnapshotError:
+            # Spilled before the game data changed shape - the only safe thing is a fresh start,
+            # with its opening text queued for the session's next turn
+            opening = engine.new_game()
+            engine.say("✨ The house has changed so much since your last visit that your adventure starts afresh!")
+            engine.say(opening.rstrip("\n"))
+        self.resident[session_id] = engine
+        self.misses += 1
+        self.page_ins.append(time.perf_counter_ns() - start)
+        if len(self.page_ins) > 2 * LATENCY_SAMPLES:
+            del self.page_ins[:LATENCY_SAMPLES]
+        self.make_room()
+        return engine
+
+    def make_room(self):
+        """
+        Spill least recently used sessions once there are too many resident
+        """
+        if len(self.resident) > self.max_resident:
+            self.spill(len(self.resident) - int(self.max_resident * LOW_WATER))
+
+    def spill(self, count):
+        """
+        Write the `count` least recently used resident sessions to disk and drop them
+        """
+        rows = []
+        while count > 0 and self.resident:
+            session_id, engine = self.resident.popitem(last=False)
+            rows.append((session_id, engine.snapshot()))
+            release(engine)
+            count -= 1
+        if rows:
+            with self.database:
+                self.database.execute("BEGIN")
+                self.database.executemany("INSERT OR REPLACE INTO sessions (id, state) VALUES (?, ?)", rows)
+            self.evicted += len(rows)
+
+    def end(self, session_id):
+        """
+        Forget a session entirely, in memory and on disk
+        """
+        engine = self.resident.pop(session_id, None)
+        if engine is not None:
+            release(engine)
+        self.database.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def __contains__(self, session_id):
+        if session_id in self.resident:
+            return True
+        return self.database.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() is not None
+
+    def stats(self):
+        """
+        Counters, resident and spilled session counts, and page-in latency percentiles (ns)
+        """
+        latencies = sorted(self.page_ins[-LATENCY_SAMPLES:])
+
+        def percentile(fraction):
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] if latencies else 0
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+            "resident": len(self.resident),
+            "max_resident": self.max_resident,
+            "stored": self.database.execute("SELECT COUNT(*) FROM sessions").fetchone()[0],
+            "page_in_p50": percentile(0.50),
+            "page_in_p99": percentile(0.99),
+        }
+
+    def close(self):
+        """
+        Spill every resident session so nothing is lost, then close the store
+        """
+        self.spill(len(self.resident))
+        self.database.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Turbo's Quest - Quest Solver
+Proves the quest can still be won after story edits, without anyone playing it
+
+The solver explores every reachable game state from the starting location,
+following exits and special actions exactly the way GameEngine does.
+It reports the shortest winning command sequence, states from which the quest
+can no longer be won, and rooms or actions that can never be reached.
+
+Most rooms are only ever walked through, so Turbo is only tracked in the rooms
+where something can happen (stops) and walks between them count as several
+commands at once. The search grows with the number of stops times the ways
+the quest can progress, not with the size of the house.
+
+Run it with:
+    python solver.py [--data DIR] [--workers N]
+"""
+
+import argparse
+import multiprocessing
+import sys
+import time
+
+from commands import ACTION, MOVE
+from main import DataLoader, GameEngine, iter_bits
+from rules import GIVE_ITEM, TAKE_ITEM, TRIGGER_REVELATION, WIN_GAME, failed_requirement, footprint
+
+
+# Progress flags kept in each state
+REALIZED = 1  # 'examine all items' has worked (size realization)
+REVEALED = 2  # Maxwell's secret has been revealed
+WON = 4  # The game is won - nothing more to explore
+
+# Levels with fewer states than this are cheaper to expand in-process
+PARALLEL_FRONTIER = 5000
+
+# The command that triggers the size realization
+EXAMINE_ITEMS = "examine all items"
+
+# Set in worker processes (inherited when forked) so states can be expanded there
+MODEL = None
+
+
+class StateView:
+    """
+    The parts of a Player that requirements look at, filled in from a solver state
+    """
+    __slots__ = ("inventory", "visited_locations", "completed_actions",
+                 "size_realization_triggered", "revelation_triggered")
+
+    def __init__(self, state):
+        _, self.inventory, self.completed_actions, flags, self.visited_locations = state
+        self.size_realization_triggered = bool(flags & REALIZED)
+        self.revelation_triggered = bool(flags & REVEALED)
+
+
+class QuestModel:
+    """
+    The game rules reduced to the state that decides whether the quest can be won
+
+    A state is (location id, inventory bits, completed action bits, flags,
+    visited location bits). Only items that some requirement needs (plus the
+    quest items) are tracked, only rooms some requirement asks about remember
+    being visited, and only actions whose outcome depends on progress (or that
+    some requirement asks about) remember being completed; text-only details
+    never change what's winnable, so leaving them out keeps the state space small.
+    """
+    def __init__(self, world):
+        self.world = world
+        self.quest_mask = world.quest_mask
+
+        # Items, rooms and actions anything actually depends on
+        items, visited, completed, _ = footprint([requirement for action in world.actions if action is not None
+                                                  for requirement in action.requirements])
+        relevant_items = world.quest_mask | items
+        self.relevant_visited = visited
+        # Once an item can be taken away, giving it again is no longer harmless
+        takeable = 0
+        for action in world.actions:
+            if action is not None:
+                for effect in action.effects:
+                    if effect.op == TAKE_ITEM:
+                        takeable |= 1 << effect.item
+
+        # Per action: (required items or None to check every requirement, effect steps, remembers completion)
+        self.rules = [None] * len(world.actions)
+        for action in world.actions:
+            if action is None:
+                continue
+            steps = []
+            gained = 0
+            for effect in action.effects:
+                if effect.op in (GIVE_ITEM, TAKE_ITEM):
+                    steps.append((effect.op, (1 << effect.item) & relevant_items))
+                    if effect.op == GIVE_ITEM:
+                        gained |= 1 << effect.item
+                elif effect.op in (TRIGGER_REVELATION, WIN_GAME):
+                    steps.append((effect.op, 0))
+            # Giving items is idempotent, so only progress-dependent effects need the repeat check
+            tracked = not action.repeatable and (any(effect.op != GIVE_ITEM for effect in action.effects) or
+                                                 gained & takeable or completed >> action.id & 1 == 1)
+            self.rules[action.id] = (action.required_items, tuple(steps), tracked)
+
+        # Per location: the first command for every exit and action that works there
+        self.commands = [None] * len(world.locations)
+        for location in world.locations:
+            if location is None:
+                continue
+            # Commands shadowed by a global command (or an exit, for actions) never run
+            moves = {}
+            for exit_name, destination in location.exits.items():
+                if location.commands.exact.get(exit_name) == (MOVE, destination):
+                    moves.setdefault(destination, exit_name)
+            actions = {}
+            for command, action_id in location.actions.items():
+                if location.commands.exact.get(command) == (ACTION, action_id):
+                    actions.setdefault(action_id, command)
+            self.commands[location.id] = (
+                [(command, destination) for destination, command in moves.items()],
+                [(command, action_id) for action_id, command in actions.items()],
+            )
+
+        # Rooms where something can happen: the start, rooms requirements ask about
+        # visiting, and rooms with an action that changes progress or depends on it.
+        # Everywhere else Turbo can only walk through, so the solver jumps between these
+        self.stops = bytearray(len(world.locations))
+        if world.starting_location is not None:
+            self.stops[world.starting_location] = 1
+        incoming = [[] for _ in world.locations]
+        for location in world.locations:
+            if location is None:
+                continue
+            moves, actions = self.commands[location.id]
+            for _, destination in moves:
+                incoming[destination].append(location.id)
+            if self.relevant_visited >> location.id & 1:
+                self.stops[location.id] = 1
+            for _, action_id in actions:
+                _, steps, tracked = self.rules[action_id]
+                if (tracked or world.actions[action_id].requirements or
+                        any(bits or op in (TRIGGER_REVELATION, WIN_GAME) for op, bits in steps)):
+                    self.stops[location.id] = 1
+        # Rooms with no way back to any of those are dead ends, so they're kept as stops to be reported
+        escapes = bytearray(self.stops)
+        frontier = [room for room, stop in enumerate(self.stops) if stop]
+        while frontier:
+            following = []
+            for room in frontier:
+                for source in incoming[room]:
+                    if not escapes[source]:
+                        escapes[source] = 1
+                        following.append(source)
+            frontier = following
+        for location in world.locations:
+            if location is not None and not escapes[location.id]:
+                self.stops[location.id] = 1
+        self.legs_from = {}  # Stop -> [(next stop, moves to get there)], worked out on first use
+
+    def start(self):
+        """
+        The state at the start of a new game
+        """
+        start = self.world.starting_location
+        return (start, 0, 0, 0, (1 << start) & self.relevant_visited)
+
+    def has_every_quest_item(self, inventory):
+        """
+        Whether Turbo carries every quest item (never, in a world without any - like the engine)
+        """
+        return self.quest_mask != 0 and inventory & self.quest_mask == self.quest_mask
+
+    def finish_turn(self, inventory, flags):
+        """
+        The end-of-turn check: understanding plus every quest item reveals the secret
+        """
+        if flags & REALIZED and not flags & REVEALED and self.has_every_quest_item(inventory):
+            flags |= REVEALED | WON
+        return flags
+
+    def successors(self, state):
+        """
+        Yield (command, next state, action id or None) for every move that changes something
+        An action id is included whenever the action actually runs, even if the
+        state doesn't change, so unreachable actions can be reported.
+        """
+        location, inventory, completed, flags, visited = state
+        moves, actions = self.commands[location]
+
+        for command, destination in moves:
+            yield command, (destination, inventory, completed, self.finish_turn(inventory, flags),
+                            visited | (1 << destination) & self.relevant_visited), None
+        yield from self.progress(state)
+
+    def progress(self, state):
+        """
+        Yield (command, next state, action id or None) for every command that isn't a move (see successors)
+        """
+        location, inventory, completed, flags, visited = state
+        for command, action_id in self.commands[location][1]:
+            required, steps, tracked = self.rules[action_id]
+            if completed >> action_id & 1:
+                continue
+            if required is None:
+                if failed_requirement(self.world.actions[action_id], StateView(state)) is not None:
+                    continue
+            elif required & ~inventory:
+                continue
+            new_inventory = inventory
+            new_flags = flags
+            for op, bits in steps:
+                if op == GIVE_ITEM:
+                    new_inventory |= bits
+                elif op == TAKE_ITEM:
+                    new_inventory &= ~bits
+                elif op == TRIGGER_REVELATION and flags & REALIZED:
+                    new_flags |= REVEALED
+                elif op == WIN_GAME:
+                    new_flags |= WON
+            new_completed = completed | (1 << action_id) if tracked else completed
+            if not new_flags & WON:
+                new_flags = self.finish_turn(new_inventory, new_flags)
+            yield command, (location, new_inventory, new_completed, new_flags, visited), action_id
+
+        if self.has_every_quest_item(inventory) and not flags & REALIZED:
+            yield EXAMINE_ITEMS, (location, inventory, completed,
+                                  self.finish_turn(inventory, flags | REALIZED), visited), None
+
+    def walk(self, start):
+        """
+        Every room reachable from `start` without walking through another stop, as room -> (moves, previous room)
+        """
+        stops, commands = self.stops, self.commands
+        reached = {start: (0, None)}
+        frontier = [start]
+        while frontier:
+            following = []
+            for room in frontier:
+                if room != start and stops[room]:
+                    continue
+                distance = reached[room][0] + 1
+                for _, destination in commands[room][0]:
+                    if destination not in reached:
+                        reached[destination] = (distance, room)
+                        following.append(destination)
+            frontier = following
+        return reached
+
+    def legs(self, stop):
+        """
+        The stops Turbo can walk to from `stop` without passing another one, with the moves it takes
+        Walking past a stop is the same as stopping there and carrying on, so these are all the solver needs.
+        """
+        legs = self.legs_from.get(stop)
+        if legs is None:
+            legs = self.legs_from[stop] = [(room, distance) for room, (distance, _) in self.walk(stop).items()
+                                           if room != stop and self.stops[room]]
+        return legs
+
+    def leg_commands(self, start, destination):
+        """
+        The exit commands of the shortest walk between two neighbouring stops
+        """
+        reached = self.walk(start)
+        rooms = [destination]
+        while rooms[-1] != start:
+            rooms.append(reached[rooms[-1]][1])
+        rooms.reverse()
+        return [next(command for command, target in self.commands[room][0] if target == following)
+                for room, following in zip(rooms, rooms[1:])]
+
+    def jumps(self, state):
+        """
+        Yield (command or None for a walk, next state, action id or None, commands it takes) from a stop
+        Like successors(), but moves go straight to the next stops (see legs()).
+        """
+        location, inventory, completed, flags, visited = state
+        flags = self.finish_turn(inventory, flags)
+        for destination, distance in self.legs(location):
+            yield None, (destination, inventory, completed, flags,
+                         visited | (1 << destination) & self.relevant_visited), None, distance
+        for command, next_state, action_id in self.progress(state):
+            yield command, next_state, action_id, 1
+
+    def describe(self, state):
+        """
+        A readable summary of a state for reports
+        """
+        location, inventory, completed, flags, _ = state
+        items = [self.world.items[item_id].key for item_id in iter_bits(inventory)]
+        text = f"in {self.world.locations[location].key} carrying [{', '.join(items)}]"
+        if flags & REALIZED:
+            text += ", realized"
+        if flags & REVEALED:
+            text += ", revealed"
+        return text
+
+
+def expand(states):
+    """
+    Expand a chunk of states in a worker process
+    """
+    return [(state, list(MODEL.jumps(state))) for state in states]
+
+
+class SolverReport:
+    """
+    Everything the solver found out about a world
+    """
+    def __init__(self):
+        self.winning_path = None  # Shortest list of commands that wins, or None
+        self.states = 0  # Distinct reachable states (at stops, see QuestModel.legs)
+        self.dead_ends = []  # Reachable states (at stops) from which the quest can't be won
+        self.unreachable_locations = []  # Location keys never reached
+        self.unreachable_actions = []  # Special action keys that can never run
+        self.seconds = 0.0
+
+
+def solve(world, workers=1, max_states=5000000):
+    """
+    Explore every reachable state of `world`, nearest first
+    Turbo only stops in rooms where something can happen (see QuestModel.legs),
+    so the search grows with those rather than with every room in the house;
+    walks cost as many commands as they take, so states come out in order of
+    the fewest commands to reach them. Batches of states the same distance
+    away are split across a process pool once they're big enough to be worth
+    it. Returns a SolverReport.
+    """
+    global MODEL
+    started = time.perf_counter()
+    model = QuestModel(world)
+    MODEL = model
+
+    start = model.start()
+    parents = {start: None}  # state -> (previous state, command, or None for a walk)
+    distances = {start: 0}  # state -> fewest commands found so far
+    edges = {}  # state -> next states, for finding dead ends afterwards
+    performed = set()  # Action ids that ran at least once
+    winning_state = None
+    pending = {0: [start]}  # Commands from the start -> states to expand at that distance
+
+    pool = None
+    if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+        # Forked workers inherit MODEL, so the world is never re-sent
+        pool = multiprocessing.get_context("fork").Pool(workers)
+    try:
+        while pending and len(parents) < max_states:
+            distance = min(pending)
+            # A state queued again once a shorter way to it turned up is only expanded the first time
+            frontier = [state for state in pending.pop(distance) if state not in edges and distances[state] == distance]
+            if pool is not None and len(frontier) >= PARALLEL_FRONTIER:
+                chunk_size = max(1, len(frontier) // (workers * 4))
+                chunks = [frontier[i:i + chunk_size] for i in range(0, len(frontier), chunk_size)]
+                expanded = [pair for result in pool.map(expand, chunks) for pair in result]
+            else:
+                expanded = [(state, list(model.jumps(state))) for state in frontier]
+
+            for state, successors in expanded:
+                if state in edges:
+                    continue
+                if state[3] & WON:
+                    if winning_state is None:
+                        winning_state = state
+                    edges[state] = ()
+                    continue
+                targets = []
+                for command, next_state, action_id, cost in successors:
+                    if action_id is not None:
+                        performed.add(action_id)
+                    if next_state == state:
+                        continue
+                    targets.append(next_state)
+                    if distances.get(next_state, distance + cost + 1) <= distance + cost:
+                        continue
+                    parents[next_state] = (state, command)
+                    distances[next_state] = distance + cost
+                    pending.setdefault(distance + cost, []).append(next_state)
+                edges[state] = targets
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    report = SolverReport()
+    report.states = len(parents)
+
+    if winning_state is not None:
+        path = []
+        state = winning_state
+        while parents[state] is not None:
+            previous, command = parents[state]
+            path.extend([command] if command is not None else model.leg_commands(previous[0], state[0])[::-1])
+            state = previous
+        report.winning_path = path[::-1]
+
+    # Walk backwards from every winning state; anything never reached is a dead end
+    predecessors = {}
+    for state, targets in edges.items():
+        for target in targets:
+            predecessors.setdefault(target, []).append(state)
+    can_win = {state for state in parents if state[3] & WON}
+    stack = list(can_win)
+    while stack:
+        for previous in predecessors.get(stack.pop(), ()):
+            if previous not in can_win:
+                can_win.add(previous)
+                stack.append(previous)
+    if not pending:  # Only meaningful once the whole space has been explored
+        report.dead_ends = [state for state in parents if state not in can_win]
+
+    # Every room on the way between stops was reached too, and so was any action there (none of them need anything)
+    reached = set()
+    for stop in {state[0] for state in parents}:
+        reached.update(model.walk(stop))
+    for room in reached:
+        if not model.stops[room]:
+            performed.update(action_id for _, action_id in model.commands[room][1])
+    report.unreachable_locations = [location.key for location in world.locations
+                                    if location is not None and location.id not in reached]
+    report.unreachable_actions = [action.key for action in world.actions
+                                  if action is not None and action.id not in performed]
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def verify_path(data_loader, path):
+    """
+    Replay a winning path through a real headless GameEngine
+    """
+    engine = GameEngine(data_loader, headless=True)
+    engine.new_game()
+    for command in path:
+        engine.process_command(command)
+    return engine.game_won
+
+
+def main():
+    """
+    Solve the game data and print a report (exit status 1 if it can't be won)
+    """
+    parser = argparse.ArgumentParser(description="Prove Turbo's Quest can be won")
+    parser.add_argument("--data", default="data", help="game data directory")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(),
+                        help="processes for big search levels (default: all cores)")
+    parser.add_argument("--max-states", type=int, default=5000000,
+                        help="stop exploring after this many states")
+    args = parser.parse_args()
+
+    loader = DataLoader(args.data, verbose=False)
+    if not loader.load_all_data():
+        sys.exit(2)
+
+    report = solve(loader.world, workers=args.workers, max_states=args.max_states)
+    model = QuestModel(loader.world)
+    print(f"🔎 Explored {report.states} states in {report.seconds:.2f}s")
+
+    if report.winning_path is None:
+        print("❌ The quest can't be won!")
+    else:
+        verified = "verified" if verify_path(loader, report.winning_path) else "NOT confirmed by the engine"
+        print(f"🏆 Shortest win: {len(report.winning_path)} commands ({verified})")
+        for number, command in enumerate(report.winning_path, 1):
+            print(f"  {number:>3}. {command}")
+
+    if report.dead_ends:
+        print(f"\n⚠️  {len(report.dead_ends)} dead-end states (the quest can't be won from here):")
+        for state in report.dead_ends[:10]:
+            print(f"  - {model.describe(state)}")
+        if len(report.dead_ends) > 10:
+            print(f"  ... and {len(report.dead_ends) - 10} more")
+    if report.unreachable_locations:
+        print(f"\n⚠️  Unreachable rooms: {', '.join(report.unreachable_locations)}")
+    if report.unreachable_actions:
+        print(f"\n⚠️  Actions that can never run: {', '.join(report.unreachable_actions)}")
+
+    sys.exit(0 if report.winning_path is not None else 1)
+
+
+if __name__ == "__main__":
+    main()
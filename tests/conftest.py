@@ -0,0 +1,44 @@
+"""
+Shared fixtures for the Turbo's Quest tests
+"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from main import DataLoader  # noqa: E402
+
+
+DATA_DIRECTORY = os.path.join(ROOT, "data")
+
+
+def load(data_directory, **options):
+    """
+    A loaded DataLoader that doesn't print or write a cache
+    """
+    loader = DataLoader(data_directory, use_cache=False, verbose=False, **options)
+    assert loader.load_all_data()
+    return loader
+
+
+@pytest.fixture
+def loader():
+    """
+    The shipped world, loaded fresh for each test
+    """
+    return load(DATA_DIRECTORY)
+
+
+@pytest.fixture
+def data_copy(tmp_path):
+    """
+    A copy of the shipped data directory that a test can edit
+    """
+    directory = tmp_path / "data"
+    shutil.copytree(DATA_DIRECTORY, directory)
+    return str(directory)
@@ -0,0 +1,38 @@
+"""
+Tests for play analytics: simulated players against the exactly solved chain
+"""
+
+import json
+import os
+
+import pytest
+
+import analytics
+from conftest import load
+from worldgen import write_world
+
+pytestmark = pytest.mark.skipif(analytics.np is None, reason="play analytics need NumPy")
+
+
+def test_simulated_players_agree_with_the_exact_solution(tmp_path):
+    write_world(str(tmp_path), rooms=8, exits=2, actions=1, chain_length=2, quest_items=1, seed=3)
+    # A pit with no way out next to the start, so plenty of players never win
+    path = os.path.join(str(tmp_path), "locations.json")
+    with open(path, encoding="utf-8") as f:
+        locations = json.load(f)
+    locations["pit"] = {"name": "Pit", "description": "A deep pit.", "exits": {}}
+    locations["room_0"]["exits"]["pit"] = "pit"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(locations, f)
+
+    model = analytics.PlayModel(load(str(tmp_path)).world)
+    assert analytics.STUCK in model.status
+    win_chance, expected_turns = analytics.solve_exactly(model)
+    assert 0.2 < win_chance < 0.8
+
+    result = analytics.simulate(model, players=100000, max_turns=5000, seed=1)
+    assert result.wandering == 0
+    assert len(result.turns_to_win) + result.stuck == result.players
+    assert len(result.turns_to_win) / result.players == pytest.approx(win_chance, abs=0.01)
+    assert result.turns_to_win.mean() == pytest.approx(expected_turns, rel=0.03)
+    assert result.room_visits.sum() >= result.players * expected_turns * win_chance
@@ -0,0 +1,56 @@
+"""
+Tests for command lookup, prefixes and typo suggestions
+"""
+
+import pytest
+
+from commands import ACTION, GLOBAL, MOVE, CommandIndex, TypoIndex
+
+
+@pytest.fixture
+def index():
+    return CommandIndex({
+        "kitchen": (MOVE, 1),
+        "sniff around": (ACTION, 0),
+        "follow maxwell's gaze": (ACTION, 2),
+        "save": (GLOBAL, "save"),
+        "quit": (GLOBAL, "quit"),
+        "undo": (GLOBAL, "undo"),
+        "help": (GLOBAL, "help"),
+    })
+
+
+def test_unique_prefixes_resolve(index):
+    assert index.resolve("kit") == (MOVE, 1)
+    assert index.resolve("sn") == (ACTION, 0)
+    assert index.resolve("he") == (GLOBAL, "help")
+
+
+@pytest.mark.parametrize("prefix", ["q", "qu", "sa", "u", "und"])
+def test_game_changing_commands_need_the_whole_word(index, prefix):
+    assert index.resolve(prefix) is None
+    assert index.suggest(prefix)  # ...but the player is told what they probably meant
+
+
+def test_two_typos_are_found(index):
+    assert index.suggest("folow maxwells gaze") == ["follow maxwell's gaze"]
+
+
+def test_typo_index_finds_everything_within_its_depth():
+    phrases = ["examine cabinet", "kitchen", "balcony"]
+    typos = TypoIndex(phrases)
+    for phrase in phrases:
+        twice = phrase[1:-1]  # Two characters gone
+        assert (2, phrase) in typos.search(twice, 2)
+    with pytest.raises(ValueError):
+        typos.search("kitchen", 3)
+
+
+def test_typo_search_stops_at_the_limit_without_changing_the_answer():
+    phrases = [f"examine thing {number:04d}" for number in range(200)]
+    typos = TypoIndex(phrases)
+    for query in ("examine thng 0007", "examine thing 0x07", "exmaine thing 0100", "xamine thin 0042"):
+        everything = typos.search(query, 2)
+        assert everything == sorted(everything)
+        assert typos.search(query, 2, limit=3) == everything[:3]
+    assert typos.search("examine thng 0007", 2, limit=1) == [(1, "examine thing 0007")]
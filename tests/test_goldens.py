@@ -0,0 +1,33 @@
+"""
+Tests for golden transcript checks
+"""
+
+import goldens
+
+
+def test_a_changed_golden_shows_up_as_a_diff(loader, tmp_path):
+    commands = ["look", "kitchen", "get step stool", "inventory"]
+    golden = goldens.record(loader, commands)
+    assert goldens.commands_in(golden) == commands
+
+    matching = tmp_path / "matching.golden"
+    matching.write_text(golden, encoding="utf-8")
+    # The same session, but the game once said something else after "kitchen"
+    lines = golden.split("\n")
+    changed_line = lines.index(goldens.PROMPT + "kitchen") + 1
+    while not lines[changed_line]:
+        changed_line += 1
+    original = lines[changed_line]
+    lines[changed_line] = "Turbo wanders into the wrong room."
+    changed = tmp_path / "changed.golden"
+    changed.write_text("\n".join(lines), encoding="utf-8")
+
+    paths = goldens.find_goldens([str(tmp_path)])
+    assert paths == [str(changed), str(matching)]
+    for workers in (1, 2):
+        results = {path: (played, diff) for path, played, diff in goldens.check_all(loader, paths, workers)}
+        assert results[str(matching)] == (len(commands), "")
+        played, diff = results[str(changed)]
+        assert played == len(commands)
+        assert "-Turbo wanders into the wrong room.\n" in diff
+        assert f"+{original}\n" in diff
@@ -0,0 +1,62 @@
+"""
+Tests for undo, rewind and 'what if' branches
+"""
+
+import os
+
+import goldens
+from main import GameEngine
+
+
+def new_engine(loader, commands=()):
+    """
+    A headless game with `commands` already played
+    """
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    for command in commands:
+        engine.process_command(command)
+    return engine
+
+
+def room(engine):
+    return engine.world.locations[engine.player.current_location].key
+
+
+def test_undo_takes_back_one_move(loader):
+    engine = new_engine(loader, ["kitchen", "get step stool"])
+    before = engine.history_state()
+    engine.process_command("balcony")
+    engine.process_command("undo")
+    assert engine.history_state() == before
+
+
+def test_rewind_takes_back_several_moves(loader):
+    engine = new_engine(loader, ["kitchen"])
+    engine.process_command("balcony")
+    engine.process_command("garden")
+    engine.process_command("rewind 2")
+    assert room(engine) == "kitchen"
+
+
+def test_what_if_leaves_the_game_as_it_was(loader):
+    engine = new_engine(loader, ["kitchen"])
+    before = engine.history_state()
+    output = engine.process_command("what if get step stool; balcony")
+    assert "snaps back to reality" in output
+    assert engine.history_state() == before
+
+
+def test_what_if_cant_save_load_or_quit(loader, tmp_path):
+    engine = new_engine(loader, ["kitchen"])
+    engine.save_directory = str(tmp_path)
+    output = engine.process_command("what if save; load; save branch; quit")
+    assert output.count("just imagining") == 4
+    assert os.listdir(tmp_path) == []
+    assert engine.game_running
+
+
+def test_what_if_transcripts_pass_their_own_check(loader, tmp_path):
+    path = tmp_path / "branch.golden"
+    path.write_text(goldens.record(loader, ["kitchen", "what if balcony", "look"]), encoding="utf-8")
+    assert goldens.check(loader, str(path)) == (str(path), 3, "")
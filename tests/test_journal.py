@@ -0,0 +1,66 @@
+"""
+Tests for journaled sessions and crash recovery
+"""
+
+import os
+import time
+
+from journal import TURN, Journal, JournaledSession, read_journal
+
+COMMANDS = ["kitchen", "get step stool", "balcony", "examine storage box"]
+
+
+def test_recover_replays_every_turn(loader, tmp_path):
+    path = str(tmp_path / "turbo.journal")
+    session, _ = JournaledSession.start(loader, path)
+    for command in COMMANDS:
+        session.process_command(command)
+    session.close()
+    recovered, report = JournaledSession.recover(loader, path)
+    assert recovered.engine.history_state() == session.engine.history_state()
+    assert report.replayed > 0
+    recovered.close()
+
+
+def test_a_torn_record_is_dropped(loader, tmp_path):
+    path = str(tmp_path / "turbo.journal")
+    session, _ = JournaledSession.start(loader, path)
+    for command in COMMANDS[:-1]:
+        session.process_command(command)
+    session.journal.commit()
+    before_crash = session.engine.history_state()
+    session.process_command(COMMANDS[-1])
+    session.close()
+    with open(path, "r+b") as file:
+        file.truncate(os.path.getsize(path) - 3)  # A crash halfway through the last write
+    recovered, _ = JournaledSession.recover(loader, path)
+    assert recovered.engine.history_state() == before_crash
+    recovered.close()
+
+
+def test_an_idle_journal_still_commits(tmp_path):
+    path = str(tmp_path / "idle.journal")
+    journal = Journal(path, batch_size=100, flush_interval=0.01, fsync=False)
+    journal.append(TURN, b"\x00\x00")
+    deadline = time.monotonic() + 5
+    while journal.commits == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(read_journal(path)[2]) == 1  # Written without another append or close
+    journal.close()
+
+
+def test_undo_after_recovery_stays_in_the_recovered_game(loader, tmp_path):
+    path = str(tmp_path / "turbo.journal")
+    session, _ = JournaledSession.start(loader, path)
+    for command in COMMANDS:
+        session.process_command(command)
+    session.close()
+    recovered, _ = JournaledSession.recover(loader, path)
+    engine = recovered.engine
+    where = engine.history_state()
+    recovered.process_command("kitchen")
+    recovered.process_command("undo")
+    assert engine.history_state() == where
+    recovered.process_command("undo")  # Nothing before the recovered game to go back to
+    assert engine.history_state() == where
+    recovered.close()
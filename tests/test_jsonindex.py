@@ -0,0 +1,66 @@
+"""
+Tests for byte-offset JSON indexes and the lazy worlds loaded through them
+"""
+
+import json
+
+from conftest import load
+from jsonindex import JsonIndex
+from main import GameEngine
+
+# Brackets, braces, quotes and escapes inside strings must not confuse the scan
+AWKWARD = {
+    "plain": {"name": "Plain"},
+    "brackets": {"name": "Bracket [room] {with} \"quotes\"", "list": [1, [2, {"three": 3}]]},
+    "escaped \"key\"": "a string value with a \\ backslash",
+    "unicode": {"name": "Café 🐾"},
+    "empty": {},
+    "number": 42,
+}
+
+TRANSCRIPT = ["kitchen", "get step stool", "jump on counter", "balcony", "examine storage box",
+              "garden", "dig here", "tool shed", "unlock shed", "examine all items"]
+
+
+def test_members_parse_exactly_like_the_whole_file(tmp_path):
+    path = tmp_path / "awkward.json"
+    path.write_text(json.dumps({"before": 1, "story": AWKWARD}, indent=1, ensure_ascii=False), encoding="utf-8")
+    index = JsonIndex(str(path), member="story").build()
+    assert list(index) == list(AWKWARD)
+    assert {key: index[key] for key in index} == AWKWARD
+    assert "plain" in index and "before" not in index
+    index.close()
+
+
+def described(world, location):
+    """
+    A compiled room with every id swapped for the key it stands for
+    """
+    return (location.key, location.name, location.description,
+            {name: world.locations[destination].key for name, destination in location.exits.items()},
+            {command: world.actions[action_id].key for command, action_id in location.actions.items()})
+
+
+def test_lazy_worlds_match_eager_ones(data_copy):
+    eager = load(data_copy)
+    lazy = load(data_copy, lazy=True, cache_size=2)  # Small enough that rooms get dropped and compiled again
+    assert list(lazy.world.location_ids) == list(eager.world.location_ids)
+    for world in (eager.world, lazy.world):
+        assert world.starting_location == eager.world.starting_location
+    for key, location_id in eager.world.location_ids.items():
+        assert (described(lazy.world, lazy.world.locations[lazy.world.location_ids[key]]) ==
+                described(eager.world, eager.world.locations[location_id]))
+    for key, action_id in eager.world.action_ids.items():
+        eager_action = eager.world.actions[action_id]
+        lazy_action = lazy.world.actions[lazy.world.action_ids[key]]
+        assert lazy_action.description == eager_action.description
+        assert lazy_action.required_items == eager_action.required_items
+        assert [effect.type for effect in lazy_action.effects] == [effect.type for effect in eager_action.effects]
+
+    outputs = []
+    for loader in (eager, lazy):
+        engine = GameEngine(loader, headless=True)
+        outputs.append([engine.new_game()] + [engine.process_command(command) for command in TRANSCRIPT])
+        assert engine.game_won
+    assert outputs[0] == outputs[1]
+    assert lazy.world.locations.misses > len(lazy.world.locations)  # Rooms really were compiled more than once
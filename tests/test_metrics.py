@@ -0,0 +1,36 @@
+"""
+Tests for turn metrics
+"""
+
+from main import GameEngine
+from metrics import MAX_INVALID_LABELS
+
+
+def instrumented(loader):
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    return engine, engine.enable_metrics()
+
+
+def test_invalid_commands_past_the_limit_are_lumped_together(loader):
+    engine, metrics = instrumented(loader)
+    for number in range(MAX_INVALID_LABELS + 20):
+        engine.process_command(f"bark at {number}")
+    engine.process_command("bark at 0")
+    invalid = metrics.snapshot()["counters"]["invalid_commands"]
+    assert len(invalid) == metrics.invalid_labels == MAX_INVALID_LABELS + 1  # Plus "(other)"
+    assert invalid["(other)"] == 20 and invalid["bark at 0"] == 2
+
+
+def test_a_what_if_turn_is_labelled_as_one(loader):
+    engine, metrics = instrumented(loader)
+    engine.process_command("what if kitchen; blah")
+    assert metrics.last_kind == "what_if"
+    assert set(metrics.snapshot()["timings"]["turn"]) == {"what_if"}
+
+
+def test_branch_commands_dont_relabel_the_turn(loader):
+    engine, metrics = instrumented(loader)
+    engine.process_command("look")
+    engine.what_if(["blah"])  # As if a branch ran partway through a 'look' turn
+    assert metrics.last_kind == "look"
@@ -0,0 +1,81 @@
+"""
+Tests for "go to" trips across eager and lazy worlds
+"""
+
+import json
+
+import pytest
+
+from conftest import load
+from main import GameEngine
+from worldgen import write_world
+
+
+def play(loader, commands):
+    """
+    A new game with `commands` already played, and the output of the last one
+    """
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    output = None
+    for command in commands:
+        output = engine.process_command(command)
+    return engine, output
+
+
+def write_rooms(directory, exits):
+    """
+    A tiny world of bare rooms, `exits` mapping each room key to the keys its exits lead to
+    """
+    locations = {key: {"name": f"Room {key.upper()}", "description": f"Room {key.upper()}.",
+                       "exits": {destination: destination for destination in destinations}}
+                 for key, destinations in exits.items()}
+    story = {"game_settings": {"starting_location": "a"}, "special_actions": {}, "messages": {}}
+    for filename, content in (("locations.json", locations), ("items.json", {}), ("story.json", story)):
+        (directory / filename).write_text(json.dumps(content), encoding="utf-8")
+    return str(directory)
+
+
+# From c, the shortest way back to a is through d, which Turbo never found
+UNKNOWN_SHORTCUT = {"a": ["b"], "b": ["c"], "c": ["d", "b"], "d": ["a"]}
+
+
+@pytest.mark.parametrize("exits, expected", [
+    (UNKNOWN_SHORTCUT, "There's no way to get to the Room A"),
+    ({**UNKNOWN_SHORTCUT, "b": ["a", "c"]}, "You trot through the Room B"),
+])
+def test_go_to_only_crosses_known_rooms(tmp_path, exits, expected):
+    directory = write_rooms(tmp_path, exits)
+    outputs = []
+    for options in ({}, {"lazy": True, "cache_size": 2}):
+        engine, output = play(load(directory, **options), ["b", "c", "go to a"])
+        assert expected in output and "Room D" not in output
+        assert not engine.player.discovered_locations >> engine.world.location_ids["d"] & 1
+        outputs.append(output)
+    assert outputs[0] == outputs[1]
+
+
+def test_go_to_walks_back_through_visited_rooms(loader):
+    engine, output = play(loader, ["bedroom", "living room", "kitchen", "go to bedroom"])
+    assert "You trot through the Living Room" in output
+    assert engine.world.locations[engine.player.current_location].key == "bedroom"
+
+
+def test_lazy_go_to_arrives_without_compiling_the_world(tmp_path):
+    solution = write_world(str(tmp_path), rooms=5000, seed=3)
+    eager_loader = load(str(tmp_path))
+    start = eager_loader.world.locations[eager_loader.world.starting_location].name.lower()
+    commands = [command for command in solution if not command.startswith("#")][:12] + [f"go to {start}"]
+    _, eager = play(eager_loader, commands)
+    lazy_loader = load(str(tmp_path), lazy=True, cache_size=64)
+    engine, lazy = play(lazy_loader, commands[:-1])
+    misses = lazy_loader.world.locations.misses
+    lazy = engine.process_command(commands[-1])
+    assert engine.player.current_location == lazy_loader.world.starting_location
+    assert 0 < eager.count("You trot through") == lazy.count("You trot through")
+    assert lazy_loader.world.locations.misses - misses < 20
+
+
+def test_help_mentions_go_to(loader):
+    _, output = play(loader, ["help"])
+    assert "go to <place>" in output
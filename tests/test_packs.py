@@ -0,0 +1,66 @@
+"""
+Tests for story packs pooled in one registry
+"""
+
+import json
+import os
+import shutil
+
+from packs import PackRegistry
+
+TRANSCRIPT = ["kitchen", "get step stool", "jump on counter", "balcony", "examine storage box",
+              "garden", "dig here", "tool shed", "unlock shed", "examine all items"]
+
+WINTER_KITCHEN = "The kitchen is warm with the smell of winter stew."
+
+
+def reword(data_directory, key, description):
+    """
+    Give one room of a data directory a new description
+    """
+    path = os.path.join(data_directory, "locations.json")
+    with open(path, encoding="utf-8") as file:
+        locations = json.load(file)
+    locations[key]["description"] = description
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(locations, file, ensure_ascii=False)
+
+
+def test_packs_share_what_they_have_in_common(data_copy, tmp_path):
+    winter = str(tmp_path / "winter")
+    shutil.copytree(data_copy, winter)
+    reword(winter, "kitchen", WINTER_KITCHEN)
+
+    registry = PackRegistry()
+    classic = registry.add("classic", data_copy).world
+    registry.add("winter", winter)
+    seasonal = registry.packs["winter"].world
+    assert registry.stats()["reused"] > 0
+    kitchen = classic.location_ids["kitchen"]
+    for key, location_id in classic.location_ids.items():
+        shared = classic.locations[location_id] is seasonal.locations[seasonal.location_ids[key]]
+        assert shared == (location_id != kitchen)
+    assert classic.actions == seasonal.actions
+    assert all(mine is theirs for mine, theirs in zip(classic.actions, seasonal.actions))
+    assert classic.items is seasonal.items
+
+    # Each session plays its own pack, even though almost everything is shared
+    registry.open("alice", "classic")
+    registry.open("bob", "winter")
+    registry.send("alice", "kitchen")
+    registry.send("bob", "kitchen")
+    assert WINTER_KITCHEN not in registry.send("alice", "look")
+    assert WINTER_KITCHEN in registry.send("bob", "look")
+    for command in TRANSCRIPT[1:]:
+        registry.send("bob", command)
+    assert registry.sessions["bob"][1].game_won and not registry.sessions["alice"][1].game_won
+
+    # Reloading one pack leaves the other one exactly as it was
+    reword(winter, "garden", "Snow covers the flower beds.")
+    registry.reload("winter")
+    seasonal = registry.packs["winter"].world
+    assert seasonal.locations[seasonal.location_ids["garden"]].description == "Snow covers the flower beds."
+    assert seasonal.locations[seasonal.location_ids["bedroom"]] is classic.locations[classic.location_ids["bedroom"]]
+    assert registry.packs["classic"].world is classic
+    assert classic.locations[classic.location_ids["garden"]].description != "Snow covers the flower beds."
+    assert WINTER_KITCHEN not in registry.send("alice", "look")
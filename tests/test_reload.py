@@ -0,0 +1,95 @@
+"""
+Tests for hot reloading and the per-world caches built on top of a world
+"""
+
+import gc
+import weakref
+
+import pytest
+
+import navigation
+import patching
+import render
+import rules
+from conftest import load
+from main import GameEngine, compile_world
+from worldgen import write_world
+
+# Ways of making a session build each kind of per-world helper
+HELPERS = {
+    "renderer": lambda engine: engine.process_command("look"),
+    "action index": lambda engine: (engine.process_command("stats"), engine.available_actions()),
+    "navigator": lambda engine: engine.process_command("go to living room"),
+}
+
+
+@pytest.mark.parametrize("helper", HELPERS)
+def test_reloads_dont_keep_old_worlds(data_copy, helper):
+    loader = load(data_copy)
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    kitchen = dict(loader.locations["kitchen"])
+    worlds = []
+    for number in range(20):
+        HELPERS[helper](engine)
+        worlds.append(weakref.ref(loader.world))
+        assert loader.apply_changes(locations={"kitchen": {**kitchen, "description": f"Kitchen {number}"}})
+    HELPERS[helper](engine)
+    gc.collect()
+    assert [world() for world in worlds if world() is not None] == []
+
+
+def test_lazy_renderer_keeps_recent_rooms_only(tmp_path):
+    write_world(str(tmp_path / "big"), rooms=300, seed=1)
+    loader = load(str(tmp_path / "big"), lazy=True, cache_size=16)
+    renderer = render.renderer_for(loader.world)
+    for location_id in range(len(loader.world.locations)):
+        renderer.room(location_id, False, render.SEARCHING)
+        renderer.reminder(location_id, render.SEARCHING, 0)
+    assert len(renderer.rooms) <= 16 and len(renderer.reminders) <= 16
+
+
+def test_lazy_action_index_keeps_recent_rooms_only(tmp_path):
+    write_world(str(tmp_path / "big"), rooms=300, seed=1)
+    loader = load(str(tmp_path / "big"), lazy=True, cache_size=16)
+    index = rules.action_index_for(loader.world)
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    for location_id in range(len(loader.world.locations)):
+        index.available(location_id, engine.player)
+    assert len(index.rooms) <= 16
+
+
+def test_patched_worlds_match_fresh_ones(tmp_path, monkeypatch):
+    monkeypatch.setattr(patching, "COPY_LIMIT", 8)  # Layer even this small world's tables
+    write_world(str(tmp_path), rooms=40, seed=2)
+    loader = load(str(tmp_path))
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    engine.process_command("go to room 0")  # Builds the navigator the reloads carry over
+    first = loader.world
+    first_rooms = list(first.locations)
+    expected = dict(loader.locations)
+    keys = list(expected)
+    for number, key in enumerate(keys[1:30:3]):
+        expected[key] = {**expected[key], "name": f"Den {number}"}
+        expected[f"nook_{number}"] = {"name": f"Nook {number}", "description": "Cosy.", "exits": {"out": key}}
+        expected.pop(keys[number + 30], None)
+        assert loader.apply_changes(locations={key: expected[key], f"nook_{number}": expected[f"nook_{number}"],
+                                               keys[number + 30]: None})
+        if number == 0:
+            assert isinstance(loader.world.locations, patching.PatchedTable)
+    assert list(loader.locations) == list(expected)
+    assert list(first.locations) == first_rooms  # The old version never saw a thing
+
+    fresh = compile_world(expected, dict(loader.items), loader.story_config)
+    world = loader.world  # Flattened again by now, after so many edits
+    for key, location_id in fresh.location_ids.items():
+        location = world.locations[world.location_ids[key]]
+        assert location.name == fresh.locations[location_id].name
+        assert ({name: world.locations[room].key for name, room in location.exits.items()} ==
+                {name: fresh.locations[room].key for name, room in fresh.locations[location_id].exits.items()})
+    navigator = navigation.navigator_for(world)
+    assert navigator.find("nook 3") == world.location_ids["nook_3"]
+    assert navigator.find("den 3") == world.location_ids[keys[10]]
+    assert navigator.find(keys[30]) is None
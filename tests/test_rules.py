@@ -0,0 +1,115 @@
+"""
+Tests for compiled action requirements and effects
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import rules
+from conftest import load
+from main import GameEngine, compile_world
+from rules import failed_requirement
+
+ITEMS = {
+    "rope": {"name": "Rope"},
+    "helmet": {"name": "Helmet"},
+    "gloves": {"name": "Gloves"},
+}
+
+LOCATIONS = {
+    "yard": {"name": "Yard", "description": "A yard.", "exits": {"garden": "garden"},
+             "actions": {"climb": "climb", "trade rope": "trade_rope"}},
+    "garden": {"name": "Garden", "description": "A garden.", "exits": {"yard": "yard"}},
+}
+
+# Each requirement, with a player that meets it and one that doesn't
+REQUIREMENTS = {
+    "has_item": ({"type": "has_item", "item": "rope"}, {"inventory": 0b001}, {"inventory": 0b110}),
+    "item_count": ({"type": "item_count", "items": ["rope", "helmet", "gloves"], "at_least": 2},
+                   {"inventory": 0b101}, {"inventory": 0b100}),
+    "visited": ({"type": "visited", "location": "garden"}, {"visited_locations": 0b10}, {"visited_locations": 0b01}),
+    "completed": ({"type": "completed", "action": "trade_rope"}, {"completed_actions": 0b10}, {}),
+    "flag": ({"type": "flag", "flag": "size_realization"}, {"size_realization_triggered": True}, {}),
+    "not": ({"type": "not", "requirement": {"type": "has_item", "item": "rope"}}, {}, {"inventory": 0b001}),
+    "any": ({"type": "any", "requirements": [{"type": "has_item", "item": "helmet"},
+                                            {"type": "visited", "location": "garden"}]},
+            {"visited_locations": 0b10}, {"inventory": 0b001}),
+    "all": ({"type": "all", "requirements": [{"type": "has_item", "item": "helmet"},
+                                            {"type": "has_item", "item": "gloves"},
+                                            {"type": "not", "requirement": {"type": "visited", "location": "garden"}}]},
+            {"inventory": 0b110}, {"inventory": 0b110, "visited_locations": 0b10}),
+}
+
+
+def compile_actions(climb, trade_rope=None):
+    """
+    A tiny world with two actions in the yard, returning it and its compile problems
+    """
+    story = {"game_settings": {"starting_location": "yard"}, "messages": {},
+             "special_actions": {"climb": climb, "trade_rope": trade_rope or {"description": "Traded."}}}
+    world = compile_world(LOCATIONS, ITEMS, story)
+    return world, world.problems
+
+
+def player(**bits):
+    """
+    Just the parts of a player requirements look at
+    """
+    state = {"inventory": 0, "visited_locations": 0, "completed_actions": 0,
+             "size_realization_triggered": False, "revelation_triggered": False}
+    state.update(bits)
+    return SimpleNamespace(**state)
+
+
+@pytest.mark.parametrize("kind", REQUIREMENTS)
+def test_requirements_compile_and_check(kind):
+    data, meets, misses = REQUIREMENTS[kind]
+    world, problems = compile_actions({"requirements": [{**data, "message": "Not yet!"}]})
+    climb = world.actions[world.action_ids["climb"]]
+    assert problems == []
+    assert failed_requirement(climb, player(**meets)) is None
+    assert failed_requirement(climb, player(**misses)) == "Not yet!"
+
+
+def test_item_only_requirements_fold_into_one_mask():
+    world, _ = compile_actions({"requirements": [{"type": "has_item", "item": "rope"},
+                                                 {"type": "has_item", "item": "gloves"}]})
+    climb = world.actions[world.action_ids["climb"]]
+    assert climb.required_items == 0b101
+    assert failed_requirement(climb, player(inventory=0b001)) == "You need gloves to do that."
+
+
+def test_dangling_and_unknown_requirements_are_reported_not_raised():
+    world, problems = compile_actions({"requirements": [{"type": "has_item", "item": "ladder"},
+                                                        {"type": "smells_nice"}]})
+    climb = world.actions[world.action_ids["climb"]]
+    assert [requirement.op for requirement in climb.requirements] == [rules.NEVER, rules.ALWAYS]
+    assert failed_requirement(climb, player(inventory=0b111)) == "You need ladder to do that."
+    assert any("unknown item 'ladder'" in problem for problem in problems)
+    assert any("unknown type 'smells_nice'" in problem for problem in problems)
+
+
+def test_effects_give_and_take_items_in_play(tmp_path):
+    climb = {"description": "Up you go.", "repeatable": True, "effects": [{"type": "give_item", "item": "rope"}]}
+    trade = {"description": "You swap the rope for a helmet.",
+             "requirements": [{"type": "has_item", "item": "rope"}],
+             "effects": [{"type": "take_item", "item": "rope"}, {"type": "give_item", "item": "helmet"},
+                         {"type": "sparkle"}]}
+    world, problems = compile_actions(climb, trade)
+    action = world.actions[world.action_ids["trade_rope"]]
+    assert [effect.op for effect in action.effects] == [rules.TAKE_ITEM, rules.GIVE_ITEM, rules.NOTHING]
+    assert any("unknown type 'sparkle'" in problem for problem in problems)
+
+    story = {"game_settings": {"starting_location": "yard"}, "messages": {},
+             "special_actions": {"climb": climb, "trade_rope": trade}}
+    for filename, content in (("locations.json", LOCATIONS), ("items.json", ITEMS), ("story.json", story)):
+        (tmp_path / filename).write_text(json.dumps(content), encoding="utf-8")
+    loader = load(str(tmp_path))
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    assert "You need rope" in engine.process_command("trade rope")
+    engine.process_command("climb")
+    engine.process_command("trade rope")
+    assert engine.player.inventory == 1 << loader.world.item_ids["helmet"]
@@ -0,0 +1,42 @@
+"""
+Tests for the network server
+"""
+
+import asyncio
+import os
+
+from server import PROMPT, GameServer
+
+PROMPT_BYTES = PROMPT.replace("\n", "\r\n").encode("utf-8")
+
+
+async def command(reader, writer, text):
+    writer.write(text.encode("utf-8") + b"\r\n")
+    return (await asyncio.wait_for(reader.readuntil(PROMPT_BYTES), 5)).decode("utf-8")
+
+
+async def play_two_clients(loader):
+    server = GameServer(loader, "127.0.0.1", 0)
+    port = await server.start()
+    try:
+        first = await asyncio.open_connection("127.0.0.1", port)
+        second = await asyncio.open_connection("127.0.0.1", port)
+        for reader, _ in (first, second):
+            await asyncio.wait_for(reader.readuntil(PROMPT_BYTES), 5)
+        replies = [await command(*first, "kitchen"), await command(*first, "save"),
+                   await command(*second, "save mine"), await command(*second, "load"),
+                   await command(*first, "load mine")]
+        for _, writer in (first, second):
+            writer.close()
+        return replies
+    finally:
+        await server.shutdown(grace=1)
+
+
+def test_network_sessions_cant_share_saves(loader, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    replies = asyncio.run(play_two_clients(loader))
+    for reply in replies[1:]:
+        assert "aren't available" in reply
+        assert "Loaded slot" not in reply
+    assert not os.path.exists(tmp_path / "saves")
@@ -0,0 +1,27 @@
+"""
+Tests for running sessions across worker processes
+"""
+
+import pytest
+
+from conftest import DATA_DIRECTORY
+from sessionhost import SessionHost, SessionHostError
+
+
+@pytest.fixture(scope="module")
+def host():
+    with SessionHost(DATA_DIRECTORY, workers=2, mode="copy") as host:
+        yield host
+
+
+def test_a_failed_command_keeps_the_rest_of_its_batch(host):
+    host.open("alice")
+    replies = host.run_batch([("alice", "kitchen"), ("nobody", "look"), ("alice", "inventory")])
+    assert "Kitchen" in replies[0]
+    assert isinstance(replies[1], SessionHostError) and "nobody" in str(replies[1])
+    assert "carrying" in replies[2]
+
+
+def test_send_raises_for_an_unknown_session(host):
+    with pytest.raises(SessionHostError):
+        host.send("stranger", "look")
@@ -0,0 +1,82 @@
+"""
+Tests for the session store that spills idle sessions to SQLite
+"""
+
+import tracemalloc
+
+import pytest
+
+from conftest import load
+from sessionstore import SessionStore, session_size
+
+MOVES = ["kitchen", "get step stool", "balcony"]
+
+
+def test_spilled_sessions_come_back_as_they_were(loader, tmp_path):
+    states = {}
+    with SessionStore(loader, str(tmp_path / "sessions.db"), max_resident=2) as store:
+        for number in range(6):
+            session_id = f"player-{number}"
+            store.open(session_id)
+            for command in MOVES[:number % 4]:
+                store.send(session_id, command)
+            states[session_id] = store.resident[session_id].history_state()
+        assert store.stats()["evicted"] > 0 and len(store.resident) <= 2
+        for session_id, state in states.items():
+            store.send(session_id, "stats")
+            assert store.resident[session_id].history_state() == state
+        assert store.stats()["misses"] > 0
+
+
+def test_sessions_outlive_the_store(loader, tmp_path):
+    path = str(tmp_path / "sessions.db")
+    with SessionStore(loader, path, max_resident=4) as store:
+        store.open("alice")
+        for command in MOVES:
+            store.send("alice", command)
+        state = store.resident["alice"].history_state()
+    with SessionStore(loader, path, max_resident=4) as store:
+        assert "alice" in store
+        store.send("alice", "look")
+        assert store.resident["alice"].history_state() == state
+        with pytest.raises(KeyError):
+            store.send("nobody", "look")
+        store.end("alice")
+        assert "alice" not in store
+
+
+def test_a_session_spilled_in_a_removed_room_wakes_up_at_the_start(data_copy, tmp_path):
+    loader = load(data_copy)
+    with SessionStore(loader, str(tmp_path / "sessions.db"), max_resident=1) as store:
+        store.open("alice")
+        for command in MOVES:
+            store.send("alice", command)
+        store.open("bob")  # Spills alice, standing on the balcony
+        assert "alice" not in store.resident
+        assert loader.apply_changes(locations={"balcony": None})
+        output = store.send("alice", "look")
+        engine = store.resident["alice"]
+        assert "rearrange" in output
+        assert engine.player.current_location == engine.world.starting_location
+
+
+def test_a_session_that_cant_be_restored_starts_afresh_with_its_opening(loader, tmp_path):
+    with SessionStore(loader, str(tmp_path / "sessions.db"), max_resident=1) as store:
+        store.open("alice")
+        store.open("bob")  # Spills alice
+        store.database.execute("UPDATE sessions SET state = ? WHERE id = ?", (b"not a snapshot", "alice"))
+        output = store.send("alice", "look")
+        assert "starts afresh" in output
+        assert "You are Turbo" in output
+        assert output.index("starts afresh") < output.index("You are Turbo")
+
+
+@pytest.mark.parametrize("tracing", [False, True])
+def test_measuring_a_session_leaves_tracing_as_it_was(loader, tracing):
+    if tracing:
+        tracemalloc.start()
+    try:
+        assert session_size(loader, samples=5) > 0
+        assert tracemalloc.is_tracing() == tracing
+    finally:
+        tracemalloc.stop()
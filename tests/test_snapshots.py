@@ -0,0 +1,74 @@
+"""
+Tests for session snapshots, save slots and restoring into reloaded worlds
+"""
+
+import pytest
+
+from conftest import load
+from main import GameEngine, SnapshotError
+
+
+def play(engine, *commands):
+    return "".join(engine.process_command(command) for command in commands)
+
+
+def test_snapshot_round_trip(loader):
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    play(engine, "kitchen", "examine cabinet", "get step stool", "jump on counter", "balcony")
+    copy = GameEngine(loader, headless=True)
+    copy.restore(engine.snapshot())
+    assert copy.history_state() == engine.history_state()
+    assert copy.process_command("inventory") == engine.process_command("inventory")
+
+
+@pytest.mark.parametrize("damage", [lambda data: data[:5], lambda data: b"XXXX" + data[4:],
+                                    lambda data: data + b"\0"])
+def test_damaged_snapshots_are_rejected(loader, damage):
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    with pytest.raises(SnapshotError):
+        GameEngine(loader, headless=True).restore(damage(engine.snapshot()))
+
+
+def test_snapshot_from_other_world_is_rejected(loader, data_copy):
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    stranger = GameEngine(load(data_copy), headless=True)
+    stranger.world.signature ^= 1  # As if its rooms were laid out differently
+    with pytest.raises(SnapshotError):
+        stranger.restore(engine.snapshot())
+
+
+def test_restore_after_the_room_was_removed(data_copy):
+    loader = load(data_copy)
+    engine = GameEngine(loader, headless=True)
+    engine.new_game()
+    play(engine, "kitchen", "examine cabinet", "get step stool", "jump on counter", "balcony")
+    snapshot = engine.snapshot()
+    balcony = loader.world.location_ids["balcony"]
+    assert loader.apply_changes(locations={"balcony": None}) is not None
+
+    restored = GameEngine(loader, headless=True)
+    restored.restore(snapshot)
+    assert restored.player.current_location == loader.world.starting_location
+    assert not (restored.player.discovered_locations | restored.player.visited_locations) >> balcony & 1
+    assert "Living Room" in restored.process_command("look")
+    restored.process_command("stats")
+
+
+def test_load_after_an_item_was_removed(data_copy, tmp_path):
+    loader = load(data_copy)
+    engine = GameEngine(loader, headless=True)
+    engine.save_directory = str(tmp_path)
+    engine.new_game()
+    play(engine, "kitchen", "examine cabinet", "get step stool", "save before")
+    stool = loader.world.item_ids["step_stool"]
+    loader.apply_changes(items={"step_stool": None})
+
+    later = GameEngine(loader, headless=True)
+    later.save_directory = str(tmp_path)
+    later.new_game()
+    assert "Loaded slot" in later.process_command("load before")
+    assert not later.player.inventory >> stool & 1
+    later.process_command("inventory")
@@ -0,0 +1,82 @@
+"""
+Tests for the browser export
+"""
+
+import gzip
+import json
+import os
+
+import webexport
+from conftest import load
+from main import GameEngine
+
+TRANSCRIPT = ["kitchen", "get step stool", "jump on counter", "balcony", "examine storage box",
+              "garden", "dig here", "tool shed", "unlock shed", "examine all items"]
+
+
+def read_json(path):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def plain(value):
+    """
+    Loaded (frozen) game data as it reads back from JSON
+    """
+    return json.loads(webexport.to_json(value))
+
+
+def test_export_has_every_room_and_the_whole_data_script(loader, tmp_path):
+    core, chunks, script = webexport.export_web(loader, str(tmp_path))
+    exported = read_json(tmp_path / webexport.CORE_FILE)
+    assert set(exported["rooms"]) == set(loader.locations)
+    for key, content_hash in exported["rooms"].items():
+        chunk = read_json(tmp_path / webexport.chunk_name(key, content_hash))
+        assert chunk["location"] == plain(loader.locations[key])
+
+    text = (tmp_path / webexport.DATA_SCRIPT).read_text(encoding="utf-8")
+    prefix = "const gameData = "
+    bundle = json.loads(text[text.index(prefix) + len(prefix):].rstrip().rstrip(";"))
+    assert bundle["locations"] == plain(loader.locations)
+    assert "special_actions" in bundle["story"]
+    assert script.size == len(text.encode("utf-8")) and core.smallest < script.smallest
+
+
+def test_reexport_drops_stale_chunks(loader, tmp_path):
+    stale = tmp_path / webexport.ROOM_DIRECTORY / "kitchen.000000000000.json"
+    stale.parent.mkdir()
+    stale.write_text("{}")
+    webexport.export_web(loader, str(tmp_path))
+    assert not stale.exists()
+    assert len(os.listdir(stale.parent)) >= len(loader.locations)
+
+
+def test_chunks_rebuild_a_world_that_plays_the_same(loader, tmp_path):
+    output = tmp_path / "web"
+    webexport.export_web(loader, str(output))
+    # Put the game back together the way the browser does: the core bundle, then every room's chunk
+    core = read_json(output / webexport.CORE_FILE)
+    locations, special_actions = {}, {}
+    for key, content_hash in core["rooms"].items():
+        name = webexport.chunk_name(key, content_hash)
+        data = (output / name).read_bytes()
+        assert gzip.decompress((output / (name + ".gz")).read_bytes()) == data
+        chunk = json.loads(data)
+        assert chunk["key"] == key
+        locations[key] = chunk["location"]
+        special_actions.update(chunk["special_actions"])
+    starting_location = core["game_settings"]["starting_location"]
+    assert core["start"] == read_json(output / webexport.chunk_name(starting_location, core["rooms"][starting_location]))
+    story = {key: value for key, value in core.items() if key not in ("items", "rooms", "start")}
+    story["special_actions"] = special_actions
+
+    rebuilt = tmp_path / "rebuilt"
+    rebuilt.mkdir()
+    for filename, content in (("locations.json", locations), ("items.json", core["items"]), ("story.json", story)):
+        (rebuilt / filename).write_text(json.dumps(content), encoding="utf-8")
+    outputs = []
+    for data_loader in (loader, load(str(rebuilt))):
+        engine = GameEngine(data_loader, headless=True)
+        outputs.append([engine.new_game()] + [engine.process_command(command) for command in TRANSCRIPT])
+        assert engine.game_won
+    assert outputs[0] == outputs[1]
@@ -0,0 +1,68 @@
+"""
+Tests for generated worlds
+"""
+
+import solver
+from conftest import load
+from main import GameEngine
+from worldgen import write_world
+
+
+def test_solution_wins_but_the_solver_can_do_better(tmp_path):
+    solution = write_world(str(tmp_path), rooms=12, exits=2, actions=1, chain_length=3, quest_items=2, seed=4)
+    loader = load(str(tmp_path))
+    assert solver.verify_path(loader, solution)
+    report = solver.solve(loader.world)
+    assert report.winning_path is not None and len(report.winning_path) <= len(solution)
+
+
+def test_progress_counts_the_worlds_own_quest_items(tmp_path):
+    solution = write_world(str(tmp_path), rooms=20, chain_length=3, quest_items=5, seed=2)
+    engine = GameEngine(load(str(tmp_path)), headless=True)
+    engine.new_game()
+    output = "".join(engine.process_command(command) for command in solution)
+    assert "1/5 special items" in output and "/3 special items" not in output
+    assert "all five special items" in output
+    assert engine.game_won
+
+
+def test_a_world_without_quest_items_never_has_them_all(tmp_path):
+    solution = write_world(str(tmp_path), rooms=10, chain_length=2, quest_items=0, seed=1)
+    engine = GameEngine(load(str(tmp_path)), headless=True)
+    output = engine.new_game() + engine.process_command("examine all items") + engine.process_command("look")
+    assert not engine.check_all_items_collected() and not engine.player.size_realization_triggered
+    assert "no special items to compare" in output and "You have all" not in output
+    output = "".join(engine.process_command(command) for command in solution)
+    assert engine.game_won and "You have all" not in output and "MOMENT OF UNDERSTANDING" not in output
+
+
+def test_the_solver_agrees_a_world_without_quest_items_needs_no_examining(tmp_path):
+    write_world(str(tmp_path), rooms=10, chain_length=2, quest_items=0, seed=1)
+    loader = load(str(tmp_path))
+    report = solver.solve(loader.world)
+    assert "examine all items" not in report.winning_path
+    assert solver.verify_path(loader, report.winning_path)
+
+
+def test_jumping_between_stops_finds_the_same_shortest_win_as_walking(tmp_path):
+    write_world(str(tmp_path), rooms=60, exits=2, chain_length=4, quest_items=3, seed=7)
+    loader = load(str(tmp_path))
+    model = solver.QuestModel(loader.world)
+    # Plain breadth-first search, one command at a time
+    depth = {model.start(): 0}
+    frontier = [model.start()]
+    shortest = None
+    while frontier and shortest is None:
+        following = []
+        for state in frontier:
+            for _, next_state, _ in model.successors(state):
+                if next_state not in depth:
+                    depth[next_state] = depth[state] + 1
+                    if next_state[3] & solver.WON:
+                        shortest = depth[next_state]
+                    following.append(next_state)
+        frontier = following
+    report = solver.solve(loader.world)
+    assert len(report.winning_path) == shortest
+    assert solver.verify_path(loader, report.winning_path)
+    assert report.states < len(depth)
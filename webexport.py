@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Turbo's Quest - Web Export
+Builds the browser version's game data from the same JSON files the Python game loads
+
+Instead of one big data.js that has to arrive before anything happens,
+the export is a small core bundle plus one chunk per room:
+
+    core.json                   game info, messages, items, the starting room, and a manifest
+    rooms/<room>.<hash>.json    one room and the special actions it offers
+    data.js                     everything at once, for pages opened straight from disk
+
+The browser fetches core.json, shows the starting room straight away, and
+fetches the rooms next door in the background as Turbo moves around. Chunk
+names include a hash of their content, so they can be cached forever and a
+changed room gets a new name; only core.json needs revalidating. Browsers
+won't fetch files for a page opened from file://, so game.js falls back to
+loading data.js as a script there.
+
+Nothing exported is checked in: the GitHub Pages workflow
+(.github/workflows/pages.yml) runs this before publishing the site.
+
+Every file also gets a .gz copy (and a .br copy when the brotli module is
+installed) for servers that send precompressed files as they are, like
+nginx's gzip_static. Content is read through DataLoader, so the export sees
+exactly the rooms and actions the Python game does.
+
+Run it with:
+    python webexport.py [--data DIR] [--output DIR]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+
+from main import DataLoader
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # Exports still work, just without .br copies
+
+
+WEB_DIRECTORY = "web"
+CORE_FILE = "core.json"
+DATA_SCRIPT = "data.js"
+ROOM_DIRECTORY = "rooms"
+HASH_LENGTH = 12  # Hex digits of SHA-256 in chunk names
+
+
+def to_json(value):
+    """
+    Compact UTF-8 JSON for loaded (frozen) game data
+    """
+    return json.dumps(value, default=dict, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def room_chunk(data_loader, key):
+    """
+    One room and every special action its commands lead to
+    """
+    location = data_loader.locations[key]
+    special_actions = data_loader.story_config["special_actions"]
+    actions = {}
+    for action_id in location.get("actions", {}).values():
+        if action_id in special_actions:
+            actions[action_id] = special_actions[action_id]
+    return {"key": key, "location": location, "special_actions": actions}
+
+
+def chunk_name(key, content_hash):
+    """
+    Where a room's chunk lives, relative to the core bundle (game.js builds the same name)
+    """
+    return f"{ROOM_DIRECTORY}/{key}.{content_hash}.json"
+
+
+def compressed_copies(data):
+    """
+    Precompressed copies of a file by extension: always .gz, and .br if brotli is available
+    """
+    copies = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}  # mtime=0 keeps the output reproducible
+    if brotli is not None:
+        copies[".br"] = brotli.compress(data, quality=11)
+    return copies
+
+
+class ExportedFile:
+    """
+    One file written by the export, with its raw and compressed sizes
+    """
+    __slots__ = ("name", "size", "compressed")
+
+    def __init__(self, name, size, compressed):
+        self.name = name
+        self.size = size
+        self.compressed = compressed  # Extension -> size
+
+    @property
+    def smallest(self):
+        """
+        The fewest bytes a browser can be sent for this file
+        """
+        return min([self.size, *self.compressed.values()])
+
+
+def write_file(output, name, data):
+    """
+    Write a file and its compressed copies, returning its ExportedFile
+    """
+    path = os.path.join(output, name)
+    compressed = {}
+    for extension, copy in [("", data), *compressed_copies(data).items()]:
+        with open(path + extension, "wb") as file:
+            file.write(copy)
+        if extension:
+            compressed[extension] = len(copy)
+    return ExportedFile(name, len(data), compressed)
+
+
+def export_web(data_loader, output=WEB_DIRECTORY):
+    """
+    Write the core bundle and room chunks for a loaded game into `output`
+    Returns (core, chunks, data script) as ExportedFiles. Chunks left over from
+    earlier exports are removed, since their hashed names will never be asked for again.
+    """
+    rooms = os.path.join(output, ROOM_DIRECTORY)
+    os.makedirs(rooms, exist_ok=True)
+
+    chunks = []
+    manifest = {}  # Room key -> content hash; the browser builds chunk names from these
+    for key in data_loader.locations:
+        data = to_json(room_chunk(data_loader, key))
+        manifest[key] = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+        name = chunk_name(key, manifest[key])
+        if os.path.exists(os.path.join(output, name)):
+            # Same content, same name - only the sizes are needed
+            chunks.append(ExportedFile(name, len(data), {extension: len(copy) for extension, copy
+                                                         in compressed_copies(data).items()}))
+        else:
+            chunks.append(write_file(output, name, data))
+
+    wanted = {os.path.basename(chunk.name) for chunk in chunks}
+    for filename in os.listdir(rooms):
+        chunk = filename if filename.endswith(".json") else os.path.splitext(filename)[0]  # Or a copy of one
+        if chunk not in wanted:
+            os.remove(os.path.join(rooms, filename))
+
+    story = data_loader.story_config
+    starting_location = story["game_settings"]["starting_location"]
+    core = {key: value for key, value in story.items() if key != "special_actions"}
+    core["items"] = data_loader.items
+    core["rooms"] = manifest
+    core["start"] = room_chunk(data_loader, starting_location)  # Inlined so the first frame needs one request
+
+    bundle = {"locations": data_loader.locations, "items": data_loader.items, "story": story}
+    script = b"// Generated by webexport.py - edit the JSON files in data/ instead\n"
+    script += b"const gameData = " + to_json(bundle) + b";\n"
+    return write_file(output, CORE_FILE, to_json(core)), chunks, write_file(output, DATA_SCRIPT, script)
+
+
+def print_report(core, chunks, script):
+    """
+    Print bundle sizes and how many bytes the browser needs before Turbo can move
+    The first frame is compared against loading the whole data script.
+    """
+    extensions = sorted(core.compressed)
+
+    def sizes(exported):
+        return "  ".join(f"{exported.compressed[extension]:>9,} {extension}" for extension in extensions)
+
+    print(f"📦 Exported {len(chunks)} room chunks and {CORE_FILE}")
+    print(f"   {CORE_FILE:<44} {core.size:>9,} raw  {sizes(core)}")
+    largest = max(chunks, key=lambda chunk: chunk.size, default=None)
+    if largest is not None:
+        print(f"   {largest.name:<44} {largest.size:>9,} raw  {sizes(largest)}  (largest room)")
+    total = ExportedFile("all", core.size + sum(chunk.size for chunk in chunks),
+                         {extension: core.compressed[extension] + sum(chunk.compressed[extension] for chunk in chunks)
+                          for extension in extensions})
+    print(f"   {'everything':<44} {total.size:>9,} raw  {sizes(total)}")
+    print(f"🖼️  Bytes before the first interactive frame: {core.smallest:,} ({core.size:,} uncompressed)")
+
+    print(f"   ({DATA_SCRIPT} needs {script.smallest:,}, {script.size:,} uncompressed)")
+
+
+def main():
+    """
+    Export the web data from the command line
+    """
+    parser = argparse.ArgumentParser(description="Export Turbo's Quest data for the browser version")
+    parser.add_argument("--data", default="data", help="game data directory")
+    parser.add_argument("--output", default=WEB_DIRECTORY, help=f"where to write it (default: {WEB_DIRECTORY})")
+    args = parser.parse_args()
+
+    loader = DataLoader(args.data, verbose=False)
+    if not loader.load_all_data():
+        sys.exit(1)
+    print_report(*export_web(loader, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Turbo's Quest - World Generator
+Writes big, reproducible worlds for stress testing the loader and engine
+
+Every generated world is a valid data directory (locations.json, items.json
+and story.json) plus solution.txt, a command transcript that wins it. The
+same seed always produces the same world. The transcript just walks the
+chain in order, so it's a win but rarely the shortest one (solver.py finds
+that, for worlds small enough to search).
+
+The world is built around a guaranteed solvable chain: each chain action
+needs the key item the previous one gave, quest items are hidden behind
+links of the chain, and a final action that needs the last key and every
+quest item has the win_game effect. Rooms are joined by a spanning tree
+first, so every room is reachable, and then by extra random exits.
+
+Run it with:
+    python worldgen.py OUTPUT_DIR [--rooms N] [--exits N] [--actions N]
+                       [--chain N] [--quest-items N] [--seed N]
+"""
+
+import argparse
+import json
+import os
+import random
+from collections import deque
+
+
+ROOM_ADJECTIVES = ["Dusty", "Sunny", "Cozy", "Creaky", "Drafty", "Quiet", "Muddy", "Tidy",
+                   "Cluttered", "Chilly", "Warm", "Echoing", "Narrow", "Grand", "Hidden", "Mossy"]
+ROOM_NOUNS = ["Attic", "Cellar", "Hallway", "Pantry", "Porch", "Study", "Nursery", "Workshop",
+              "Garage", "Laundry", "Library", "Conservatory", "Closet", "Loft", "Yard", "Greenhouse"]
+VERBS = ["sniff", "examine", "paw at", "nudge", "lick", "listen to", "circle", "bark at", "dig under", "watch"]
+OBJECTS = ["rug", "boxes", "old shoe", "curtains", "plant pot", "toy basket", "radiator", "bookshelf",
+           "laundry pile", "window", "flower bed", "doormat", "umbrella stand", "coat rack", "chair"]
+ITEM_ADJECTIVES = ["Shiny", "Tiny", "Squeaky", "Striped", "Fluffy", "Brass", "Wooden", "Velvet"]
+ITEM_NOUNS = ["Key", "Ribbon", "Bell", "Button", "Whistle", "Sock", "Marble", "Feather"]
+QUEST_NOUNS = ["Rattle", "Bib", "Blanket", "Mobile", "Bootie", "Pacifier", "Teddy", "Onesie"]
+
+
+def room_name(number):
+    """
+    A readable, unique name for room `number`
+    """
+    adjective = ROOM_ADJECTIVES[number % len(ROOM_ADJECTIVES)]
+    noun = ROOM_NOUNS[(number // len(ROOM_ADJECTIVES)) % len(ROOM_NOUNS)]
+    return f"{adjective} {noun} {number}"
+
+
+def generate_world(rooms=50, exits=3, actions=3, chain_length=5, quest_items=3, seed=0):
+    """
+    Generate a world as (locations, items, story, solution)
+    `exits` is the average number of exits per room and `actions` the number
+    of flavour actions per room, on top of the chain and quest actions.
+    `solution` is a list of commands that wins the game from the start (not necessarily the fewest).
+    """
+    if rooms < 1:
+        raise ValueError("A world needs at least one room")
+    rng = random.Random(seed)
+    keys = [f"room_{number}" for number in range(rooms)]
+    names = [room_name(number) for number in range(rooms)]
+
+    # A random spanning tree keeps every room reachable, then extra exits make loops
+    neighbours = [dict() for _ in range(rooms)]  # Room -> {destination: exit name}
+
+    def connect(a, b):
+        neighbours[a][b] = names[b].lower()
+        neighbours[b][a] = names[a].lower()
+
+    for number in range(1, rooms):
+        connect(number, rng.randrange(number))
+    extra = max(0, rooms * exits // 2 - (rooms - 1))
+    for _ in range(extra if rooms > 1 else 0):
+        a, b = rng.randrange(rooms), rng.randrange(rooms)
+        if a != b:
+            connect(a, b)
+
+    items = {}
+    special_actions = {}
+    room_actions = [dict() for _ in range(rooms)]  # Room -> {command: special action key}
+
+    def add_action(room, command, key, data):
+        # Commands must be unique within a room; add a number until it is
+        phrase = command
+        number = 2
+        while phrase in room_actions[room] or phrase in neighbours[room].values():
+            phrase = f"{command} {number}"
+            number += 1
+        room_actions[room][phrase] = key
+        special_actions[key] = data
+        return phrase
+
+    def new_item(key, name, quest):
+        items[key] = {
+            "name": name,
+            "description": f"A {name.lower()}. Maxwell seems very interested in it.",
+            "pickup_message": f"You carefully pick up the {name.lower()} in your mouth!",
+        }
+        if quest:
+            items[key]["special_effect"] = "quest_item"
+
+    # The chain: chain_0 gives key_0, chain_i needs key_(i-1) and gives key_i
+    steps = []  # (step, room, command) in winning order
+    chain_rooms = [rng.randrange(rooms) for _ in range(chain_length)]
+    for step, room in enumerate(chain_rooms):
+        item_key = f"key_{step}"
+        new_item(item_key, f"{ITEM_ADJECTIVES[step % len(ITEM_ADJECTIVES)]} "
+                           f"{ITEM_NOUNS[(step // len(ITEM_ADJECTIVES)) % len(ITEM_NOUNS)]} {step}", False)
+        action = {
+            "description": f"Something clicks into place. You found the {items[item_key]['name'].lower()}!",
+            "effects": [{"type": "give_item", "item": item_key}],
+            "repeatable": False,
+            "repeat_message": "Nothing more to find here.",
+        }
+        if step > 0:
+            previous = f"key_{step - 1}"
+            action["requirements"] = [{"type": "has_item", "item": previous,
+                                       "message": f"You'll need the {items[previous]['name'].lower()} first."}]
+        command = add_action(room, f"use key on {OBJECTS[step % len(OBJECTS)]}", f"chain_{step}", action)
+        steps.append((step, room, command))
+
+    # Quest items, each behind a random link of the chain (or free to pick up)
+    quest_steps = []
+    for number in range(quest_items):
+        item_key = f"quest_item_{number}"
+        new_item(item_key, f"Little {QUEST_NOUNS[number % len(QUEST_NOUNS)]} {number}", True)
+        needs = rng.randrange(-1, chain_length) if chain_length else -1
+        action = {
+            "description": "Maxwell purrs approvingly as you uncover something special.",
+            "effects": [{"type": "give_item", "item": item_key}],
+            "repeatable": False,
+            "repeat_message": "You already found what was hidden here.",
+        }
+        if needs >= 0:
+            action["requirements"] = [{"type": "has_item", "item": f"key_{needs}",
+                                       "message": "Something is missing - maybe a key?"}]
+        room = rng.randrange(rooms)
+        command = add_action(room, f"search {OBJECTS[number % len(OBJECTS)]}", f"find_quest_item_{number}", action)
+        quest_steps.append((needs, room, command))
+
+    # The final action needs the whole chain and every quest item
+    final_room = rng.randrange(rooms)
+    requirements = [{"type": "has_item", "item": f"quest_item_{number}",
+                     "message": "Maxwell meows - you haven't found everything yet."} for number in range(quest_items)]
+    if chain_length:
+        requirements.append({"type": "has_item", "item": f"key_{chain_length - 1}",
+                             "message": "The last key is still missing."})
+    final_command = add_action(final_room, "follow maxwell's gaze", "win", {
+        "description": "Maxwell leads you to the nursery. Everything makes sense now!",
+        "requirements": requirements,
+        "effects": [{"type": "win_game"}],
+        "repeatable": False,
+    })
+
+    # Flavour actions: mostly repeatable descriptions, some one-off
+    for room in range(rooms):
+        for number in range(actions):
+            verb = rng.choice(VERBS)
+            thing = rng.choice(OBJECTS)
+            add_action(room, f"{verb} {thing}", f"flavour_{room}_{number}", {
+                "description": f"You {verb} the {thing}. Nothing unusual, but it smells like home.",
+                "repeatable": rng.random() < 0.7,
+                "repeat_message": f"The {thing} is just as you left it.",
+            })
+
+    locations = {}
+    for room in range(rooms):
+        locations[keys[room]] = {
+            "name": names[room],
+            "description": f"You're in the {names[room].lower()}. It looks like every other room, "
+                           f"but Maxwell insists it matters.",
+            "first_visit_description": f"You pad into the {names[room].lower()} for the first time.",
+            "exits": {name: keys[destination] for destination, name in neighbours[room].items()},
+            "actions": room_actions[room],
+            "items": [],
+            "visited": False,
+        }
+
+    story = {
+        "game_info": {"title": f"Generated World {seed}", "version": "generated"},
+        "game_settings": {"starting_location": keys[0]},
+        "intro_text": {
+            "welcome_message": f"🐕 Welcome to generated world {seed}! 🐕",
+            "game_description": f"{rooms} rooms, {chain_length} keys and {quest_items} special items stand "
+                                f"between Turbo and Maxwell's secret.",
+            "instruction_text": "Explore the generated house and follow Maxwell's guidance!",
+        },
+        "special_actions": special_actions,
+        "messages": {"invalid_command": "You tilt your head, confused."},
+    }
+
+    # Walk the chain in order, picking up each quest item once its key is in hand
+    todo = [(room, command) for needs, room, command in quest_steps if needs < 0]
+    for step, room, command in steps:
+        todo.append((room, command))
+        todo.extend((quest_room, quest_command) for needs, quest_room, quest_command in quest_steps
+                    if needs == step)
+    todo.append((final_room, final_command))
+
+    solution = []
+    here = 0
+    for room, command in todo:
+        solution.extend(route(neighbours, here, room))
+        solution.append(command)
+        here = room
+    return locations, items, story, solution
+
+
+def route(neighbours, start, goal):
+    """
+    Exit names leading from room `start` to room `goal` by the fewest moves
+    """
+    if start == goal:
+        return []
+    previous = {start: None}
+    queue = deque([start])
+    while queue:
+        room = queue.popleft()
+        for destination in neighbours[room]:
+            if destination not in previous:
+                previous[destination] = room
+                if destination == goal:
+                    path = []
+                    while previous[destination] is not None:
+                        path.append(neighbours[previous[destination]][destination])
+                        destination = previous[destination]
+                    return path[::-1]
+                queue.append(destination)
+    raise ValueError(f"room_{goal} can't be reached")  # Impossible with the spanning tree
+
+
+def write_world(directory, **options):
+    """
+    Generate a world into `directory` (created if needed) and return its solution
+    """
+    locations, items, story, solution = generate_world(**options)
+    os.makedirs(directory, exist_ok=True)
+    for filename, content in (("locations.json", locations), ("items.json", items), ("story.json", story)):
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as file:
+            json.dump(content, file, indent=1)
+    with open(os.path.join(directory, "solution.txt"), "w", encoding="utf-8") as file:
+        file.write("# Generated winning transcript\n")
+        file.write("\n".join(solution) + "\n")
+    return solution
+
+
+def main():
+    """
+    Generate a world from the command line
+    """
+    parser = argparse.ArgumentParser(description="Generate a Turbo's Quest world for stress testing")
+    parser.add_argument("directory", help="where to write the JSON files")
+    parser.add_argument("--rooms", type=int, default=50, help="number of rooms")
+    parser.add_argument("--exits", type=int, default=3, help="average exits per room")
+    parser.add_argument("--actions", type=int, default=3, help="flavour actions per room")
+    parser.add_argument("--chain", type=int, default=5, help="length of the key item chain")
+    parser.add_argument("--quest-items", type=int, default=3, help="number of quest items")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    solution = write_world(args.directory, rooms=args.rooms, exits=args.exits, actions=args.actions,
+                           chain_length=args.chain, quest_items=args.quest_items, seed=args.seed)
+    print(f"🏗️  Wrote {args.rooms} rooms to {args.directory} (solution.txt wins it in {len(solution)} commands)")
+
+
+if __name__ == "__main__":
+    main()